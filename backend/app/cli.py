@@ -0,0 +1,71 @@
+# app/cli.py
+"""
+Management commands, run from the backend/ directory:
+
+    python -m app.cli migrate            # apply all migrations (alembic upgrade head)
+    python -m app.cli status             # schema revision of the database vs the code
+    python -m app.cli stamp 0001         # mark the database as being at a revision
+
+A database created before migrations existed (by create_all()) is adopted
+by stamping it at 0001, the first release's schema, then migrating:
+
+    python -m app.cli stamp 0001 && python -m app.cli migrate
+
+benchmarks/baseline_upgrade.py checks that path against such a database.
+"""
+import argparse
+import asyncio
+import sys
+from alembic import command
+from app.core.schema import alembic_config, current_revision, head_revision
+
+
+def migrate(args):
+    print(f"Migrating to {args.revision}...")
+    command.upgrade(alembic_config(), args.revision)
+    print("Done ✅")
+
+
+def status(args):
+    from app.database import async_engine
+
+    async def _current():
+        try:
+            return await current_revision(async_engine)
+        finally:
+            await async_engine.dispose()
+
+    current = asyncio.run(_current())
+    head = head_revision()
+    print(f"Database: {current or '<none>'}")
+    print(f"Code:     {head}")
+    if current != head:
+        sys.exit(1)
+
+
+def stamp(args):
+    command.stamp(alembic_config(), args.revision)
+    print(f"Stamped {args.revision} ✅")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Zuno management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="Apply migrations")
+    migrate_parser.add_argument("revision", nargs="?", default="head")
+    migrate_parser.set_defaults(func=migrate)
+
+    status_parser = commands.add_parser("status", help="Compare the database revision with the code (exit 1 if behind)")
+    status_parser.set_defaults(func=status)
+
+    stamp_parser = commands.add_parser("stamp", help="Mark the database as being at a revision without running it")
+    stamp_parser.add_argument("revision")
+    stamp_parser.set_defaults(func=stamp)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,30 @@
 # app/config.py
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # -1 disables recycling
+    DB_POOL_PRE_PING: bool = True
+    
+    # Startup check that the database is migrated to the code's revision
+    SCHEMA_VERSION_CHECK: bool = True
+    SCHEMA_VERSION_CHECK_TIMEOUT_SECONDS: float = 5.0
+    
+    # Read replica (optional). Read-only endpoints use it when healthy
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_HEALTH_CHECK_SECONDS: float = 5.0
+    REPLICA_RETRY_SECONDS: float = 30.0
+    READ_YOUR_WRITES_SECONDS: int = 5  # Reads stay on the primary this long after a user's write
+    READ_YOUR_WRITES_COOKIE: str = "zuno_last_write"  # Carries the write time to the other workers
+    READ_YOUR_WRITES_MAX_USERS: int = 10000  # Users pinned at once per process (cookie-less clients)
+    
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -17,10 +37,73 @@ class Settings(BaseSettings):
     SMTP_USER: str
     SMTP_PASSWORD: str
     FROM_EMAIL: str
+    SMTP_STARTTLS: bool = True
+    
+    # SMTP connection pool
+    SMTP_POOL_SIZE: int = 4
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    SMTP_KEEPALIVE_SECONDS: int = 30
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    
+    # Email templates (optional on-disk cache of compiled templates)
+    EMAIL_TEMPLATE_CACHE_DIR: Optional[str] = None
+    
+    # Email outbox worker
+    EMAIL_OUTBOX_ENABLED: bool = True
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS: float = 2.0
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = 30
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: int = 3600
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 300
+    
+    # Invite sweeper (expires overdue pending invites and frees their seats)
+    INVITE_SWEEP_ENABLED: bool = True
+    INVITE_SWEEP_INTERVAL_SECONDS: float = 60.0
+    INVITE_SWEEP_BATCH_SIZE: int = 500
+    
+    # Purge of expired verification/invite tokens
+    TOKEN_PURGE_ENABLED: bool = True
+    TOKEN_PURGE_INTERVAL_SECONDS: float = 3600.0
+    TOKEN_PURGE_BATCH_SIZE: int = 1000
+    
+    # Password hashing (bcrypt runs on a process pool)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    
+    # Authenticated principal cache
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    
+    # Resolved plan limits and usage per subscription owner
+    ENTITLEMENTS_CACHE_TTL_SECONDS: int = 60
+    ENTITLEMENTS_CACHE_MAX_SIZE: int = 10000
+    
+    # Per-request SQL stats (X-DB-Query-Count / X-DB-Time-Ms headers in DEBUG)
+    DEBUG: bool = False
+    SQL_QUERY_WARN_THRESHOLD: int = 25  # Log requests running more queries; 0 disables
+
+    # Bearer token for /metrics and /internal/metrics; unset, they only exist in DEBUG
+    METRICS_TOKEN: Optional[str] = None
     
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
     
+    # Production server (python serve.py). Each worker has its own DB and
+    # SMTP pools, so the database sees up to
+    # SERVER_WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # 0 = one per CPU
+    SERVER_PRELOAD: bool = True  # Import the app once in the master, before forking
+    SERVER_KEEPALIVE_SECONDS: int = 5  # Keep above any load balancer's idle timeout
+    SERVER_BACKLOG: int = 2048
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None  # Per worker; beyond it new connections get a 503
+    SERVER_MAX_REQUESTS: int = 0  # Recycle a worker after this many requests; 0 disables
+    SERVER_DRAIN_TIMEOUT_SECONDS: float = 20.0  # SIGTERM: time for in-flight requests to finish
+    SHUTDOWN_JOBS_TIMEOUT_SECONDS: float = 10.0  # Then for background jobs to finish their run
+    PROMETHEUS_MULTIPROC_DIR: Optional[str] = None  # Where workers share /metrics values; default a temp dir
+    
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,106 @@
+# app/core/background.py
+import asyncio
+import logging
+import time
+from typing import Optional
+from app.core.prometheus import JOB_LAG, JOB_LAST_RUN, JOB_PROCESSED, JOB_RUN_DURATION, JOB_RUNS
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    In-process background job that calls `run_once` every `interval` seconds.
+
+    `run_once` returns how many items it processed. When a run fills a whole
+    batch the next run starts immediately instead of waiting for the interval,
+    so a backlog drains as fast as the job can go.
+
+    Jobs that work through due items (oldest first) set `last_lag` to how
+    overdue the oldest item of the run was, 0 when there was none.
+    """
+
+    name = "job"
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        # Counters
+        self.runs = 0
+        self.failures = 0
+        self.processed = 0
+        self.last_processed = 0
+        self.last_run_at: Optional[float] = None
+        self.last_duration = 0.0
+        self.last_lag: Optional[float] = None
+
+    async def run_once(self) -> int:
+        raise NotImplementedError
+
+    def start(self):
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        Let the current run finish, then stop. Cancels it after `timeout`.
+        """
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%s did not stop within %ss, cancelled", self.name, timeout)
+        finally:
+            self._task = None
+
+    async def _loop(self):
+        while not self._stopping.is_set():
+            started = time.perf_counter()
+            processed = 0
+            outcome = "ok"
+            try:
+                processed = await self.run_once()
+                self.processed += processed
+            except Exception:
+                outcome = "failed"
+                self.failures += 1
+                logger.exception("%s run failed", self.name)
+            finally:
+                self.runs += 1
+                self.last_processed = processed
+                self.last_run_at = time.time()
+                self.last_duration = time.perf_counter() - started
+                self._export(outcome)
+
+            if processed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _export(self, outcome: str):
+        JOB_RUNS.labels(self.name, outcome).inc()
+        JOB_RUN_DURATION.labels(self.name).observe(self.last_duration)
+        JOB_PROCESSED.labels(self.name).inc(self.last_processed)
+        JOB_LAST_RUN.labels(self.name).set(self.last_run_at)
+        if self.last_lag is not None:
+            JOB_LAG.labels(self.name).set(self.last_lag)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "processed": self.processed,
+            "last_processed": self.last_processed,
+            "last_run_at": self.last_run_at,
+            "last_duration_ms": round(self.last_duration * 1000, 2),
+            "last_lag_s": None if self.last_lag is None else round(self.last_lag, 3)
+        }
@@ -0,0 +1,129 @@
+# app/core/db_pool.py
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.config import settings
+from app.core.prometheus import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CONNECTIONS_OPENED,
+    DB_POOL_SIZE,
+)
+
+
+class PoolMetrics:
+    """
+    Checkout counters for one connection pool, also exported to Prometheus
+    under the pool's name
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.checkout_timeouts = 0
+        self.connections_opened = 0
+        self.connections_invalidated = 0
+
+    def record_wait(self, seconds: float):
+        self.checkout_wait_total += seconds
+        self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+        DB_POOL_CHECKOUT_WAIT.labels(self.name).observe(seconds)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times every checkout.
+
+    SQLAlchemy has no pool event that fires before a checkout waits, so the
+    wait (including opening a new connection) and timeouts are measured here.
+    """
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.checkout_timeouts += 1
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(self.metrics.name).inc()
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() recreates the pool, keep the same counters
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_options() -> dict:
+    """
+    create_async_engine() keyword arguments from Settings
+    """
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_engine(async_engine: AsyncEngine, name: str = "primary"):
+    """
+    Attach PoolMetrics to an engine created with pool_options()
+    """
+    sync_engine: Engine = async_engine.sync_engine
+    metrics = PoolMetrics(name)
+    sync_engine.pool.metrics = metrics
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connections_opened += 1
+        DB_POOL_CONNECTIONS_OPENED.labels(name).inc()
+        # Set from the worker, not at import: under serve.py the app is
+        # imported in the master, whose values don't carry over the fork
+        DB_POOL_SIZE.labels(name).set(settings.DB_POOL_SIZE)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        checked_out.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.connections_invalidated += 1
+
+
+def pool_stats(async_engine: AsyncEngine) -> dict:
+    """
+    Live pool status plus the checkout counters
+    """
+    pool = async_engine.sync_engine.pool
+    metrics: PoolMetrics = pool.metrics
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow_in_use": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checkouts": metrics.checkouts,
+        "checkout_timeouts": metrics.checkout_timeouts,
+        "avg_checkout_wait_ms": round(metrics.checkout_wait_total / metrics.checkouts * 1000, 3) if metrics.checkouts else 0.0,
+        "max_checkout_wait_ms": round(metrics.checkout_wait_max * 1000, 3),
+        "connections_opened": metrics.connections_opened,
+        "connections_invalidated": metrics.connections_invalidated
+    }
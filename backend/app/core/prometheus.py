@@ -0,0 +1,162 @@
+# app/core/prometheus.py
+"""
+Prometheus metrics, served in text format at GET /metrics. Scrapes send
+METRICS_TOKEN as a bearer token (the scrape config's `authorization`);
+without one configured the endpoint only exists in DEBUG.
+
+Under serve.py every worker is a separate process, so the metrics run in
+prometheus_client's multiprocess mode: each process writes its values to
+memory-mapped files in PROMETHEUS_MULTIPROC_DIR and /metrics adds up the
+files of all workers, whichever worker answers the scrape. Updating a
+value is an in-process write to the mapped file, with no cross-process
+locking. Gauges declare how workers combine (livesum: total over live
+workers, livemax: the highest). Without PROMETHEUS_MULTIPROC_DIR (run.py)
+the values stay in memory.
+
+Values are pushed from where things happen rather than collected at
+scrape time. A scrape-time collector would only see the process that
+answered.
+"""
+import os
+import time
+from typing import Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+
+# HTTP
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Requests handled", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to handle a request, by route template", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being handled", ["method"], multiprocess_mode="livesum"
+)
+
+# Database connection pools (primary, replica)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured connections kept open per pool", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections in use", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time to get a connection from the pool (includes connecting)", ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up waiting for a connection", ["pool"]
+)
+DB_POOL_CONNECTIONS_OPENED = Counter(
+    "db_pool_connections_opened_total", "Database connections opened", ["pool"]
+)
+
+# Password hashing
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "bcrypt hash/verify time, including the wait for a pool process", ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Hash/verify jobs turned away with 503 because the queue was full"
+)
+
+# Email
+EMAIL_SEND_DURATION = Histogram(
+    "email_send_duration_seconds", "Time to hand one email to the SMTP server",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+EMAILS = Counter(
+    "emails_total", "Outbox delivery attempts by outcome (sent, retried, dead)", ["outcome"]
+)
+
+# Background jobs
+JOB_RUNS = Counter(
+    "background_job_runs_total", "Background job runs", ["job", "outcome"]
+)
+JOB_RUN_DURATION = Histogram(
+    "background_job_run_duration_seconds", "Time of one background job run", ["job"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+)
+JOB_PROCESSED = Counter(
+    "background_job_processed_total", "Items processed by background jobs", ["job"]
+)
+JOB_LAST_RUN = Gauge(
+    "background_job_last_run_timestamp_seconds", "When the job last finished a run (Unix time)", ["job"],
+    multiprocess_mode="livemax"
+)
+JOB_LAG = Gauge(
+    "background_job_lag_seconds", "How overdue the oldest item of the job's last run was", ["job"],
+    multiprocess_mode="livemax"
+)
+
+
+def multiprocess_dir() -> Optional[str]:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    The metrics in Prometheus text format, and its content type
+    """
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    """
+    Drop the live* gauges of a worker that exited (gunicorn child_exit)
+    """
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
+
+
+class PrometheusMiddleware:
+    """
+    Per-route latency and status counts, and requests in progress.
+
+    A plain ASGI middleware like QueryStatsMiddleware. The route template is
+    read after the app ran, once routing has set it; unmatched paths share
+    one label so the series stay bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500  # If the app raises before responding
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = scope.get("route")
+            path = route.path if route is not None else "(unmatched)"
+            HTTP_REQUEST_DURATION.labels(method, path).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, path, str(status_code)).inc()
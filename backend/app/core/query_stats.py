@@ -0,0 +1,218 @@
+# app/core/query_stats.py
+import functools
+import inspect
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = b"x-db-query-count"
+QUERY_TIME_HEADER = b"x-db-time-ms"
+
+
+class QueryStats:
+    """
+    Statements run and time spent in the database
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+
+    @property
+    def milliseconds(self) -> float:
+        return round(self.seconds * 1000, 3)
+
+
+# Stats of the request being handled (set by QueryStatsMiddleware)
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+
+# Open count_queries() blocks. These see every statement, whichever task or
+# thread runs it, so they also work around TestClient's portal thread.
+_watchers: set = set()
+
+
+def instrument_queries(async_engine: AsyncEngine):
+    """
+    Count and time every statement the engine runs
+    """
+    sync_engine = async_engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _record(time.perf_counter() - conn.info["query_started"].pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            _record(time.perf_counter() - started.pop())
+
+
+def _record(seconds: float):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.add(seconds)
+    for watcher in tuple(_watchers):
+        watcher.add(seconds)
+
+
+class count_queries:
+    """
+    Count the statements run inside a block:
+
+        with count_queries() as stats:
+            client.get("/invites/pending", headers=headers)
+        print(stats.count, stats.milliseconds)
+
+    Counts statements from every request and task, so keep other database
+    work out of the block.
+    """
+
+    def __init__(self):
+        self.stats = QueryStats()
+
+    def __enter__(self) -> QueryStats:
+        _watchers.add(self.stats)
+        return self.stats
+
+    def __exit__(self, *exc_info):
+        _watchers.discard(self.stats)
+
+
+class assert_max_queries(count_queries):
+    """
+    Fail (AssertionError) if a block or test runs more than max_queries
+    statements. Works as a context manager and as a decorator for sync and
+    async test functions:
+
+        @assert_max_queries(2)
+        def test_pending_invites(client, headers):
+            client.get("/invites/pending", headers=headers)
+    """
+
+    def __init__(self, max_queries: int):
+        super().__init__()
+        self.max_queries = max_queries
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        if exc_type is None and self.stats.count > self.max_queries:
+            raise AssertionError(f"{self.stats.count} queries run, budget is {self.max_queries}")
+
+    def __call__(self, fn):
+        max_queries = self.max_queries
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with assert_max_queries(max_queries):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with assert_max_queries(max_queries):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+class QueryMetrics:
+    """
+    Per-route totals of the query stats of finished requests
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.seconds = 0.0
+        self.over_threshold = 0
+        self.routes: dict[str, dict] = {}
+
+    def record(self, route: str, stats: QueryStats):
+        self.requests += 1
+        self.queries += stats.count
+        self.seconds += stats.seconds
+        if settings.SQL_QUERY_WARN_THRESHOLD and stats.count > settings.SQL_QUERY_WARN_THRESHOLD:
+            self.over_threshold += 1
+            logger.warning("%s ran %d queries (%.1f ms in the database)", route, stats.count, stats.seconds * 1000)
+
+        totals = self.routes.setdefault(route, {"requests": 0, "queries": 0, "seconds": 0.0, "max_queries": 0})
+        totals["requests"] += 1
+        totals["queries"] += stats.count
+        totals["seconds"] += stats.seconds
+        totals["max_queries"] = max(totals["max_queries"], stats.count)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries_per_request": round(self.queries / self.requests, 2) if self.requests else 0.0,
+            "avg_db_time_ms": round(self.seconds / self.requests * 1000, 3) if self.requests else 0.0,
+            "requests_over_threshold": self.over_threshold,
+            "routes": {
+                route: {
+                    "requests": totals["requests"],
+                    "queries": totals["queries"],
+                    "avg_queries": round(totals["queries"] / totals["requests"], 2),
+                    "max_queries": totals["max_queries"],
+                    "avg_db_time_ms": round(totals["seconds"] / totals["requests"] * 1000, 3)
+                }
+                for route, totals in sorted(self.routes.items())
+            }
+        }
+
+
+query_metrics = QueryMetrics()
+
+
+class QueryStatsMiddleware:
+    """
+    Tracks the queries of each HTTP request, records them in query_metrics
+    and, in DEBUG, returns them as X-DB-Query-Count / X-DB-Time-Ms headers.
+
+    A plain ASGI middleware (not BaseHTTPMiddleware) so the endpoint runs in
+    the same context as the ContextVar it sets.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (QUERY_COUNT_HEADER, str(stats.count).encode()),
+                    (QUERY_TIME_HEADER, str(stats.milliseconds).encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _request_stats.reset(token)
+            # Route template (not the raw path) keeps the metrics bounded
+            route = scope.get("route")
+            path = route.path if route is not None else "(unmatched)"
+            query_metrics.record(f"{scope['method']} {path}", stats)
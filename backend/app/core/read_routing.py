@@ -0,0 +1,212 @@
+# app/core/read_routing.py
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Write time of the request being handled (set by ReadYourWritesMiddleware)
+_request_write: ContextVar[Optional[list]] = ContextVar("request_write", default=None)
+
+
+class ReplicaRouter:
+    """
+    Decides whether a read-only request may be served by the replica.
+
+    The replica is used only when it is configured, its last health check
+    passed and the user has not written anything in the last
+    READ_YOUR_WRITES_SECONDS. A failed check (or a connection error while
+    serving a request) takes the replica out of rotation for
+    REPLICA_RETRY_SECONDS, during which reads go to the primary.
+
+    A write is remembered in two places: in this process, and in a
+    short-lived cookie (READ_YOUR_WRITES_COOKIE) holding the write time,
+    set by ReadYourWritesMiddleware. Under serve.py the user's next request
+    may land on another worker, which only knows about the write through
+    the cookie; clients that drop it only get read-your-writes from the
+    worker that handled the write.
+    """
+
+    CHECK_TIMEOUT_SECONDS = 2.0
+    # How far in the future a cookie's write time may be (clocks of the
+    # workers that set and read it can differ slightly)
+    CLOCK_SKEW_SECONDS = 1.0
+
+    def __init__(self, engine: Optional[AsyncEngine], check_interval: float, retry_after: float, pin_seconds: int,
+                 max_pins: int):
+        self.engine = engine
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self.pin_seconds = pin_seconds
+        self._pins = TTLCache(maxsize=max_pins, ttl=pin_seconds)
+        self._healthy = engine is not None
+        self._checked_at = 0.0
+        self._down_until = 0.0
+        self._check_lock = asyncio.Lock()
+
+        # Counters
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.pinned_reads = 0
+        self.failovers = 0
+
+        if engine is not None:
+            event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine is not None
+
+    def pin(self, user_id: UUID):
+        """
+        Send this user's reads to the primary for the read-your-writes window,
+        here and (through the response cookie) on every other worker
+        """
+        self._pins.set(user_id, True)
+        request_write = _request_write.get()
+        if request_write is not None:
+            request_write[0] = time.time()
+
+    def is_pinned(self, user_id: Optional[UUID], last_write: Optional[str] = None) -> bool:
+        """
+        Whether the user wrote within the window, by this process's pins or
+        the write time the client sent back (the cookie's value)
+        """
+        if last_write is not None:
+            try:
+                age = time.time() - float(last_write)
+            except ValueError:
+                age = None
+            # Anything further in the future than clock skew explains is
+            # forged, and would keep the client on the primary past the window
+            if age is not None and -self.CLOCK_SKEW_SECONDS <= age < self.pin_seconds:
+                return True
+        return user_id is not None and self._pins.get(user_id) is not None
+
+    def mark_unhealthy(self, error: BaseException):
+        if self._healthy:
+            logger.warning("Read replica taken out of rotation: %s", error)
+            self.failovers += 1
+        self._healthy = False
+        self._down_until = time.monotonic() + self.retry_after
+
+    def _on_error(self, context):
+        # Connect failures and dropped connections, not ordinary query errors
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy(context.original_exception)
+
+    async def _check(self):
+        try:
+            async with self.engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=self.CHECK_TIMEOUT_SECONDS)
+        except Exception as e:
+            self.mark_unhealthy(e)
+        else:
+            if not self._healthy:
+                logger.info("Read replica back in rotation")
+            self._healthy = True
+        self._checked_at = time.monotonic()
+
+    async def is_available(self) -> bool:
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        if not self._healthy and now < self._down_until:
+            return False
+        if now - self._checked_at >= self.check_interval:
+            # One check at a time; concurrent requests use the last result
+            if not self._check_lock.locked():
+                async with self._check_lock:
+                    await self._check()
+        return self._healthy
+
+    async def use_replica(self, user_id: Optional[UUID], last_write: Optional[str] = None) -> bool:
+        if self.is_pinned(user_id, last_write):
+            self.pinned_reads += 1
+            self.primary_reads += 1
+            return False
+        if await self.is_available():
+            self.replica_reads += 1
+            return True
+        self.primary_reads += 1
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "healthy": self.enabled and self._healthy,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+            "failovers": self.failovers,
+            "pinned_users": len(self._pins)
+        }
+
+
+class ReadYourWritesMiddleware:
+    """
+    Sets the read-your-writes cookie on responses to requests that wrote.
+
+    A plain ASGI middleware like QueryStatsMiddleware: ReplicaRouter.pin()
+    records the write time of the request being handled, and the cookie is
+    added to the response headers when they go out.
+    """
+
+    def __init__(self, app, router: ReplicaRouter):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_write = [None]
+        token = _request_write.set(request_write)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and request_write[0] is not None:
+                cookie = (f"{settings.READ_YOUR_WRITES_COOKIE}={request_write[0]:.3f}; "
+                          f"Max-Age={self.router.pin_seconds}; Path=/; HttpOnly; SameSite=Lax")
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _request_write.reset(token)
+
+
+def track_writes(router: ReplicaRouter):
+    """
+    Pin a user to the primary after any session of theirs commits a write.
+
+    Sessions are tagged with the authenticated user in
+    app.utils.dependencies.get_current_user (session.info["principal_id"]).
+    """
+
+    @event.listens_for(Session, "after_flush")
+    def _after_flush(session, flush_context):
+        session.info["wrote"] = True
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _on_execute(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            orm_execute_state.session.info["wrote"] = True
+
+    @event.listens_for(Session, "after_commit")
+    def _after_commit(session):
+        if session.info.pop("wrote", False) and session.info.get("principal_id"):
+            router.pin(session.info["principal_id"])
+
+    @event.listens_for(Session, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop("wrote", None)
@@ -0,0 +1,93 @@
+# app/core/schema.py
+import ast
+import asyncio
+import glob
+import logging
+import os
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+VERSIONS_DIR = os.path.join(BACKEND_DIR, "migrations", "versions")
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def alembic_config():
+    # Alembic is only needed by the CLI and tooling, not by API workers
+    from alembic.config import Config
+    return Config(ALEMBIC_INI)
+
+
+def _revision_ids(path: str) -> tuple[str, tuple[str, ...]]:
+    values = {}
+    for node in ast.parse(open(path).read()).body:
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            values[node.target.id] = node.value
+        elif isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            values[node.targets[0].id] = node.value
+    revision = ast.literal_eval(values["revision"])
+    down = ast.literal_eval(values["down_revision"]) if "down_revision" in values else None
+    if down is None:
+        down = ()
+    elif isinstance(down, str):
+        down = (down,)
+    return revision, tuple(down)
+
+
+def head_revision() -> str:
+    """
+    Revision the code expects, read from the migration scripts (no DB access).
+
+    The ids are parsed straight from the revision files: loading Alembic's
+    ScriptDirectory costs ~100ms per worker, far more than the check itself.
+    """
+    revisions = {}
+    for path in glob.glob(os.path.join(VERSIONS_DIR, "*.py")):
+        revision, down = _revision_ids(path)
+        revisions[revision] = down
+    referenced = {down for downs in revisions.values() for down in downs}
+    heads = sorted(set(revisions) - referenced)
+    if len(heads) != 1:
+        raise SchemaVersionError(f"Expected a single migration head, found {heads}")
+    return heads[0]
+
+
+async def current_revision(engine: AsyncEngine) -> Optional[str]:
+    async with engine.connect() as conn:
+        try:
+            return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+        except Exception:
+            # No alembic_version table: never migrated
+            return None
+
+
+async def check_schema_version(engine: AsyncEngine, timeout: float):
+    """
+    Startup check: one single-row SELECT instead of reflecting every table.
+
+    Raises SchemaVersionError when the database is reachable but not at the
+    migrations head. If the database can't be reached the check is skipped
+    with a warning, so a brief outage doesn't stop the worker from booting.
+    """
+    head = head_revision()
+    try:
+        current = await asyncio.wait_for(current_revision(engine), timeout=timeout)
+    except Exception as e:
+        logger.warning("Schema version check skipped, database unavailable: %s", e)
+        return
+
+    if current != head:
+        hint = "Run `python -m app.cli migrate` first."
+        if current is None:
+            hint += (" If the tables were created before migrations existed, run "
+                     "`python -m app.cli stamp 0001` before that.")
+        raise SchemaVersionError(
+            f"Database schema is at revision {current or '<none>'} but the code expects {head}. {hint}"
+        )
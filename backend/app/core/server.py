@@ -0,0 +1,123 @@
+# app/core/server.py
+"""
+Gunicorn master + uvicorn workers for production (see serve.py). Gunicorn
+forks and supervises the workers (restarts crashed ones, recycles them
+after SERVER_MAX_REQUESTS); each worker runs the app on uvloop with the
+httptools parser.
+
+On SIGTERM the master stops accepting and signals the workers. Each one
+stops listening, waits up to SERVER_DRAIN_TIMEOUT_SECONDS for in-flight
+requests to finish, then runs the app's lifespan shutdown, which stops
+the background jobs (up to SHUTDOWN_JOBS_TIMEOUT_SECONDS). The master
+kills workers still alive after both timeouts plus a margin.
+
+/metrics aggregates all workers through prometheus_client's multiprocess
+mode (app/core/prometheus.py), set up by prepare_metrics_dir().
+"""
+import math
+import os
+import shutil
+import tempfile
+from typing import Optional
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+from app.config import settings
+
+# Slack on top of the drain and job timeouts before the master kills a worker
+SHUTDOWN_MARGIN_SECONDS = 5
+
+# Metrics directory created by prepare_metrics_dir(), removed on exit
+_temporary_metrics_dir: Optional[str] = None
+
+
+class AppWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+        "limit_concurrency": settings.SERVER_LIMIT_CONCURRENCY,
+        "timeout_graceful_shutdown": settings.SERVER_DRAIN_TIMEOUT_SECONDS,
+    }
+
+
+def default_workers() -> int:
+    # Workers are single-threaded event loops: one per CPU keeps them all busy
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def prepare_metrics_dir() -> str:
+    """
+    Point prometheus_client at an emptied multiprocess directory. Must run
+    before anything imports prometheus_client, which reads the variable on
+    import, so before the app is loaded.
+    """
+    global _temporary_metrics_dir
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or settings.PROMETHEUS_MULTIPROC_DIR
+    if not path:
+        path = _temporary_metrics_dir = tempfile.mkdtemp(prefix="zuno-metrics-")
+    os.makedirs(path, exist_ok=True)
+    # Values left by an earlier run would be added to this one's
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    return path
+
+
+def child_exit(server, worker):
+    # Imported here: prometheus_client must not load before prepare_metrics_dir()
+    from app.core.prometheus import mark_process_dead
+    mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if _temporary_metrics_dir is not None:
+        shutil.rmtree(_temporary_metrics_dir, ignore_errors=True)
+
+
+def server_options(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    preload: Optional[bool] = None
+) -> dict:
+    """
+    Gunicorn settings from the SERVER_* settings, with overrides
+    """
+    return {
+        "bind": f"{host or settings.SERVER_HOST}:{port or settings.SERVER_PORT}",
+        "workers": workers or default_workers(),
+        "worker_class": f"{AppWorker.__module__}.{AppWorker.__name__}",
+        "preload_app": settings.SERVER_PRELOAD if preload is None else preload,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "backlog": settings.SERVER_BACKLOG,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS // 10,
+        "graceful_timeout": math.ceil(
+            settings.SERVER_DRAIN_TIMEOUT_SECONDS
+            + settings.SHUTDOWN_JOBS_TIMEOUT_SECONDS
+            + SHUTDOWN_MARGIN_SECONDS
+        ),
+        "child_exit": child_exit,
+        "on_exit": on_exit,
+        "accesslog": "-",
+        "errorlog": "-",
+    }
+
+
+class Server(BaseApplication):
+    """
+    Gunicorn application serving app.main:app with the given options
+    """
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        return app
@@ -1,22 +1,79 @@
 # app/database.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.core.db_pool import instrument_engine, pool_options
+from app.core.query_stats import instrument_queries
+from app.core.read_routing import ReplicaRouter, track_writes
 
-# Create database engine
-engine = create_engine(settings.DATABASE_URL)
+# Async drivers for the sync URLs used in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Swap the driver of a sync database URL for its asyncio counterpart
+    """
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
 
-# Create session factory
+
+# Sync engine - used by scripts, the CLI and migrations
+engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine - used by the API. Pool sizing comes from Settings
+async_engine = create_async_engine(async_database_url(settings.DATABASE_URL), **pool_options())
+instrument_engine(async_engine)
+instrument_queries(async_engine)
+
+# expire_on_commit=False: objects stay readable after commit without
+# an implicit (and in async, illegal) lazy refresh
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Read replica - optional, used by read-only endpoints through get_read_db
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_async_engine(async_database_url(settings.DATABASE_REPLICA_URL), **pool_options())
+    instrument_engine(replica_engine, "replica")
+    instrument_queries(replica_engine)
+    ReplicaSessionLocal = async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+replica_router = ReplicaRouter(
+    replica_engine,
+    check_interval=settings.REPLICA_HEALTH_CHECK_SECONDS,
+    retry_after=settings.REPLICA_RETRY_SECONDS,
+    pin_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    max_pins=settings.READ_YOUR_WRITES_MAX_USERS
+)
+track_writes(replica_router)
+
 # Create base class for models
 Base = declarative_base()
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -1,17 +1,53 @@
 # app/main.py
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, workspace, invite, subscription
+from app.routers import auth, workspace, invite, subscription, dashboard, internal
 from app.config import settings
-from app.database import engine, Base
+from app.core.prometheus import PrometheusMiddleware, render_metrics
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.schema import check_schema_version
+from app.core.read_routing import ReadYourWritesMiddleware
+from app.database import async_engine, replica_router
+from app.services.password_hasher import password_hasher
+from app.services.email_outbox import email_outbox_worker
+from app.services.invite_sweeper import invite_sweeper
+from app.services.token_purger import token_purger
+from app.utils.dependencies import require_metrics_access
+from app.services.smtp_pool import smtp_pool
+from app.services.email_templates import email_templates
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema is managed by migrations (python -m app.cli migrate)
+    if settings.SCHEMA_VERSION_CHECK:
+        await check_schema_version(async_engine, timeout=settings.SCHEMA_VERSION_CHECK_TIMEOUT_SECONDS)
+    email_templates.load_all()
+    if settings.EMAIL_OUTBOX_ENABLED:
+        email_outbox_worker.start()
+    if settings.INVITE_SWEEP_ENABLED:
+        invite_sweeper.start()
+    if settings.TOKEN_PURGE_ENABLED:
+        token_purger.start()
+    yield
+    # Shutdown (after the server has drained in-flight requests): let each
+    # job finish its current run, side by side, then close the SMTP pool
+    # its last emails went through
+    await asyncio.gather(*(
+        job.stop(timeout=settings.SHUTDOWN_JOBS_TIMEOUT_SECONDS)
+        for job in (email_outbox_worker, invite_sweeper, token_purger)
+    ))
+    await smtp_pool.close()
+    password_hasher.shutdown()
 
-# Create tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Zuno Task Management API",
     description="Backend API for Zuno Task Management Platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -22,12 +58,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ReadYourWritesMiddleware, router=replica_router)
+app.add_middleware(PrometheusMiddleware)
 
 # Include routers
 app.include_router(auth.router)
 app.include_router(workspace.router)
 app.include_router(invite.router)
 app.include_router(subscription.router)
+app.include_router(dashboard.router)
+app.include_router(internal.router)
 
 @app.get("/")
 async def root():
@@ -39,4 +80,14 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "zuno-api"}
\ No newline at end of file
+    return {"status": "healthy", "service": "zuno-api"}
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+def metrics():
+    """
+    Prometheus scrape endpoint (all workers under serve.py), behind
+    METRICS_TOKEN. A plain def: in multiprocess mode rendering reads every
+    worker's files, so it runs in the threadpool.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
\ No newline at end of file
@@ -1,17 +1,10 @@
-from app.database import engine, Base
-
-# import all models here
+# import all models here, so Base.metadata (and Alembic) sees every table
 from app.models.user import User
 from app.models.invite import Invite
 from app.models.project import Project
 from app.models.subscription import Subscription
 from app.models.workspace import Workspace
 from app.models.workspace_member import WorkspaceMember
-
-def init():
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Done ✅")
-
-if __name__ == "__main__":
-    init()
+from app.models.email_outbox import EmailOutbox
+from app.models.slug_counter import SlugCounter
+from app.models.auth_token import AuthToken
@@ -0,0 +1,31 @@
+# app/models/auth_token.py
+import uuid
+from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class AuthToken(Base):
+    """
+    One-time tokens sent by email (verification, invites, ...). Only the
+    SHA-256 of the token is stored; see TokenService.
+    """
+    __tablename__ = "auth_tokens"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)  # sha256 hex digest
+    purpose = Column(String(32), nullable=False)  # email_verification/invite/password_reset
+    subject_id = Column(UUID(as_uuid=True), nullable=False)  # User id or Invite id, depending on purpose
+
+    expires_at = Column(DateTime, nullable=False)
+    consumed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Revoking a subject's outstanding tokens (resends)
+        Index("ix_auth_tokens_purpose_subject_id", "purpose", "subject_id"),
+        # Purge of expired tokens
+        Index("ix_auth_tokens_expires_at", "expires_at"),
+    )
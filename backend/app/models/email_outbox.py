@@ -0,0 +1,33 @@
+# app/models/email_outbox.py
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Index, Text, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    template = Column(String(50), nullable=False)  # verification/invitation
+    to_email = Column(String(255), nullable=False)
+    payload = Column(JSON, nullable=False)  # Template context
+
+    status = Column(String(20), default="pending")  # pending/sent/dead
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Worker claim query; sent and dead rows are never scanned
+        Index(
+            "ix_email_outbox_pending_next_attempt_at", "next_attempt_at",
+            postgresql_where=status == "pending", sqlite_where=status == "pending"
+        ),
+    )
@@ -1,6 +1,6 @@
 # app/models/invite.py
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.database import Base
@@ -21,13 +21,30 @@ class Invite(Base):
     invitee_name = Column(String(255), nullable=True)  # For new users
     invited_to_workspace_name = Column(String(255), nullable=True)  # Store workspace name
 
-    token = Column(String(255), unique=True, index=True)
     status = Column(String(20), default="pending")  # pending/accepted/declined/expired
 
     expires_at = Column(DateTime)
     accepted_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        # Pending invite counts/duplicate checks and sent-invites per workspace
+        Index("ix_invites_workspace_id_status_expires_at", "workspace_id", "status", "expires_at"),
+        # Pending invites for the signed-in user's email
+        Index("ix_invites_email_status_expires_at", "email", "status", "expires_at"),
+        # One pending invite per email and workspace; the arbiter of the
+        # invite upsert in WorkspaceService.invite_team_member
+        Index(
+            "uq_invites_workspace_id_email_pending", "workspace_id", "email", unique=True,
+            postgresql_where=status == "pending", sqlite_where=status == "pending"
+        ),
+        # Invite sweeper: overdue pending invites, oldest expiry first
+        Index(
+            "ix_invites_pending_expires_at", "expires_at",
+            postgresql_where=status == "pending", sqlite_where=status == "pending"
+        ),
+    )
+    
     # Relationship
     workspace = relationship("Workspace", backref="invites")
     inviter = relationship("User", foreign_keys=[invited_by])
\ No newline at end of file
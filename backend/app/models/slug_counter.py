@@ -0,0 +1,15 @@
+# app/models/slug_counter.py
+from sqlalchemy import Column, String, Integer
+from app.database import Base
+
+
+class SlugCounter(Base):
+    """
+    Last numeric suffix handed out per base slug ("johns-workspace" -> 3
+    means johns-workspace-3 was the latest), so a free slug is found with
+    one upsert instead of probing -1, -2, ... in a loop.
+    """
+    __tablename__ = "slug_counters"
+
+    base_slug = Column(String(255), primary_key=True)
+    last_suffix = Column(Integer, nullable=False, default=0)
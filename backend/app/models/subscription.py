@@ -25,6 +25,9 @@ class Subscription(Base):
 
     current_period_end = Column(DateTime)
 
+    # Workspaces owned by the subscriber, maintained by UsageService
+    workspace_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     owner = relationship("User")
@@ -14,8 +14,6 @@ class User(Base):
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     is_verified = Column(Boolean, default=False)
-    verification_token = Column(String(255), nullable=True)
-    verification_token_expires = Column(DateTime, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -23,6 +21,10 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     profile_picture = Column(Text, nullable=True)
     
+    # Bumped with every change to the user's memberships or the invites sent
+    # to their email (ETags of the dashboard listings), see VersionService
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Relationships
     owned_workspaces = relationship("Workspace", back_populates="owner")
     workspace_memberships = relationship("WorkspaceMember", back_populates="user")
@@ -1,6 +1,6 @@
 # app/models/workspace.py
 import uuid
-from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -18,8 +18,20 @@ class Workspace(Base):
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     is_active = Column(Boolean, default=True)
+
+    # Seat usage counters, maintained by UsageService
+    member_count = Column(Integer, nullable=False, default=0, server_default="0")  # Active members
+    pending_invite_count = Column(Integer, nullable=False, default=0, server_default="0")  # Pending invites
+    
+    # Bumped with every member/invite change (ETags of the member listing)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Owned workspaces (oldest first) and per-owner workspace counts
+        Index("ix_workspaces_owner_id_created_at", "owner_id", "created_at"),
+    )
+
     owner = relationship("User", back_populates="owned_workspaces")
     members = relationship("WorkspaceMember", back_populates="workspace")
     projects = relationship("Project", back_populates="workspace")
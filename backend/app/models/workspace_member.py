@@ -1,6 +1,6 @@
 # app/models/workspace_member.py
 import uuid
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -21,7 +21,18 @@ class WorkspaceMember(Base):
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
 
     __table_args__ = (
+        # Also serves (workspace_id, user_id) membership checks
         UniqueConstraint("workspace_id", "user_id"),
+        # "My workspaces"
+        Index(
+            "ix_workspace_members_user_id_active", "user_id",
+            postgresql_where=is_active == True, sqlite_where=is_active == True
+        ),
+        # Member lists, member counts and owner/admin checks
+        Index(
+            "ix_workspace_members_workspace_id_role_active", "workspace_id", "role",
+            postgresql_where=is_active == True, sqlite_where=is_active == True
+        ),
     )
 
     workspace = relationship("Workspace", back_populates="members")
@@ -1,7 +1,7 @@
 # app/routers/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, replica_router
 from app.schemas.user import UserCreate, UserLogin, UserVerify, Token, UserInDB, UserVerifyResponse
 from app.services.auth_service import AuthService
 from app.utils.dependencies import get_current_active_user
@@ -9,13 +9,15 @@ from app.utils.dependencies import get_current_active_user
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/register", response_model=UserInDB)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user
     """
     try:
-        user = AuthService.register_user(db, user_data)
+        user = await AuthService.register_user(db, user_data)
         return user
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -23,12 +25,13 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
 @router.post("/verify-email", response_model=UserVerifyResponse)
-async def verify_email(verify_data: UserVerify, db: Session = Depends(get_db)):
+async def verify_email(verify_data: UserVerify, db: AsyncSession = Depends(get_db)):
     """
     Verify user's email with token
     """
     try:
-        user = AuthService.verify_email(db, verify_data.token)
+        user = await AuthService.verify_email(db, verify_data.token)
+        replica_router.pin(user.id)
         return UserVerifyResponse(
             message="Email verified successfully",
             user_id=user.id,
@@ -43,12 +46,12 @@ async def verify_email(verify_data: UserVerify, db: Session = Depends(get_db)):
         )
 
 @router.post("/login", response_model=Token)
-async def login(login_data: UserLogin, db: Session = Depends(get_db)):
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_db)):
     """
     Login user and return access token
     """
     try:
-        token = AuthService.login_user(db, login_data.email, login_data.password)
+        token = await AuthService.login_user(db, login_data.email, login_data.password)
         return token
     except HTTPException as e:
         raise e
@@ -69,7 +72,7 @@ async def get_current_user_info(current_user: dict = Depends(get_current_active_
 
 # Optional: Implement resend verification if needed
 @router.post("/resend-verification")
-async def resend_verification_email(email: str, db: Session = Depends(get_db)):
+async def resend_verification_email(email: str, db: AsyncSession = Depends(get_db)):
     """
     Resend verification email
     """
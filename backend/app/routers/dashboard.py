@@ -0,0 +1,86 @@
+# app/routers/dashboard.py
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.dependencies import get_current_active_user, get_read_db
+from app.models.user import User
+from app.schemas.dashboard import BOOTSTRAP_FIELDS, BootstrapResponse
+from app.schemas.subscription import SubscriptionResponse
+from app.schemas.user import UserInDB
+from app.services.entitlement_service import EntitlementService
+from app.services.invite_service import InviteService
+from app.services.workspace_service import WorkspaceService
+from app.utils.responses import OrjsonResponse
+
+router = APIRouter(tags=["dashboard"])
+
+
+def _parse_fields(fields: Optional[str]) -> set[str]:
+    if not fields:
+        return set(BOOTSTRAP_FIELDS)
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(BOOTSTRAP_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Choose from: {', '.join(BOOTSTRAP_FIELDS)}"
+        )
+    return requested
+
+
+@router.get("/bootstrap", response_model=BootstrapResponse)
+async def get_bootstrap(
+    fields: Optional[str] = Query(None, description=f"Comma-separated sections, any of: {', '.join(BOOTSTRAP_FIELDS)}"),
+    workspace_id: Optional[UUID] = Query(None, description="Workspace whose members to include (default: the first one)"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Everything the dashboard loads on open, in one request: the user, their
+    subscription and usage, workspaces with roles, the selected workspace's
+    members and pending invites.
+
+    Authenticates once and runs at most one query per section (the user and
+    usually the subscription come from the principal and entitlements
+    caches). They share one session, so the queries run one after another.
+    """
+    sections = _parse_fields(fields)
+    payload = {}
+
+    if "user" in sections:
+        payload["user"] = UserInDB.model_validate(current_user)
+
+    if "subscription" in sections:
+        entitlements = await EntitlementService.get(db, current_user.id)
+        payload["subscription"] = (
+            SubscriptionResponse.from_entitlements(entitlements)
+            if entitlements.subscription_id is not None else None
+        )
+
+    if "workspaces" in sections or "members" in sections:
+        # Members are only shown for one of the user's own workspaces, so
+        # the workspace list doubles as the membership check
+        workspaces = await WorkspaceService.get_user_workspaces(db, current_user.id)
+        if "workspaces" in sections:
+            payload["workspaces"] = workspaces
+
+        if "members" in sections:
+            if workspace_id is not None and not any(workspace["id"] == workspace_id for workspace in workspaces):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="You are not a member of this workspace"
+                )
+            selected_id = workspace_id or (workspaces[0]["id"] if workspaces else None)
+            payload["selected_workspace_id"] = selected_id
+            payload["members"] = (
+                await WorkspaceService.get_workspace_members(db, selected_id) if selected_id is not None else []
+            )
+
+    if "pending_invites" in sections:
+        payload["pending_invites"] = await InviteService.get_pending_invites(db, current_user.email)
+
+    # Sections left out of the payload are left out of the response. The
+    # listings are already plain dicts, so they skip response validation.
+    return OrjsonResponse(payload)
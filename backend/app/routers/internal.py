@@ -0,0 +1,38 @@
+# app/routers/internal.py
+from fastapi import APIRouter, Depends
+from app.core.db_pool import pool_stats
+from app.core.query_stats import query_metrics
+from app.database import async_engine, replica_engine, replica_router
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
+from app.services.entitlement_service import entitlements_cache
+from app.services.email_outbox import email_outbox_worker
+from app.services.invite_sweeper import invite_sweeper
+from app.services.token_purger import token_purger
+from app.services.smtp_pool import smtp_pool
+from app.utils.dependencies import require_metrics_access
+
+router = APIRouter(
+    prefix="/internal", tags=["internal"], include_in_schema=False,
+    dependencies=[Depends(require_metrics_access)]
+)
+
+
+@router.get("/metrics")
+async def get_internal_metrics():
+    """
+    Runtime counters for operations (not part of the public API)
+    """
+    return {
+        "password_hasher": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
+        "entitlements_cache": entitlements_cache.stats(),
+        "email_outbox": email_outbox_worker.stats(),
+        "invite_sweeper": invite_sweeper.stats(),
+        "token_purger": token_purger.stats(),
+        "smtp_pool": smtp_pool.stats(),
+        "db_pool": pool_stats(async_engine),
+        "db_replica_pool": pool_stats(replica_engine) if replica_engine is not None else None,
+        "read_replica": replica_router.stats(),
+        "db_queries": query_metrics.stats()
+    }
@@ -1,20 +1,24 @@
 # app/routers/invite.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.utils.dependencies import get_current_active_user
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, contains_eager
+from app.database import get_db, replica_router
+from app.utils.dependencies import get_current_active_user, get_read_db
 from app.models.invite import Invite
 from app.models.user import User
-from app.models.workspace import Workspace
 from app.models.workspace_member import WorkspaceMember
 from app.schemas.workspace import InviteTeamMemberRequest
 from app.schemas.invite import (
     AcceptInviteRequest, 
     AcceptInviteResponse,
-    InviteDetailsResponse
+    InviteDetailsResponse,
+    SentInviteResponse
 )
 from app.services.invite_service import InviteService
-from datetime import datetime
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.utils.responses import OrjsonResponse
 from uuid import UUID
 from app.config import settings
 
@@ -23,13 +27,13 @@ router = APIRouter(prefix="/invites", tags=["invites"])
 @router.get("/details/{token}", response_model=InviteDetailsResponse)
 async def get_invite_details(
     token: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get invite details for the acceptance page
     No authentication required
     """
-    result = InviteService.get_invite_details(db, token)
+    result = await InviteService.get_invite_details(db, token)
     
     return InviteDetailsResponse(
         id=result["invite"].id,
@@ -46,18 +50,20 @@ async def get_invite_details(
 @router.post("/accept")
 async def accept_invite(
     accept_data: AcceptInviteRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Accept a workspace invitation
     Handles both existing users and new user registration
     """
-    result = InviteService.accept_invite(
+    result = await InviteService.accept_invite(
         db=db,
         token=accept_data.token,
         full_name=accept_data.full_name,
         password=accept_data.password
     )
+    # The caller isn't authenticated yet, so pin the new member explicitly
+    replica_router.pin(result["user"].id)
     
     return {
         "message": "Invitation accepted successfully",
@@ -84,71 +90,59 @@ async def accept_invite(
 async def decline_invite(
     token: str,
     email: str = Query(..., description="Email address of the invitee"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Decline a workspace invitation
     """
-    result = InviteService.decline_invite(db, token, email)
+    result = await InviteService.decline_invite(db, token, email)
     return result
 
 @router.get("/pending", response_model=list[InviteDetailsResponse])
 async def get_pending_invites(
+    request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get pending invites for the current user's email
+    Answers If-None-Match with 304 while the user's version is unchanged
+    and none of the listed invites has expired since
     """
-    pending_invites = (
-        db.query(Invite)
-        .join(Workspace, Invite.workspace_id == Workspace.id)
-        .filter(
-            Invite.email == current_user.email,
-            Invite.status == "pending",
-            Invite.expires_at > datetime.utcnow()
-        )
-        .all()
-    )
+    # Read before the listing, so the body is never older than its ETag.
+    # Expiry isn't a write (the sweeper may be late or off), so the next
+    # invite to expire is part of the tag: once it lapses the tag moves.
+    next_expiry = select(func.min(Invite.expires_at)).where(
+        Invite.email == current_user.email,
+        Invite.status == "pending",
+        Invite.expires_at > datetime.utcnow()
+    ).scalar_subquery()
+    version, expires_at = (await db.execute(
+        select(User.version, next_expiry).where(User.id == current_user.id)
+    )).one()
+    etag = make_etag("pending-invites", current_user.id, version, expires_at.isoformat() if expires_at else "none")
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    # Format response
-    invites_list = []
-    for invite in pending_invites:
-        inviter_name = None
-        if invite.invited_by:
-            inviter = db.query(User).filter(User.id == invite.invited_by).first()
-            inviter_name = inviter.full_name if inviter else None
-        
-        invites_list.append(InviteDetailsResponse(
-            id=invite.id,
-            workspace_id=invite.workspace_id,
-            workspace_name=invite.workspace.name if invite.workspace else invite.invited_to_workspace_name,
-            invited_by=inviter_name,
-            email=invite.email,
-            role=invite.role,
-            status=invite.status,
-            expires_at=invite.expires_at,
-            created_at=invite.created_at
-        ))
-    
-    return invites_list
+    invites = await InviteService.get_pending_invites(db, current_user.email)
+    return OrjsonResponse(invites, headers=etag_headers(etag))
 
-@router.get("/{workspace_id}/sent-invites")
+@router.get("/{workspace_id}/sent-invites", response_model=list[SentInviteResponse])
 async def get_sent_invites(
     workspace_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all invites sent for a workspace (admin/owner only)
     """
     # Check if user is owner/admin of the workspace
-    membership = db.query(WorkspaceMember).filter(
+    membership = await db.scalar(select(WorkspaceMember).where(
         WorkspaceMember.workspace_id == workspace_id,
         WorkspaceMember.user_id == current_user.id,
         WorkspaceMember.is_active == True,
         WorkspaceMember.role.in_(["owner", "admin"])
-    ).first()
+    ))
     
     if not membership:
         raise HTTPException(
@@ -156,38 +150,35 @@ async def get_sent_invites(
             detail="Only owners and admins can view sent invites"
         )
     
-    invites = (
-        db.query(Invite)
-        .filter(
+    # Inviter and "does the invitee have an account" in the same query
+    invitee = aliased(User)
+    user_exists = exists().where(
+        invitee.email == Invite.email,
+        invitee.is_verified == True
+    ).label("user_exists")
+    
+    invites = (await db.execute(
+        select(Invite, user_exists)
+        .outerjoin(Invite.inviter)
+        .options(contains_eager(Invite.inviter))
+        .where(
             Invite.workspace_id == workspace_id
         )
         .order_by(Invite.created_at.desc())
-        .all()
-    )
+    )).all()
     
     invites_list = []
-    for invite in invites:
-        inviter_name = None
-        if invite.invited_by:
-            inviter = db.query(User).filter(User.id == invite.invited_by).first()
-            inviter_name = inviter.full_name if inviter else None
-        
-        # Check if user exists
-        user_exists = db.query(User).filter(
-            User.email == invite.email,
-            User.is_verified == True
-        ).first() is not None
-        
+    for invite, user_exists in invites:
         invites_list.append({
             "id": invite.id,
             "email": invite.email,
             "role": invite.role,
             "status": invite.status,
-            "invited_by": inviter_name,
+            "invited_by": invite.inviter.full_name if invite.inviter else None,
             "created_at": invite.created_at,
             "expires_at": invite.expires_at,
             "accepted_at": invite.accepted_at,
             "user_exists": user_exists
         })
     
-    return invites_list
\ No newline at end of file
+    return OrjsonResponse(invites_list)
\ No newline at end of file
@@ -1,25 +1,45 @@
 # app/routers/subscription.py 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.utils.dependencies import get_current_active_user
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.dependencies import get_current_active_user, get_read_db
 from app.schemas.subscription import SubscriptionResponse
 from app.models.user import User
-from app.models.subscription import Subscription
+from app.services.entitlement_service import EntitlementService
+from app.utils.etag import conditional_response, make_etag
 
 router = APIRouter(prefix="/subscription", tags=["workspaces"])
 
 
 @router.get("/current-plan-details", response_model=SubscriptionResponse)
 async def get_my_subscription(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Get subscription details
+    Get subscription details with the plan's limits and current usage
+    Answers If-None-Match with 304 while they are unchanged
     """
-    subscription = db.query(Subscription).filter(
-        Subscription.owner_id == current_user.id
-    ).first()
+    entitlements = await EntitlementService.get(db, current_user.id)
+    if entitlements.subscription_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Subscription not found"
+        )
+    
+    # Tagged with the fields that change (usually served from the
+    # entitlements cache, so no version lookup is needed)
+    etag = make_etag(
+        "plan",
+        entitlements.subscription_id,
+        entitlements.plan,
+        entitlements.status,
+        entitlements.workspace_count,
+        entitlements.current_period_end.timestamp() if entitlements.current_period_end else 0
+    )
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
 
-    return subscription
+    return SubscriptionResponse.from_entitlements(entitlements)
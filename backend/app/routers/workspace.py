@@ -1,8 +1,9 @@
 # app/routers/workspace.py 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.utils.dependencies import get_current_active_user
+from app.utils.dependencies import get_current_active_user, get_read_db
 from app.models.workspace import Workspace
 from app.models.workspace_member import WorkspaceMember
 from app.models.user import User
@@ -11,27 +12,48 @@ from app.schemas.workspace import (
     WorkspaceCreate, 
     InviteTeamMemberRequest,
     InviteResponse,
-    CreateWorkspaceResponse
+    CreateWorkspaceResponse,
+    WorkspaceMemberDetailResponse
 )
 from app.services.workspace_service import WorkspaceService
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.utils.responses import OrjsonResponse
 from uuid import UUID
 
 router = APIRouter(prefix="/workspaces", tags=["workspaces"])
 
+
+def _owned_workspace_response(workspace: Workspace) -> WorkspaceResponse:
+    """
+    WorkspaceResponse for a workspace the current user owns
+    """
+    return WorkspaceResponse(
+        id=workspace.id,
+        name=workspace.name,
+        slug=workspace.slug,
+        description=workspace.description,
+        owner_id=workspace.owner_id,
+        is_active=workspace.is_active,
+        created_at=workspace.created_at,
+        user_role="owner",
+        is_owner=True
+    )
+
+
 @router.get("/default", response_model=WorkspaceResponse)
 async def get_default_workspace(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get user's default (first created) workspace
     """
 
-    workspace = (
-        db.query(Workspace)
-        .filter(Workspace.owner_id == current_user.id)
+    workspace = await db.scalar(
+        select(Workspace)
+        .where(Workspace.owner_id == current_user.id)
         .order_by(Workspace.created_at.asc())
-        .first()
+        .limit(1)
     )
 
     if not workspace:
@@ -40,18 +62,18 @@ async def get_default_workspace(
             detail="No workspace found for user"
         )
 
-    return workspace
+    return _owned_workspace_response(workspace)
 
 @router.post("/create", response_model=CreateWorkspaceResponse)
 async def create_workspace(
     workspace_data: WorkspaceCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new workspace with plan validation
     """
-    result = WorkspaceService.create_new_workspace(
+    result = await WorkspaceService.create_new_workspace(
         db=db,
         user_id=current_user.id,
         workspace_name=workspace_data.name,
@@ -60,7 +82,7 @@ async def create_workspace(
     
     return CreateWorkspaceResponse(
         message="Workspace created successfully",
-        workspace=result["workspace"],
+        workspace=_owned_workspace_response(result["workspace"]),
         current_plan=result["current_plan"],
         workspace_count=result["workspace_count"],
         workspace_limit=result["workspace_limit"]
@@ -71,14 +93,14 @@ async def invite_team_member(
     workspace_id: UUID,
     invite_data: InviteTeamMemberRequest,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Invite a team member to workspace
     Only owners and admins can invite members
     Validates seat limits based on current plan
     """
-    result = WorkspaceService.invite_team_member(
+    result = await WorkspaceService.invite_team_member(
         db=db,
         workspace_id=workspace_id,
         inviter_id=current_user.id,
@@ -96,70 +118,55 @@ from app.services.workspace_service import WorkspaceService
 
 @router.get("/my-workspaces", response_model=list[WorkspaceResponse])
 async def get_my_workspaces(
+    request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all workspaces where the current user is a member (any role)
+    Answers If-None-Match with 304 while the user's version is unchanged
     """
-    workspaces = WorkspaceService.get_user_workspaces(db, current_user.id)
-    return workspaces
+    # Read before the listing, so the body is never older than its ETag
+    version = await db.scalar(select(User.version).where(User.id == current_user.id))
+    etag = make_etag("my-workspaces", current_user.id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    workspaces = await WorkspaceService.get_user_workspaces(db, current_user.id)
+    return OrjsonResponse(workspaces, headers=etag_headers(etag))
 
-@router.get("/{workspace_id}/members", response_model=list)
+@router.get("/{workspace_id}/members", response_model=list[WorkspaceMemberDetailResponse])
 async def get_workspace_members(
     workspace_id: UUID,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all members of a workspace
     User must be a member of the workspace
+    Answers If-None-Match with 304 while the workspace's version is unchanged
     """
-    # Check if user is a member of the workspace
-    user_membership = db.query(WorkspaceMember).filter(
-        WorkspaceMember.workspace_id == workspace_id,
-        WorkspaceMember.user_id == current_user.id,
-        WorkspaceMember.is_active == True
-    ).first()
+    # Check the user is a member and read the workspace's version in one query
+    version = await db.scalar(
+        select(Workspace.version)
+        .join(WorkspaceMember, WorkspaceMember.workspace_id == Workspace.id)
+        .where(
+            Workspace.id == workspace_id,
+            WorkspaceMember.user_id == current_user.id,
+            WorkspaceMember.is_active == True
+        )
+    )
     
-    if not user_membership:
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not a member of this workspace"
         )
     
-    # Get all active members
-    members = (
-        db.query(WorkspaceMember)
-        .join(User, WorkspaceMember.user_id == User.id)
-        .filter(
-            WorkspaceMember.workspace_id == workspace_id,
-            WorkspaceMember.is_active == True
-        )
-        .order_by(
-            WorkspaceMember.role.desc(),  # Owners first, then admins, then members
-            User.full_name.asc()
-        )
-        .all()
-    )
-    
-    # Format response with user details
-    member_list = []
-    for member in members:
-        member_data = {
-            "id": member.id,
-            "workspace_id": member.workspace_id,
-            "user_id": member.user_id,
-            "role": member.role,
-            "is_active": member.is_active,
-            "joined_at": member.joined_at,
-            "user": {
-                "id": member.user.id,
-                "full_name": member.user.full_name,
-                "email": member.user.email,
-                "profile_picture": member.user.profile_picture
-            }
-        }
-        member_list.append(member_data)
+    etag = make_etag("members", workspace_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    return member_list
\ No newline at end of file
+    members = await WorkspaceService.get_workspace_members(db, workspace_id)
+    return OrjsonResponse(members, headers=etag_headers(etag))
@@ -0,0 +1,23 @@
+# app/schemas/dashboard.py
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+from app.schemas.invite import InviteDetailsResponse
+from app.schemas.subscription import SubscriptionResponse
+from app.schemas.user import UserInDB
+from app.schemas.workspace import WorkspaceMemberDetailResponse, WorkspaceResponse
+
+# Sections of GET /bootstrap, selectable with ?fields=
+BOOTSTRAP_FIELDS = ("user", "subscription", "workspaces", "members", "pending_invites")
+
+class BootstrapResponse(BaseModel):
+    """
+    Everything the dashboard loads on open. Only the requested sections are
+    present; members are those of selected_workspace_id.
+    """
+    user: Optional[UserInDB] = None
+    subscription: Optional[SubscriptionResponse] = None
+    workspaces: Optional[list[WorkspaceResponse]] = None
+    selected_workspace_id: Optional[UUID] = None
+    members: Optional[list[WorkspaceMemberDetailResponse]] = None
+    pending_invites: Optional[list[InviteDetailsResponse]] = None
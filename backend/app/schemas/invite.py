@@ -31,4 +31,15 @@ class InviteDetailsResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SentInviteResponse(BaseModel):
+    id: UUID
+    email: str
+    role: str
+    status: str
+    invited_by: Optional[str] = None
+    created_at: datetime
+    expires_at: Optional[datetime]
+    accepted_at: Optional[datetime] = None
+    user_exists: bool
@@ -10,7 +10,26 @@ class SubscriptionResponse(BaseModel):
     status: str
     current_period_end: datetime | None
     created_at: datetime
+    seat_limit: int
+    workspace_limit: int
+    workspace_count: int
 
     class Config:
         from_attributes = True
 
+    @classmethod
+    def from_entitlements(cls, entitlements) -> "SubscriptionResponse":
+        """
+        Response for a subscribed owner's cached Entitlements
+        """
+        return cls(
+            id=entitlements.subscription_id,
+            owner_id=entitlements.owner_id,
+            plan=entitlements.plan,
+            status=entitlements.status,
+            current_period_end=entitlements.current_period_end,
+            created_at=entitlements.created_at,
+            seat_limit=entitlements.seat_limit,
+            workspace_limit=entitlements.workspace_limit,
+            workspace_count=entitlements.workspace_count
+        )
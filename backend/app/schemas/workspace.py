@@ -34,6 +34,18 @@ class WorkspaceMemberResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class MemberUserResponse(BaseModel):
+    id: UUID
+    full_name: str
+    email: str
+    profile_picture: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+class WorkspaceMemberDetailResponse(WorkspaceMemberResponse):
+    user: MemberUserResponse
+
 # New schemas for invite functionality
 class InviteTeamMemberRequest(BaseModel):
     email: EmailStr
@@ -1,20 +1,22 @@
 # app/services/auth_service.py (updated)
-from datetime import datetime, timedelta, timezone
-from sqlalchemy.orm import Session
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.utils.security import (
-    get_password_hash,
-    verify_password,
     create_access_token,
-    verify_token,
-    generate_verification_token
+    verify_token
 )
 from app.services.email_service import EmailService
+from app.services.entitlement_service import EntitlementService
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import Principal, principal_cache
+from app.services.token_service import TokenService
 from app.services.workspace_service import WorkspaceService
 from app.config import settings
-from app.models.subscription import Subscription
 
 
 class AuthService:
@@ -22,97 +24,99 @@ class AuthService:
     # Register User
     # -----------------------------
     @staticmethod
-    def register_user(db: Session, user_data: UserCreate):
+    async def register_user(db: AsyncSession, user_data: UserCreate):
         # Check if user already exists
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
+        existing_user = await db.scalar(select(User).where(User.email == user_data.email))
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
-        verification_token = generate_verification_token()
         db_user = User(
             full_name=user_data.full_name,
             email=user_data.email,
-            hashed_password=get_password_hash(user_data.password),
-            is_verified=False,
-            verification_token=verification_token,
-            verification_token_expires=datetime.now(timezone.utc) + timedelta(days=1)
+            hashed_password=await password_hasher.hash(user_data.password),
+            is_verified=False
         )
         
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.flush()
+        
+        verification_token = TokenService.issue(
+            db,
+            TokenService.EMAIL_VERIFICATION,
+            db_user.id,
+            # Naive UTC to match the DateTime column (asyncpg rejects aware values)
+            expires_at=datetime.utcnow() + timedelta(minutes=settings.EMAIL_VERIFICATION_TOKEN_EXPIRE_MINUTES)
+        )
         
+        # Queue the email in the same transaction as the user
         verification_link = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
-        EmailService.send_verification_email(
+        EmailService.queue_verification_email(
+            db=db,
             to_email=user_data.email,
             verification_link=verification_link,
             user_name=user_data.full_name
         )
         
+        await db.commit()
+        
         return db_user
 
     # -----------------------------
     # Verify Email
     # -----------------------------
     @staticmethod
-    def verify_email(db: Session, token: str):
-        user = db.query(User).filter(
-            User.verification_token == token,
-            User.verification_token_expires > datetime.now(timezone.utc)
-        ).first()
+    async def _mark_verified(db: AsyncSession, token: str) -> User:
+        # One-shot: a second request with the same token gets None
+        user_id = await TokenService.consume(db, TokenService.EMAIL_VERIFICATION, token)
+        user = await db.get(User, user_id) if user_id else None
         
         if not user:
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid or expired verification token"
             )
         
-        # Mark user as verified
         user.is_verified = True
-        user.verification_token = None
-        user.verification_token_expires = None
-        db.commit()
-        db.refresh(user)
+        return user
+
+    @staticmethod
+    async def verify_email(db: AsyncSession, token: str):
+        user = await AuthService._mark_verified(db, token)
+        user_id = user.id
         
-        # Create Free subscription and default workspace for the user
+        # Verification, FREE subscription and default workspace in one commit
         try:
-            # 1️⃣ Create FREE subscription for owner
-            subscription = Subscription(
-                owner_id=user.id,
-                plan="free",
-                status="active"
-            )
-            db.add(subscription)
-            db.commit()
-
-            # 2️⃣ Create default workspace
-            WorkspaceService.create_default_workspace_for_user(
+            await WorkspaceService.create_default_workspace_for_user(
                 db=db,
                 user_id=user.id,
                 user_full_name=user.full_name
             )
+            await db.commit()
 
         except Exception as e:
             # Even if workspace creation fails, user should still be verified
-            # We can  log this error for debugging
-            print(f"Workspace creation failed for user {user.id}: {str(e)}")
-            # We can decide whether to rollback user verification or continue
-            # For now, we'll continue since user is verified
+            await db.rollback()
+            print(f"Workspace creation failed for user {user_id}: {str(e)}")
+            user = await AuthService._mark_verified(db, token)
+            await db.commit()
         
+        principal_cache.invalidate(user.id)
+        EntitlementService.invalidate(user.id)
         return user
 
     # -----------------------------
     # Authenticate (password check)
     # -----------------------------
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str):
-        user = db.query(User).filter(User.email == email).first()
+    async def authenticate_user(db: AsyncSession, email: str, password: str):
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             return None
         return user
 
@@ -120,8 +124,8 @@ class AuthService:
     # Login - ONLY ACCESS TOKEN
     # -----------------------------
     @staticmethod
-    def login_user(db: Session, email: str, password: str):
-        user = AuthService.authenticate_user(db, email, password)
+    async def login_user(db: AsyncSession, email: str, password: str):
+        user = await AuthService.authenticate_user(db, email, password)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -149,7 +153,7 @@ class AuthService:
     # Get Current User from token
     # -----------------------------
     @staticmethod
-    def get_current_user(db: Session, token: str):
+    async def get_current_user(db: AsyncSession, token: str):
         payload = verify_token(token)
         if not payload:
             raise HTTPException(
@@ -164,18 +168,44 @@ class AuthService:
                 detail="Invalid token"
             )
         
-        user = db.query(User).filter(User.email == email).first()
-        if not user:
+        # Serve from the principal cache when possible
+        user_id = None
+        if payload.get("user_id"):
+            try:
+                user_id = uuid.UUID(payload["user_id"])
+            except ValueError:
+                user_id = None
+        
+        if user_id:
+            principal = principal_cache.get(user_id)
+            if principal and principal.email == email:
+                return principal
+        
+        # Load only the columns the principal needs
+        result = await db.execute(
+            select(
+                User.id,
+                User.email,
+                User.full_name,
+                User.is_verified,
+                User.is_active,
+                User.created_at
+            ).where(User.email == email)
+        )
+        row = result.first()
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found"
             )
         
-        return user
+        principal = Principal(**row._mapping)
+        principal_cache.set(principal)
+        return principal
     
 
     @staticmethod
-    def register_invited_user(db: Session, email: str, full_name: str, password: str):
+    async def register_invited_user(db: AsyncSession, email: str, full_name: str, password: str):
         """
         Register a user who came through an invitation
         - Auto-verifies email since they were invited
@@ -183,7 +213,7 @@ class AuthService:
         - Creates personal workspace
         """
         # Check if user already exists
-        existing_user = db.query(User).filter(User.email == email).first()
+        existing_user = await db.scalar(select(User).where(User.email == email))
         if existing_user:
             if existing_user.is_verified:
                 raise HTTPException(
@@ -193,41 +223,30 @@ class AuthService:
             else:
                 # Update existing unverified user
                 existing_user.full_name = full_name
-                existing_user.hashed_password = get_password_hash(password)
+                existing_user.hashed_password = await password_hasher.hash(password)
                 existing_user.is_verified = True
-                existing_user.verification_token = None
-                existing_user.verification_token_expires = None
-                db.commit()
-                db.refresh(existing_user)
+                await TokenService.revoke(db, TokenService.EMAIL_VERIFICATION, existing_user.id)
                 user = existing_user
         else:
             # Create new user
             user = User(
                 full_name=full_name,
                 email=email,
-                hashed_password=get_password_hash(password),
+                hashed_password=await password_hasher.hash(password),
                 is_verified=True,  # Auto-verify for invited users
                 is_active=True
             )
             
             db.add(user)
-            db.commit()
-            db.refresh(user)
-        
-        # Create FREE subscription
-        subscription = Subscription(
-            owner_id=user.id,
-            plan="free",
-            status="active"
-        )
-        db.add(subscription)
-        db.commit()
+            await db.flush()  # The workspace insert references the user row
         
-        # Create default workspace
-        WorkspaceService.create_default_workspace_for_user(
+        # Create FREE subscription and default workspace, all in one commit
+        await WorkspaceService.create_default_workspace_for_user(
             db=db,
             user_id=user.id,
             user_full_name=user.full_name
         )
+        await db.commit()
+        principal_cache.invalidate(user.id)
         
         return user
\ No newline at end of file
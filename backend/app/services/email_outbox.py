@@ -0,0 +1,164 @@
+# app/services/email_outbox.py
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import literal, select
+from app.config import settings
+from app.core.background import PeriodicJob
+from app.core.prometheus import EMAIL_SEND_DURATION, EMAILS
+from app.database import AsyncSessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxWorker(PeriodicJob):
+    """
+    Delivers queued emails from the outbox table in batches.
+
+    A batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased by
+    pushing `next_attempt_at` forward, so several workers can drain the same
+    outbox without sending twice and no transaction is held open while
+    talking to SMTP. If a worker dies mid-batch the lease runs out and the
+    rows are picked up again.
+
+    A failed send is retried with exponential backoff; after
+    EMAIL_OUTBOX_MAX_ATTEMPTS the row is dead-lettered (status='dead') and
+    kept for inspection. Sent and dead rows keep their payload minus the
+    links, so the table never holds a working token once it's done with it.
+    """
+
+    name = "email-outbox"
+
+    def __init__(self):
+        super().__init__(
+            interval=settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS,
+            batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE
+        )
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+
+    async def run_once(self) -> int:
+        batch = await self._claim_batch()
+        if not batch:
+            return 0
+
+        # Render and assemble MIME off the event loop
+        messages = await asyncio.to_thread(self._build_messages, batch)
+
+        # Sends run concurrently, bounded by the SMTP pool size
+        results = await asyncio.gather(
+            *(self._send(msg) for msg in messages),
+            return_exceptions=True
+        )
+        outcomes = {item["id"]: result for item, result in zip(batch, results)}
+
+        await self._record_outcomes(outcomes)
+        return len(batch)
+
+    @staticmethod
+    def backoff(attempts: int) -> timedelta:
+        delay = settings.EMAIL_OUTBOX_BACKOFF_SECONDS * (2 ** (attempts - 1))
+        return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS))
+
+    @staticmethod
+    def _build_messages(batch: list[dict]) -> list:
+        messages = []
+        for item in batch:
+            try:
+                messages.append(EmailService.build_message(item["template"], item["to_email"], item["payload"]))
+            except Exception as e:
+                # Recorded as this item's failure
+                messages.append(e)
+        return messages
+
+    @staticmethod
+    async def _send(msg):
+        if isinstance(msg, Exception):
+            raise msg
+        started = time.perf_counter()
+        try:
+            await EmailService.send_message(msg)
+        finally:
+            EMAIL_SEND_DURATION.observe(time.perf_counter() - started)
+
+    async def _claim_batch(self) -> list[dict]:
+        async with AsyncSessionLocal() as db:
+            now = datetime.utcnow()
+            rows = (await db.scalars(
+                select(EmailOutbox)
+                .where(
+                    # Rendered inline so the partial pending index can be used
+                    EmailOutbox.status == literal("pending", literal_execute=True),
+                    EmailOutbox.next_attempt_at <= now
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+
+            # Due time of the oldest email, i.e. how far delivery is behind
+            self.last_lag = (now - rows[0].next_attempt_at).total_seconds() if rows else 0.0
+
+            lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+            batch = []
+            for row in rows:
+                row.next_attempt_at = lease_until
+                batch.append({
+                    "id": row.id,
+                    "template": row.template,
+                    "to_email": row.to_email,
+                    "payload": row.payload
+                })
+            await db.commit()
+            return batch
+
+    async def _record_outcomes(self, outcomes: dict[uuid.UUID, object]):
+        async with AsyncSessionLocal() as db:
+            rows = (await db.scalars(
+                select(EmailOutbox).where(EmailOutbox.id.in_(list(outcomes)))
+            )).all()
+            for row in rows:
+                error = outcomes[row.id]
+                row.attempts += 1
+                if error is None:
+                    row.status = "sent"
+                    row.sent_at = datetime.utcnow()
+                    row.last_error = None
+                    row.payload = EmailService.redact_payload(row.payload)
+                    self.sent += 1
+                    EMAILS.labels("sent").inc()
+                else:
+                    self._mark_failed(row, error)
+            await db.commit()
+
+    def _mark_failed(self, row: EmailOutbox, error: BaseException):
+        row.last_error = str(error)[:1000]
+        if row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            row.status = "dead"
+            row.payload = EmailService.redact_payload(row.payload)
+            self.dead += 1
+            EMAILS.labels("dead").inc()
+            logger.error("Email %s to %s dead-lettered after %s attempts: %s",
+                         row.id, row.to_email, row.attempts, error)
+        else:
+            row.next_attempt_at = datetime.utcnow() + self.backoff(row.attempts)
+            self.retried += 1
+            EMAILS.labels("retried").inc()
+            logger.warning("Email %s to %s failed (attempt %s): %s",
+                           row.id, row.to_email, row.attempts, error)
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead
+        }
+
+
+email_outbox_worker = EmailOutboxWorker()
@@ -1,163 +1,129 @@
 # app/services/email_service.py
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
-from jinja2 import Template
+from app.models.email_outbox import EmailOutbox
+from app.services.smtp_pool import smtp_pool
+from app.services.email_templates import email_templates
 
 class EmailService:
+    # Payload fields that carry a working token; removed once the email is
+    # out (or given up on) so sent rows don't hold usable links
+    LINK_FIELDS = ("verification_link", "invite_link")
+
+    # -----------------------------
+    # Outbox (request path)
+    # -----------------------------
     @staticmethod
-    def send_verification_email(to_email: str, verification_link: str, user_name: str):
-        # Email content
-        subject = "Verify Your Email - Zuno Task Management"
-        
-        # HTML template for email
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #333;">Welcome to Zuno Task Management!</h2>
-                <p>Hello {{ user_name }},</p>
-                <p>Thank you for signing up! Please verify your email address by clicking the button below:</p>
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{{ verification_link }}" style="background-color: #4CAF50; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; font-weight: bold;">
-                        Verify Email Address
-                    </a>
-                </div>
-                <p>Or copy and paste this link in your browser:</p>
-                <p style="word-break: break-all; color: #666;">{{ verification_link }}</p>
-                <p>This link will expire in 24 hours.</p>
-                <p>If you didn't create an account, you can safely ignore this email.</p>
-                <br>
-                <p>Best regards,<br>The Zuno Team</p>
-            </div>
-        </body>
-        </html>
+    def queue_verification_email(db: AsyncSession, to_email: str, verification_link: str, user_name: str):
         """
-        
-        # Render template
-        template = Template(html_template)
-        html_content = template.render(
+        Add a verification email to the outbox.
+        Not committed here - it is saved in the caller's transaction.
+        """
+        db.add(EmailOutbox(
+            template="verification",
+            to_email=to_email,
+            payload={
+                "verification_link": verification_link,
+                "user_name": user_name
+            }
+        ))
+
+    @staticmethod
+    def queue_invitation_email(
+        db: AsyncSession,
+        to_email: str,
+        workspace_name: str,
+        inviter_name: str,
+        invite_link: str,
+        role: str,
+        token: str
+    ):
+        """
+        Add a workspace invitation email to the outbox.
+        Not committed here - it is saved in the caller's transaction.
+        Only the link carries the token; the email shows its first 8 chars.
+        """
+        db.add(EmailOutbox(
+            template="invitation",
+            to_email=to_email,
+            payload={
+                "workspace_name": workspace_name,
+                "inviter_name": inviter_name,
+                "invite_link": invite_link,
+                "role": role,
+                "token_short": token[:8]
+            }
+        ))
+
+    # -----------------------------
+    # Delivery (outbox worker)
+    # -----------------------------
+    @staticmethod
+    def build_message(template: str, to_email: str, payload: dict) -> MIMEMultipart:
+        builders = {
+            "verification": EmailService.build_verification_message,
+            "invitation": EmailService.build_invitation_message
+        }
+        if template not in builders:
+            raise ValueError(f"Unknown email template: {template}")
+        return builders[template](to_email=to_email, **payload)
+
+    @staticmethod
+    def redact_payload(payload: dict) -> dict:
+        """
+        The payload without its links, to keep after delivery
+        """
+        return {key: value for key, value in payload.items() if key not in EmailService.LINK_FIELDS}
+
+    @staticmethod
+    async def send_message(msg: MIMEMultipart):
+        """
+        Send over the shared pool of authenticated SMTP connections
+        """
+        await smtp_pool.send(msg)
+
+    @staticmethod
+    def build_verification_message(to_email: str, verification_link: str, user_name: str) -> MIMEMultipart:
+        subject = "Verify Your Email - Zuno Task Management"
+        html_content, text_content = email_templates.render(
+            "verification.html",
             user_name=user_name,
             verification_link=verification_link
         )
-        
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = settings.FROM_EMAIL
-        msg['To'] = to_email
-        
-        # Attach HTML
-        msg.attach(MIMEText(html_content, 'html'))
-        
-        # Send email
-        try:
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-                server.starttls()
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-            return True
-        except Exception as e:
-            print(f"Error sending email: {e}")
-            return False
+        return EmailService._assemble(to_email, subject, html_content, text_content)
     
     @staticmethod
-    def send_invitation_email(
+    def build_invitation_message(
         to_email: str, 
         workspace_name: str, 
         inviter_name: str,
         invite_link: str,
         role: str,
-        token: str
-    ):
-        """Send workspace invitation email"""
+        token_short: str
+    ) -> MIMEMultipart:
+        """Build workspace invitation email"""
         subject = f"Invitation to join {workspace_name} on Zuno"
-        
-        # HTML template for invitation email
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <div style="text-align: center; margin-bottom: 30px;">
-                    <h1 style="color: #4CAF50; margin: 0;">Zuno</h1>
-                    <p style="color: #666; margin: 5px 0;">Task Management Platform</p>
-                </div>
-                
-                <h2 style="color: #333;">Workspace Invitation</h2>
-                <p>Hello,</p>
-                <p><strong>{{ inviter_name }}</strong> has invited you to join the workspace 
-                <strong>"{{ workspace_name }}"</strong> on Zuno Task Management.</p>
-                
-                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 25px 0; border-left: 4px solid #4CAF50;">
-                    <p><strong>Workspace:</strong> {{ workspace_name }}</p>
-                    <p><strong>Role:</strong> <span style="background-color: #e8f5e9; padding: 4px 8px; border-radius: 4px;">{{ role }}</span></p>
-                    <p><strong>Invited by:</strong> {{ inviter_name }}</p>
-                    <p><strong>Invitation ID:</strong> <code style="background-color: #f1f1f1; padding: 2px 6px; border-radius: 3px; font-size: 12px;">{{ token_short }}</code></p>
-                </div>
-                
-                <div style="text-align: center; margin: 35px 0;">
-                    <a href="{{ invite_link }}" style="background-color: #4CAF50; color: white; padding: 14px 28px; text-decoration: none; border-radius: 6px; font-weight: bold; font-size: 16px; display: inline-block;">
-                        Accept Invitation
-                    </a>
-                </div>
-                
-                <p style="text-align: center; color: #666; font-size: 14px;">
-                    Or copy and paste this link in your browser:
-                </p>
-                <p style="word-break: break-all; color: #666; background-color: #f9f9f9; padding: 12px; border-radius: 4px; font-size: 13px; text-align: center;">
-                    {{ invite_link }}
-                </p>
-                
-                <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee;">
-                    <p style="color: #777; font-size: 14px;">
-                        <strong>Important:</strong><br>
-                        • This invitation will expire in 7 days<br>
-                        • If you don't have a Zuno account, you'll be prompted to create one<br>
-                        • You'll get your own personal workspace along with access to this workspace
-                    </p>
-                </div>
-                
-                <br>
-                <p>Best regards,<br>The Zuno Team</p>
-                
-                <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee; text-align: center; color: #999; font-size: 12px;">
-                    <p>© 2024 Zuno Task Management. All rights reserved.</p>
-                    <p>If you received this email by mistake, please ignore it.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Render template
-        template = Template(html_template)
-        html_content = template.render(
+        html_content, text_content = email_templates.render(
+            "invitation.html",
             workspace_name=workspace_name,
             inviter_name=inviter_name,
             invite_link=invite_link,
             role=role.capitalize(),
-            token_short=token[:8] + "..."  # Show only first 8 chars of token
+            token_short=token_short + "..."
         )
-        
-        # Create message
+        return EmailService._assemble(to_email, subject, html_content, text_content)
+
+    @staticmethod
+    def _assemble(to_email: str, subject: str, html_content: str, text_content: str) -> MIMEMultipart:
         msg = MIMEMultipart('alternative')
         msg['Subject'] = subject
         msg['From'] = settings.FROM_EMAIL
         msg['To'] = to_email
         
-        # Attach HTML
+        # Plain text first, clients show the last part they support
+        msg.attach(MIMEText(text_content, 'plain'))
         msg.attach(MIMEText(html_content, 'html'))
         
-        # Send email
-        try:
-            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-                server.starttls()
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-            return True
-        except Exception as e:
-            print(f"Error sending invitation email: {e}")
-            return False
\ No newline at end of file
+        return msg
@@ -0,0 +1,118 @@
+# app/services/email_templates.py
+import os
+import re
+from html.parser import HTMLParser
+from typing import Optional
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+from app.config import settings
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "email")
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Turns rendered email HTML into a readable text/plain alternative.
+    Block elements become line breaks and links keep their target URL.
+    """
+
+    BLOCK_TAGS = {"p", "div", "br", "h1", "h2", "h3", "h4", "h5", "h6", "li", "tr"}
+    SKIP_TAGS = {"style", "script", "head", "title"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts: list[str] = []
+        self._href: Optional[str] = None
+        self._link_text: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag == "a":
+            self._href = dict(attrs).get("href")
+            self._link_text = []
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag == "a" and self._href is not None:
+            text = " ".join("".join(self._link_text).split())
+            if text and text != self._href:
+                self.parts.append(f"{text}: {self._href}")
+            else:
+                self.parts.append(self._href)
+            self._href = None
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._href is not None:
+            self._link_text.append(data)
+        else:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self.parts).splitlines())
+        text = "\n".join(lines).strip()
+        return re.sub(r"\n{3,}", "\n\n", text) + "\n"
+
+
+def html_to_text(html: str) -> str:
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+class EmailTemplateRegistry:
+    """
+    Email templates compiled once and reused for every message.
+
+    Templates are loaded from app/templates/email. When a bytecode cache
+    directory is configured, compiled templates are also kept on disk so
+    new workers skip the compile step entirely.
+    """
+
+    def __init__(self, template_dir: str, bytecode_cache_dir: Optional[str] = None):
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(["html"]),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False
+        )
+        self._templates: dict[str, Template] = {}
+
+    def load_all(self):
+        """
+        Compile every template up front (called at startup)
+        """
+        for name in self.env.list_templates(extensions=["html"]):
+            self._templates[name] = self.env.get_template(name)
+
+    def get(self, name: str) -> Template:
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.env.get_template(name)
+        return template
+
+    def render(self, name: str, **context) -> tuple[str, str]:
+        """
+        Render a template, returning (html, plain_text)
+        """
+        html = self.get(name).render(**context)
+        return html, html_to_text(html)
+
+
+email_templates = EmailTemplateRegistry(
+    template_dir=TEMPLATE_DIR,
+    bytecode_cache_dir=settings.EMAIL_TEMPLATE_CACHE_DIR
+)
@@ -0,0 +1,126 @@
+# app/services/entitlement_service.py
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.plan_config import PLANS
+from app.models.subscription import Subscription
+from app.utils.cache import TTLCache
+from app.utils.sql import upsert_insert
+
+
+@dataclass(frozen=True, slots=True)
+class Entitlements:
+    """
+    An owner's subscription resolved against PLANS: the plan, its limits
+    and the owner's current workspace usage. Owners without a subscription
+    get the FREE plan's limits and no subscription_id.
+    """
+    owner_id: uuid.UUID
+    subscription_id: Optional[uuid.UUID]
+    plan: str
+    status: str
+    seat_limit: int
+    workspace_limit: int
+    workspace_count: int
+    current_period_end: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+
+# Per-process cache of resolved entitlements keyed by owner id. Entries live
+# for ENTITLEMENTS_CACHE_TTL_SECONDS at most, so a change made by another
+# worker is picked up within that window; changes made in this process call
+# EntitlementService.invalidate after they commit. Requests within the
+# user's read-your-writes window bypass it (see get).
+entitlements_cache = TTLCache(
+    maxsize=settings.ENTITLEMENTS_CACHE_MAX_SIZE,
+    ttl=settings.ENTITLEMENTS_CACHE_TTL_SECONDS
+)
+
+
+class EntitlementService:
+    """
+    Plan limits for the limit checks and plan details endpoint.
+
+    Cached limits only pick which limit applies: the checks themselves are
+    conditional UPDATEs on the usage counters (UsageService), so a stale
+    entry can't let usage overshoot the limit it was read with.
+    """
+
+    @staticmethod
+    def resolve(owner_id: uuid.UUID, subscription: Optional[Subscription]) -> Entitlements:
+        if subscription is None:
+            plan_config = PLANS["free"]
+            return Entitlements(
+                owner_id=owner_id,
+                subscription_id=None,
+                plan="free",
+                status="active",
+                seat_limit=plan_config["seat_limit"],
+                workspace_limit=plan_config["workspace_limit"],
+                workspace_count=0
+            )
+
+        plan_config = PLANS.get(subscription.plan, PLANS["free"])
+        return Entitlements(
+            owner_id=owner_id,
+            subscription_id=subscription.id,
+            plan=subscription.plan,
+            status=subscription.status,
+            seat_limit=plan_config["seat_limit"],
+            workspace_limit=plan_config["workspace_limit"],
+            workspace_count=subscription.workspace_count,
+            current_period_end=subscription.current_period_end,
+            created_at=subscription.created_at
+        )
+
+    @staticmethod
+    async def get(db: AsyncSession, owner_id: uuid.UUID) -> Entitlements:
+        """
+        The owner's entitlements, from the cache or one subscription lookup.
+        Sessions of requests in the read-your-writes window (get_read_db)
+        always look up and refresh the cache: the write may have happened on
+        another worker, which only invalidated its own cache.
+        """
+        fresh = db.info.get("read_your_writes", False)
+        entitlements = None if fresh else entitlements_cache.get(owner_id)
+        if entitlements is None:
+            subscription = await db.scalar(select(Subscription).where(
+                Subscription.owner_id == owner_id
+            ))
+            entitlements = EntitlementService.resolve(owner_id, subscription)
+            entitlements_cache.set(owner_id, entitlements)
+        return entitlements
+
+    @staticmethod
+    async def get_or_create(db: AsyncSession, owner_id: uuid.UUID) -> Entitlements:
+        """
+        The owner's entitlements, creating a FREE subscription if they have
+        none. Creation is one statement: an upsert on the unique owner_id
+        with a no-op update, so a row created concurrently comes back from
+        RETURNING too.
+        """
+        entitlements = await EntitlementService.get(db, owner_id)
+        if entitlements.subscription_id is not None:
+            return entitlements
+
+        stmt = upsert_insert(db, Subscription).values(owner_id=owner_id, plan="free", status="active")
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Subscription.owner_id],
+            set_={"owner_id": stmt.excluded.owner_id}
+        ).returning(Subscription)
+        subscription = await db.scalar(stmt, execution_options={"populate_existing": True})
+        # Not cached: the caller hasn't committed the new subscription yet
+        entitlements_cache.pop(owner_id)
+        return EntitlementService.resolve(owner_id, subscription)
+
+    @staticmethod
+    def invalidate(owner_id: uuid.UUID):
+        """
+        Drop the owner's cached entitlements; call after committing a change
+        to their subscription or workspace usage
+        """
+        entitlements_cache.pop(owner_id)
@@ -1,30 +1,41 @@
 # app/services/invite_service.py
-import uuid
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta
 from app.models.invite import Invite
 from app.models.user import User
 from app.models.workspace import Workspace
 from app.models.workspace_member import WorkspaceMember
-from app.models.subscription import Subscription
-from app.utils.security import get_password_hash, create_access_token
+from app.utils.security import create_access_token
 from app.services.workspace_service import WorkspaceService
+from app.services.password_hasher import password_hasher
+from app.services.token_service import TokenService
+from app.services.usage_service import UsageService
+from app.services.version_service import VersionService
+from app.services.entitlement_service import EntitlementService
 from app.config import settings
-from app.core.plan_config import PLANS
 from typing import Optional
 
 class InviteService:
     
     @staticmethod
-    def get_invite_details(db: Session, token: str):
+    async def get_invite_details(db: AsyncSession, token: str):
         """
         Get invite details for the acceptance page
         """
-        invite = db.query(Invite).filter(
-            Invite.token == token,
-            Invite.status == "pending"
-        ).first()
+        # Workspace and inviter come along with the invite
+        invite = await db.scalar(
+            select(Invite)
+            .outerjoin(Invite.workspace)
+            .outerjoin(Invite.inviter)
+            .options(contains_eager(Invite.workspace), contains_eager(Invite.inviter))
+            .where(
+                Invite.id == TokenService.subject_of(TokenService.INVITE, token),
+                Invite.status == "pending"
+            )
+        )
         
         if not invite:
             raise HTTPException(
@@ -34,33 +45,51 @@ class InviteService:
         
         # Check if invite is expired
         if invite.expires_at and invite.expires_at < datetime.utcnow():
-            invite.status = "expired"
-            db.commit()
+            await UsageService.close_invite(db, invite, "expired")
+            await db.commit()
             raise HTTPException(
                 status_code=status.HTTP_410_GONE,
                 detail="This invitation has expired"
             )
         
-        # Get workspace details
-        workspace = db.query(Workspace).filter(
-            Workspace.id == invite.workspace_id
-        ).first()
-        
-        # Get inviter details
-        inviter_name = None
-        if invite.invited_by:
-            inviter = db.query(User).filter(User.id == invite.invited_by).first()
-            inviter_name = inviter.full_name if inviter else None
-        
         return {
             "invite": invite,
-            "workspace_name": workspace.name if workspace else invite.invited_to_workspace_name,
-            "inviter_name": inviter_name
+            "workspace_name": invite.workspace.name if invite.workspace else invite.invited_to_workspace_name,
+            "inviter_name": invite.inviter.full_name if invite.inviter else None
         }
     
     @staticmethod
-    def accept_invite(
-        db: Session,
+    async def get_pending_invites(db: AsyncSession, email: str) -> list[dict]:
+        """
+        Unexpired pending invites sent to an email, with workspace and
+        inviter names (shaped like InviteDetailsResponse)
+        """
+        pending_invites = (await db.execute(
+            select(
+                Invite.id,
+                Invite.workspace_id,
+                func.coalesce(Workspace.name, Invite.invited_to_workspace_name).label("workspace_name"),
+                User.full_name.label("invited_by"),
+                Invite.email,
+                Invite.role,
+                Invite.status,
+                Invite.expires_at,
+                Invite.created_at
+            )
+            .join(Workspace, Invite.workspace_id == Workspace.id)
+            .outerjoin(User, Invite.invited_by == User.id)
+            .where(
+                Invite.email == email,
+                Invite.status == "pending",
+                Invite.expires_at > datetime.utcnow()
+            )
+        )).all()
+        
+        return [invite._asdict() for invite in pending_invites]
+    
+    @staticmethod
+    async def accept_invite(
+        db: AsyncSession,
         token: str,
         full_name: Optional[str] = None,
         password: Optional[str] = None
@@ -74,10 +103,10 @@ class InviteService:
         
         try:
             # 1. Get and validate invite
-            invite = db.query(Invite).filter(
-                Invite.token == token,
+            invite = await db.scalar(select(Invite).where(
+                Invite.id == TokenService.subject_of(TokenService.INVITE, token),
                 Invite.status == "pending"
-            ).first()
+            ))
             
             if not invite:
                 raise HTTPException(
@@ -86,28 +115,28 @@ class InviteService:
                 )
             
             if invite.expires_at and invite.expires_at < datetime.utcnow():
-                invite.status = "expired"
-                db.commit()
+                await UsageService.close_invite(db, invite, "expired")
+                await db.commit()
                 raise HTTPException(
                     status_code=status.HTTP_410_GONE,
                     detail="This invitation has expired"
                 )
             
             # 2. Check if user exists
-            existing_user = db.query(User).filter(
+            existing_user = await db.scalar(select(User).where(
                 User.email == invite.email,
                 User.is_verified == True
-            ).first()
+            ))
             
             is_new_user = False
             user = existing_user
             personal_workspace_id = None
             
-            # 3. CHECK SEAT LIMIT FIRST - BEFORE creating anything
-            workspace = db.query(Workspace).filter(
+            # 3. Load workspace and its plan's seat limit
+            workspace = await db.scalar(select(Workspace).where(
                 Workspace.id == invite.workspace_id,
                 Workspace.is_active == True
-            ).first()
+            ))
             
             if not workspace:
                 raise HTTPException(
@@ -115,74 +144,69 @@ class InviteService:
                     detail="Workspace not found or inactive"
                 )
             
-            # Check subscription seat limits BEFORE creating user
-            subscription = db.query(Subscription).filter(
-                Subscription.owner_id == workspace.owner_id
-            ).first()
+            entitlements = await EntitlementService.get(db, workspace.owner_id)
+            current_plan = entitlements.plan
+            seat_limit = entitlements.seat_limit
             
-            if subscription:
-                current_plan = subscription.plan
-                plan_config = PLANS.get(current_plan, PLANS["free"])
-                seat_limit = plan_config["seat_limit"]
-                
-                # Count current active members
-                current_members_count = db.query(WorkspaceMember).filter(
+            existing_membership = None
+            if existing_user:
+                existing_membership = await db.scalar(select(WorkspaceMember).where(
                     WorkspaceMember.workspace_id == workspace.id,
-                    WorkspaceMember.is_active == True
-                ).count()
-                
-                # Check if adding this user would exceed limit
-                # First check if user is already counted
-                user_already_member = False
-                if existing_user:
-                    existing_membership = db.query(WorkspaceMember).filter(
-                        WorkspaceMember.workspace_id == workspace.id,
-                        WorkspaceMember.user_id == existing_user.id,
-                        WorkspaceMember.is_active == True
-                    ).first()
-                    user_already_member = existing_membership is not None
-                
-                if not user_already_member and current_members_count >= seat_limit:
+                    WorkspaceMember.user_id == existing_user.id
+                ))
+                if existing_membership and existing_membership.is_active:
                     raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail=f"Workspace has reached its member limit of {seat_limit} for {current_plan} plan"
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="You are already a member of this workspace"
                     )
             
-            # 4. Now handle user creation/retrieval
+            # Hash before taking any row locks below
+            hashed_password = None
             if not existing_user:
                 if not full_name or not password:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="New users must provide full name and password"
                     )
-                
+                hashed_password = await password_hasher.hash(password)
+            
+            # 4. Claim the token and invite and turn the invite's held seat into
+            # a member seat. All conditional updates, so parallel accepts can
+            # neither use the same invite twice nor push members past the limit.
+            if (
+                not await TokenService.consume(db, TokenService.INVITE, token)
+                or not await UsageService.close_invite(db, invite, "accepted")
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Invitation not found or already used"
+                )
+            
+            if not await UsageService.claim_invite_seat(db, workspace.id, seat_limit):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Workspace has reached its member limit of {seat_limit} for {current_plan} plan"
+                )
+            
+            # 5. Now handle user creation
+            if not existing_user:
                 # Create new user
                 user = User(
                     full_name=full_name,
                     email=invite.email,
-                    hashed_password=get_password_hash(password),
+                    hashed_password=hashed_password,
                     is_verified=True,
                     is_active=True
                 )
                 
                 db.add(user)
-                db.flush()  # Flush to get user ID but don't commit yet
+                await db.flush()  # The workspace insert below references the user row
                 
                 is_new_user = True
                 
-                # Create FREE subscription for new user
-                subscription = Subscription(
-                    owner_id=user.id,
-                    plan="free",
-                    status="active"
-                )
-                db.add(subscription)
-                db.flush()
-                
-                # Create personal workspace for new user
+                # Create FREE subscription and personal workspace (not committed)
                 try:
-                    # Use a separate method that doesn't commit
-                    personal_workspace = InviteService._create_personal_workspace_without_commit(
+                    personal_workspace = await WorkspaceService.create_default_workspace_for_user(
                         db=db,
                         user_id=user.id,
                         user_full_name=user.full_name
@@ -190,30 +214,17 @@ class InviteService:
                     personal_workspace_id = personal_workspace.id
                 except Exception as e:
                     # If workspace creation fails, rollback user creation
-                    db.rollback()
+                    await db.rollback()
                     raise HTTPException(
                         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                         detail=f"Failed to create personal workspace: {str(e)}"
                     )
-            else:
-                personal_workspace_id = None
-            
-            # 5. Add user to workspace (check again to be safe)
-            existing_membership = db.query(WorkspaceMember).filter(
-                WorkspaceMember.workspace_id == workspace.id,
-                WorkspaceMember.user_id == user.id
-            ).first()
             
+            # 6. Add user to workspace
             if existing_membership:
-                if existing_membership.is_active:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="You are already a member of this workspace"
-                    )
-                else:
-                    # Reactivate membership
-                    existing_membership.is_active = True
-                    existing_membership.role = invite.role
+                # Reactivate membership
+                existing_membership.is_active = True
+                existing_membership.role = invite.role
             else:
                 # Create new membership
                 workspace_member = WorkspaceMember(
@@ -224,12 +235,12 @@ class InviteService:
                 )
                 db.add(workspace_member)
             
-            # 6. Update invite status
-            invite.status = "accepted"
-            invite.accepted_at = datetime.utcnow()
+            if existing_user:
+                # New membership and one less pending invite on their dashboard
+                await VersionService.bump_user(db, existing_user.id)
             
             # 7. FINAL COMMIT - Only if everything succeeded
-            db.commit()
+            await db.commit()
             
             # 8. Generate access token
             access_token = create_access_token(
@@ -247,12 +258,12 @@ class InviteService:
             
         except HTTPException as he:
             # Rollback on HTTP exceptions (like seat limit reached)
-            db.rollback()
+            await db.rollback()
             raise he
             
         except SQLAlchemyError as e:
             # Rollback on database errors
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Database error: {str(e)}"
@@ -260,70 +271,22 @@ class InviteService:
             
         except Exception as e:
             # Rollback on any other errors
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to accept invitation: {str(e)}"
             )
 
     @staticmethod
-    def _create_personal_workspace_without_commit(db: Session, user_id: uuid.UUID, user_full_name: str):
-        """
-        Create personal workspace without committing
-        Used within transaction
-        """
-        from app.utils.slug import create_slug
-        
-        # Extract first name
-        first_name = user_full_name.split()[0] if user_full_name.split() else "User"
-        
-        # Create workspace name
-        workspace_name = f"{first_name}'s Workspace"
-        
-        # Create unique slug
-        base_slug = create_slug(workspace_name)
-        slug = base_slug
-        counter = 1
-        
-        # Ensure slug is unique
-        while db.query(Workspace).filter(Workspace.slug == slug).first():
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-        
-        # Create workspace
-        workspace = Workspace(
-            name=workspace_name,
-            slug=slug,
-            owner_id=user_id,
-            is_active=True
-        )
-        
-        db.add(workspace)
-        db.flush()  # Get ID but don't commit
-        
-        # Create workspace member entry with owner role
-        workspace_member = WorkspaceMember(
-            workspace_id=workspace.id,
-            user_id=user_id,
-            role="owner",
-            is_active=True
-        )
-        
-        db.add(workspace_member)
-        db.flush()
-        
-        return workspace
-
-    @staticmethod
-    def decline_invite(db: Session, token: str, email: str):
+    async def decline_invite(db: AsyncSession, token: str, email: str):
         """
         Decline a workspace invitation
         """
-        invite = db.query(Invite).filter(
-            Invite.token == token,
+        invite = await db.scalar(select(Invite).where(
+            Invite.id == TokenService.subject_of(TokenService.INVITE, token),
             Invite.email == email,
             Invite.status == "pending"
-        ).first()
+        ))
         
         if not invite:
             raise HTTPException(
@@ -331,7 +294,9 @@ class InviteService:
                 detail="Invitation not found or already processed"
             )
         
-        invite.status = "declined"
-        db.commit()
+        await UsageService.close_invite(db, invite, "declined")
+        await TokenService.revoke(db, TokenService.INVITE, invite.id)
+        await VersionService.bump_invitees(db, [invite.email])
+        await db.commit()
         
         return {"message": "Invitation declined successfully"}
\ No newline at end of file
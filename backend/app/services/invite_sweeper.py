@@ -0,0 +1,85 @@
+# app/services/invite_sweeper.py
+import logging
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import literal, select, update
+from app.config import settings
+from app.core.background import PeriodicJob
+from app.database import AsyncSessionLocal
+from app.models.invite import Invite
+from app.services.usage_service import UsageService
+from app.services.version_service import VersionService
+
+logger = logging.getLogger(__name__)
+
+
+class InviteSweeper(PeriodicJob):
+    """
+    Expires overdue pending invites in batches and releases their seats.
+
+    Each run expires at most INVITE_SWEEP_BATCH_SIZE invites in one
+    transaction: the batch is picked oldest-expiry first with FOR UPDATE
+    SKIP LOCKED (so several app instances can sweep side by side), flipped
+    to 'expired' with a single UPDATE and the workspaces' pending invite
+    counters are decremented to match. A full batch makes the next run start
+    right away, so a backlog drains without waiting for the interval.
+
+    The lazy expiry checks on the invite read/accept paths stay as a
+    fallback for invites that expire between sweeps.
+    """
+
+    name = "invite-sweeper"
+
+    def __init__(self):
+        super().__init__(
+            interval=settings.INVITE_SWEEP_INTERVAL_SECONDS,
+            batch_size=settings.INVITE_SWEEP_BATCH_SIZE
+        )
+        self.workspaces_released = 0
+
+    async def run_once(self) -> int:
+        async with AsyncSessionLocal() as db:
+            now = datetime.utcnow()
+            batch = (await db.execute(
+                select(Invite.id, Invite.expires_at)
+                .where(
+                    # Rendered inline so the partial pending index can be used
+                    Invite.status == literal("pending", literal_execute=True),
+                    Invite.expires_at <= now
+                )
+                .order_by(Invite.expires_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            # Rows come oldest expiry first
+            self.last_lag = (now - batch[0].expires_at).total_seconds() if batch else 0.0
+            if not batch:
+                return 0
+
+            expired = (await db.execute(
+                update(Invite)
+                .where(Invite.id.in_([row.id for row in batch]), Invite.status == "pending")
+                .values(status="expired")
+                .returning(Invite.workspace_id, Invite.email)
+                .execution_options(synchronize_session=False)
+            )).all()
+
+            # Sorted so concurrent sweeps lock workspace rows in the same order
+            released = Counter(row.workspace_id for row in expired if row.workspace_id is not None)
+            for workspace_id in sorted(released):
+                await UsageService.release_invite_seats(db, workspace_id, released[workspace_id])
+            await VersionService.bump_invitees(db, (row.email for row in expired))
+            await db.commit()
+
+        self.workspaces_released += len(released)
+        logger.info("Expired %s invites across %s workspaces", len(expired), len(released))
+        return len(expired)
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "workspaces_released": self.workspaces_released
+        }
+
+
+invite_sweeper = InviteSweeper()
@@ -0,0 +1,118 @@
+# app/services/password_hasher.py
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from fastapi import HTTPException, status
+from app.config import settings
+from app.core.prometheus import PASSWORD_HASH_DURATION, PASSWORD_HASH_REJECTED
+from app.utils.security import get_password_hash, verify_password
+
+
+class PasswordHasher:
+    """
+    Awaitable bcrypt hashing/verification backed by a process pool.
+
+    bcrypt is CPU bound and holds the GIL, so running it inline in an
+    `async def` route stalls every other request on the worker. Jobs are
+    pushed to a fixed size process pool instead. At most
+    `max_workers + max_queue` jobs may be outstanding; anything beyond
+    that is rejected with 503 so a login burst can't queue up unbounded.
+    If a pool process dies (OOM kill, segfault) the pool is broken for
+    good, so it is replaced and the job retried once on the new pool.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._outstanding = 0
+
+        # Counters
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.pool_restarts = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily so importing the app doesn't fork processes
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        # Other jobs may have hit the same broken pool; replace it only once
+        if self._executor is executor:
+            self._executor = None
+            self.pool_restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, operation: str, fn, *args):
+        if self._outstanding >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            PASSWORD_HASH_REJECTED.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"}
+            )
+
+        self._outstanding += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            try:
+                result = await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                result = await loop.run_in_executor(self._get_executor(), fn, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._outstanding -= 1
+
+        latency = time.perf_counter() - started
+        PASSWORD_HASH_DURATION.labels(operation).observe(latency)
+        self.completed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """
+        Snapshot of queue depth and latency counters (latency includes queue wait)
+        """
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self._outstanding, self.max_workers),
+            "queue_depth": max(self._outstanding - self.max_workers, 0),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "pool_restarts": self.pool_restarts,
+            "avg_latency_ms": round(self.total_latency / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 2)
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE
+)
@@ -0,0 +1,55 @@
+# app/services/principal_cache.py
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from app.config import settings
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Slim, immutable snapshot of the authenticated user.
+    Carries only what the routes read - no password hash or profile blob.
+    """
+    id: uuid.UUID
+    email: str
+    full_name: str
+    is_verified: bool
+    is_active: bool
+    created_at: Optional[datetime]
+
+
+class PrincipalCache:
+    """
+    Per-process cache of authenticated principals keyed by user id.
+
+    Entries live for PRINCIPAL_CACHE_TTL_SECONDS at most, so a change made
+    by another worker is picked up within that window. Changes made in this
+    process must call `invalidate` so they are visible immediately.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, user_id: uuid.UUID) -> Optional[Principal]:
+        return self._cache.get(user_id)
+
+    def set(self, principal: Principal, ttl: Optional[float] = None):
+        self._cache.set(principal.id, principal, ttl=ttl)
+
+    def invalidate(self, user_id: uuid.UUID):
+        self._cache.pop(user_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,143 @@
+# app/services/smtp_pool.py
+import asyncio
+import time
+from email.message import Message
+from typing import Optional
+import aiosmtplib
+from app.config import settings
+
+
+class _PooledConnection:
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """
+    Pool of persistent, authenticated aiosmtplib connections.
+
+    A connection pays for connect + STARTTLS + AUTH once and is then reused
+    for up to `max_messages_per_connection` messages. Connections idle for
+    longer than `keepalive_seconds` are checked with NOOP before reuse.
+    At most `size` messages are in flight at once.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        start_tls: bool,
+        size: int,
+        max_messages_per_connection: int,
+        keepalive_seconds: float,
+        timeout: float
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username or None
+        self.password = password or None
+        self.start_tls = start_tls
+        self.size = size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.keepalive_seconds = keepalive_seconds
+        self.timeout = timeout
+
+        self._idle: list[_PooledConnection] = []
+        self._semaphore = asyncio.Semaphore(size)
+        self._in_use = 0
+
+        # Counters
+        self.connections_opened = 0
+        self.messages_sent = 0
+        self.send_failures = 0
+
+    async def _connect(self) -> _PooledConnection:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout
+        )
+        await client.connect()  # Also runs STARTTLS and AUTH
+        self.connections_opened += 1
+        return _PooledConnection(client)
+
+    @staticmethod
+    async def _close(conn: _PooledConnection):
+        try:
+            await conn.client.quit()
+        except Exception:
+            conn.client.close()
+
+    async def _acquire(self) -> _PooledConnection:
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.client.is_connected:
+                continue
+            if time.monotonic() - conn.last_used > self.keepalive_seconds:
+                try:
+                    await conn.client.noop()
+                except Exception:
+                    conn.client.close()
+                    continue
+            return conn
+        return await self._connect()
+
+    async def _release(self, conn: _PooledConnection):
+        conn.last_used = time.monotonic()
+        if conn.messages_sent >= self.max_messages_per_connection:
+            await self._close(conn)
+        else:
+            self._idle.append(conn)
+
+    async def send(self, message: Message):
+        async with self._semaphore:
+            self._in_use += 1
+            try:
+                conn = await self._acquire()
+                try:
+                    await conn.client.send_message(message)
+                except Exception:
+                    # Don't trust the session after a failure
+                    self.send_failures += 1
+                    conn.client.close()
+                    raise
+                conn.messages_sent += 1
+                self.messages_sent += 1
+                await self._release(conn)
+            finally:
+                self._in_use -= 1
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await self._close(conn)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "connections_opened": self.connections_opened,
+            "messages_sent": self.messages_sent,
+            "send_failures": self.send_failures
+        }
+
+
+smtp_pool = SMTPConnectionPool(
+    hostname=settings.SMTP_HOST,
+    port=settings.SMTP_PORT,
+    username=settings.SMTP_USER,
+    password=settings.SMTP_PASSWORD,
+    start_tls=settings.SMTP_STARTTLS,
+    size=settings.SMTP_POOL_SIZE,
+    max_messages_per_connection=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+    keepalive_seconds=settings.SMTP_KEEPALIVE_SECONDS,
+    timeout=settings.SMTP_TIMEOUT_SECONDS
+)
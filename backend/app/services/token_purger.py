@@ -0,0 +1,28 @@
+# app/services/token_purger.py
+from app.config import settings
+from app.core.background import PeriodicJob
+from app.database import AsyncSessionLocal
+from app.services.token_service import TokenService
+
+
+class TokenPurger(PeriodicJob):
+    """
+    Deletes expired rows from auth_tokens in batches of TOKEN_PURGE_BATCH_SIZE
+    """
+
+    name = "token-purger"
+
+    def __init__(self):
+        super().__init__(
+            interval=settings.TOKEN_PURGE_INTERVAL_SECONDS,
+            batch_size=settings.TOKEN_PURGE_BATCH_SIZE
+        )
+
+    async def run_once(self) -> int:
+        async with AsyncSessionLocal() as db:
+            purged = await TokenService.purge_expired(db, self.batch_size)
+            await db.commit()
+            return purged
+
+
+token_purger = TokenPurger()
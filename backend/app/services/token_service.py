@@ -0,0 +1,109 @@
+# app/services/token_service.py
+import hashlib
+import secrets
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.auth_token import AuthToken
+
+
+class TokenService:
+    """
+    Store for the one-time tokens we email out.
+
+    The plaintext token only exists in the email (and in the outbox row
+    until it is sent, see EmailOutboxWorker); the table keeps its
+    SHA-256 under a unique index, so a lookup is a single index probe and a
+    leaked database doesn't hand out working links. A token is used up with
+    one conditional UPDATE (consume), so two requests can't both redeem it.
+    """
+
+    EMAIL_VERIFICATION = "email_verification"
+    INVITE = "invite"
+    PASSWORD_RESET = "password_reset"
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def issue(db: AsyncSession, purpose: str, subject_id: uuid.UUID, expires_at: datetime) -> str:
+        """
+        Create a token for the subject and return the plaintext to send.
+        Added to the session, written with the caller's commit.
+        """
+        token = secrets.token_urlsafe(32)
+        db.add(AuthToken(
+            token_hash=TokenService.hash_token(token),
+            purpose=purpose,
+            subject_id=subject_id,
+            expires_at=expires_at
+        ))
+        return token
+
+    @staticmethod
+    def subject_of(purpose: str, token: str):
+        """
+        Scalar subquery for the subject of an unconsumed token, to look up
+        the user/invite in the same query, e.g. Invite.id == subject_of(...).
+        Doesn't check expiry, so callers can tell "expired" from "unknown".
+        """
+        return select(AuthToken.subject_id).where(
+            AuthToken.token_hash == TokenService.hash_token(token),
+            AuthToken.purpose == purpose,
+            AuthToken.consumed_at.is_(None)
+        ).scalar_subquery()
+
+    @staticmethod
+    async def consume(db: AsyncSession, purpose: str, token: str) -> Optional[uuid.UUID]:
+        """
+        Use up a valid token. Returns its subject id, or None if the token
+        is unknown, expired or already used.
+        """
+        now = datetime.utcnow()
+        return await db.scalar(
+            update(AuthToken)
+            .where(
+                AuthToken.token_hash == TokenService.hash_token(token),
+                AuthToken.purpose == purpose,
+                AuthToken.consumed_at.is_(None),
+                AuthToken.expires_at > now
+            )
+            .values(consumed_at=now)
+            .returning(AuthToken.subject_id)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def revoke(db: AsyncSession, purpose: str, subject_id: uuid.UUID) -> int:
+        """
+        Invalidate the subject's outstanding tokens (e.g. before a resend)
+        """
+        result = await db.execute(
+            update(AuthToken)
+            .where(
+                AuthToken.purpose == purpose,
+                AuthToken.subject_id == subject_id,
+                AuthToken.consumed_at.is_(None)
+            )
+            .values(consumed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @staticmethod
+    async def purge_expired(db: AsyncSession, batch_size: int) -> int:
+        """
+        Delete up to batch_size expired tokens, used or not
+        """
+        batch = select(AuthToken.id).where(
+            AuthToken.expires_at <= datetime.utcnow()
+        ).limit(batch_size).scalar_subquery()
+        result = await db.execute(
+            delete(AuthToken)
+            .where(AuthToken.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
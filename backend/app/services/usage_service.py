@@ -0,0 +1,139 @@
+# app/services/usage_service.py
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.invite import Invite
+from app.models.subscription import Subscription
+from app.models.workspace import Workspace
+from app.services.version_service import VersionService
+
+
+class UsageService:
+    """
+    Seat and workspace usage kept as counters instead of COUNT(*) queries.
+
+    - Workspace.member_count: active members
+    - Workspace.pending_invite_count: invites with status 'pending'
+    - Subscription.workspace_count: workspaces owned by the subscriber
+
+    Every counter change also bumps Workspace.version (see VersionService).
+
+    Seats used = member_count + pending_invite_count. Every reservation is a
+    single conditional UPDATE (... WHERE usage < limit), so concurrent
+    requests can't overshoot a limit, and every change runs in the caller's
+    transaction alongside the membership/invite change it accounts for.
+    """
+
+    @staticmethod
+    async def _reserve(db: AsyncSession, stmt) -> bool:
+        result = await db.execute(stmt)
+        return result.rowcount == 1
+
+    @staticmethod
+    async def reserve_invite_seat(db: AsyncSession, workspace_id: uuid.UUID, seat_limit: int) -> bool:
+        """
+        Hold a seat for a new pending invite
+        """
+        return await UsageService._reserve(db, update(Workspace).where(
+            Workspace.id == workspace_id,
+            Workspace.member_count + Workspace.pending_invite_count < seat_limit
+        ).values(
+            pending_invite_count=Workspace.pending_invite_count + 1,
+            version=Workspace.version + 1
+        ))
+
+    @staticmethod
+    async def reserve_member_seat(db: AsyncSession, workspace_id: uuid.UUID, seat_limit: int) -> bool:
+        """
+        Take a seat for a member added without an invite (reactivation)
+        """
+        return await UsageService._reserve(db, update(Workspace).where(
+            Workspace.id == workspace_id,
+            Workspace.member_count + Workspace.pending_invite_count < seat_limit
+        ).values(
+            member_count=Workspace.member_count + 1,
+            version=Workspace.version + 1
+        ))
+
+    @staticmethod
+    async def claim_invite_seat(db: AsyncSession, workspace_id: uuid.UUID, seat_limit: int) -> bool:
+        """
+        Turn an accepted invite's held seat into a member seat. Still checks
+        the member limit, which guards invites sent before a plan downgrade.
+        """
+        return await UsageService._reserve(db, update(Workspace).where(
+            Workspace.id == workspace_id,
+            Workspace.member_count < seat_limit
+        ).values(
+            member_count=Workspace.member_count + 1,
+            pending_invite_count=Workspace.pending_invite_count - 1,
+            version=Workspace.version + 1
+        ))
+
+    @staticmethod
+    async def close_invite(db: AsyncSession, invite: Invite, new_status: str) -> bool:
+        """
+        Move a pending invite to accepted/declined/expired and release its
+        held seat. Returns False if another request already closed it.
+        """
+        values = {"status": new_status}
+        if new_status == "accepted":
+            values["accepted_at"] = datetime.utcnow()
+
+        closed = await UsageService._reserve(db, update(Invite).where(
+            Invite.id == invite.id,
+            Invite.status == "pending"
+        ).values(**values))
+        if not closed:
+            return False
+
+        # Keep the loaded object in sync without marking it dirty
+        for key, value in values.items():
+            set_committed_value(invite, key, value)
+        if new_status != "accepted":
+            # An accepted invite's seat becomes a member seat (claim_invite_seat) instead
+            await UsageService.release_invite_seats(db, invite.workspace_id, 1)
+        return True
+
+    @staticmethod
+    async def expire_overdue_invites(db: AsyncSession, workspace_id: uuid.UUID) -> int:
+        """
+        Expire the workspace's pending invites past their expiry date and
+        release their seats. Returns how many were expired.
+        """
+        emails = (await db.scalars(update(Invite).where(
+            Invite.workspace_id == workspace_id,
+            Invite.status == "pending",
+            Invite.expires_at <= datetime.utcnow()
+        ).values(status="expired").returning(Invite.email))).all()
+
+        if emails:
+            await UsageService.release_invite_seats(db, workspace_id, len(emails))
+            await VersionService.bump_invitees(db, emails)
+        return len(emails)
+
+    @staticmethod
+    async def release_invite_seats(db: AsyncSession, workspace_id: uuid.UUID, count: int):
+        """
+        Release the seats held by `count` invites that are no longer pending
+        """
+        await db.execute(update(Workspace).where(
+            Workspace.id == workspace_id
+        ).values(
+            pending_invite_count=Workspace.pending_invite_count - count,
+            version=Workspace.version + 1
+        ))
+
+    @staticmethod
+    async def reserve_workspace(db: AsyncSession, owner_id: uuid.UUID, workspace_limit: int) -> Optional[int]:
+        """
+        Count a new workspace against the owner's plan limit. Returns the
+        owner's new workspace count, or None if the limit is reached.
+        """
+        return await db.scalar(update(Subscription).where(
+            Subscription.owner_id == owner_id,
+            Subscription.workspace_count < workspace_limit
+        ).values(workspace_count=Subscription.workspace_count + 1).returning(Subscription.workspace_count))
@@ -0,0 +1,34 @@
+# app/services/version_service.py
+import uuid
+from typing import Iterable
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+
+
+class VersionService:
+    """
+    Version counters behind the ETags of the dashboard listings.
+
+    - Workspace.version: bumped by UsageService with every member/invite
+      counter change, in the same UPDATE
+    - User.version: bumped here with every change to the user's memberships
+      or to the invites sent to their email
+
+    Bumps run in the caller's transaction, after its workspace updates, so
+    row locks are always taken invites -> workspaces -> users.
+    """
+
+    @staticmethod
+    async def bump_user(db: AsyncSession, user_id: uuid.UUID):
+        await db.execute(update(User).where(User.id == user_id).values(version=User.version + 1))
+
+    @staticmethod
+    async def bump_invitees(db: AsyncSession, emails: Iterable[str]):
+        """
+        Bump the users the emails belong to (emails without an account are
+        skipped)
+        """
+        emails = set(emails)
+        if emails:
+            await db.execute(update(User).where(User.email.in_(emails)).values(version=User.version + 1))
@@ -1,14 +1,21 @@
 # app/services/workspace_service.py
 import uuid
-from sqlalchemy.orm import Session
+from sqlalchemy import literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from fastapi import HTTPException, status
 from app.models.workspace import Workspace
 from app.models.workspace_member import WorkspaceMember
 from app.models.subscription import Subscription
 from app.models.invite import Invite
 from app.models.user import User
-from app.core.plan_config import PLANS
+from app.models.slug_counter import SlugCounter
+from app.services.token_service import TokenService
+from app.services.usage_service import UsageService
+from app.services.entitlement_service import EntitlementService
+from app.services.version_service import VersionService
 from app.utils.slug import create_slug
+from app.utils.sql import upsert_insert
 from datetime import datetime, timedelta
 import secrets
 from app.services.email_service import EmailService
@@ -17,63 +24,97 @@ from typing import Optional
 
 class WorkspaceService:
     
+    # Slug allocations tried before falling back to a random suffix
+    SLUG_ATTEMPTS = 3
+    
     @staticmethod
-    def create_default_workspace_for_user(db: Session, user_id: uuid.UUID, user_full_name: str):
+    async def allocate_slug(db: AsyncSession, base_slug: str) -> str:
         """
-        Create default workspace for a new user after verification
+        Next free-looking slug for a base in one statement: bumps the base's
+        counter (upsert ... RETURNING), so concurrent callers never get the
+        same suffix
         """
-        try:
-            # Extract first name from full name
-            first_name = user_full_name.split()[0] if user_full_name.split() else "User"
-            
-            # Create workspace name
-            workspace_name = f"{first_name}'s Workspace"
-            
-            # Create unique slug
-            base_slug = create_slug(workspace_name)
-            slug = base_slug
-            counter = 1
-            
-            # Ensure slug is unique
-            while db.query(Workspace).filter(Workspace.slug == slug).first():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            
-            # Create workspace
-            workspace = Workspace(
-                name=workspace_name,
+        stmt = upsert_insert(db, SlugCounter.__table__).values(base_slug=base_slug, last_suffix=0)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SlugCounter.base_slug],
+            set_={"last_suffix": SlugCounter.last_suffix + 1}
+        ).returning(SlugCounter.last_suffix)
+        suffix = await db.scalar(stmt)
+        return base_slug if suffix == 0 else f"{base_slug}-{suffix}"
+    
+    @staticmethod
+    async def insert_workspace(
+        db: AsyncSession,
+        name: str,
+        owner_id: uuid.UUID,
+        description: Optional[str] = None
+    ) -> Workspace:
+        """
+        Insert a workspace with a unique slug plus its owner membership
+        (flushed, not committed).
+
+        The insert skips rows whose slug is already taken (ON CONFLICT DO
+        NOTHING), e.g. slugs created before slug counters existed, and
+        simply retries with the next allocation.
+        """
+        base_slug = create_slug(name) or "workspace"
+        for attempt in range(WorkspaceService.SLUG_ATTEMPTS + 1):
+            if attempt < WorkspaceService.SLUG_ATTEMPTS:
+                slug = await WorkspaceService.allocate_slug(db, base_slug)
+            else:
+                slug = f"{base_slug}-{secrets.token_hex(3)}"
+            
+            stmt = upsert_insert(db, Workspace).values(
+                id=uuid.uuid4(),
+                name=name,
                 slug=slug,
-                owner_id=user_id,
-                is_active=True
-            )
-            
-            db.add(workspace)
-            db.commit()
-            db.refresh(workspace)
-            
-            # Create workspace member entry with owner role
-            workspace_member = WorkspaceMember(
-                workspace_id=workspace.id,
-                user_id=user_id,
-                role="owner",
-                is_active=True
-            )
-            
-            db.add(workspace_member)
-            db.commit()
-            
-            return workspace
-            
-        except Exception as e:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to create default workspace: {str(e)}"
-            )
+                description=description,
+                owner_id=owner_id,
+                is_active=True,
+                member_count=1  # The owner
+            ).on_conflict_do_nothing(index_elements=[Workspace.slug]).returning(Workspace)
+            workspace = await db.scalar(stmt)
+            if workspace is not None:
+                db.add(WorkspaceMember(
+                    workspace_id=workspace.id,
+                    user_id=owner_id,
+                    role="owner",
+                    is_active=True
+                ))
+                await db.flush()
+                return workspace
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not allocate a unique workspace slug"
+        )
     
     @staticmethod
-    def create_new_workspace(
-        db: Session, 
+    async def create_default_workspace_for_user(db: AsyncSession, user_id: uuid.UUID, user_full_name: str):
+        """
+        Create the FREE subscription and default workspace of a new user
+        (flushed, not committed - the caller commits it with the rest of its flow)
+        """
+        # Extract first name from full name
+        first_name = user_full_name.split()[0] if user_full_name.split() else "User"
+        
+        # Create workspace name
+        workspace_name = f"{first_name}'s Workspace"
+        
+        # The subscription starts out counting the default workspace
+        db.add(Subscription(
+            owner_id=user_id,
+            plan="free",
+            status="active",
+            workspace_count=1
+        ))
+        
+        # Create workspace with owner membership
+        return await WorkspaceService.insert_workspace(db, name=workspace_name, owner_id=user_id)
+    
+    @staticmethod
+    async def create_new_workspace(
+        db: AsyncSession, 
         user_id: uuid.UUID, 
         workspace_name: str,
         description: Optional[str] = None
@@ -82,90 +123,111 @@ class WorkspaceService:
         Create a new workspace for user with plan validation
         """
         try:
-            # 1. Get user's subscription plan
-            subscription = db.query(Subscription).filter(
-                Subscription.owner_id == user_id
-            ).first()
-            
-            if not subscription:
-                # Create free subscription if not exists
-                subscription = Subscription(
-                    owner_id=user_id,
-                    plan="free",
-                    status="active"
-                )
-                db.add(subscription)
-                db.commit()
-                db.refresh(subscription)
-            
-            current_plan = subscription.plan
-            
-            # 2. Check workspace limit for the plan
-            workspace_count = db.query(Workspace).filter(
-                Workspace.owner_id == user_id
-            ).count()
-            
-            plan_config = PLANS.get(current_plan, PLANS["free"])
-            workspace_limit = plan_config["workspace_limit"]
-            
-            if workspace_count >= workspace_limit:
+            # 1. Get user's plan limits (FREE subscription if they have none yet)
+            entitlements = await EntitlementService.get_or_create(db, user_id)
+            current_plan = entitlements.plan
+            workspace_limit = entitlements.workspace_limit
+            
+            # 2. Reserve a workspace against the plan limit (atomic)
+            workspace_count = await UsageService.reserve_workspace(db, user_id, workspace_limit)
+            if workspace_count is None:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Workspace limit reached. Your {current_plan} plan allows only {workspace_limit} workspace(s)."
                 )
             
-            # 3. Create unique slug
-            base_slug = create_slug(workspace_name)
-            slug = base_slug
-            counter = 1
-            
-            while db.query(Workspace).filter(Workspace.slug == slug).first():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            
-            # 4. Create workspace
-            workspace = Workspace(
+            # 3. Create workspace with a unique slug and the user as owner
+            workspace = await WorkspaceService.insert_workspace(
+                db,
                 name=workspace_name,
-                slug=slug,
-                description=description,
                 owner_id=user_id,
-                is_active=True
-            )
-            
-            db.add(workspace)
-            db.commit()
-            db.refresh(workspace)
-            
-            # 5. Add user as owner member
-            workspace_member = WorkspaceMember(
-                workspace_id=workspace.id,
-                user_id=user_id,
-                role="owner",
-                is_active=True
+                description=description
             )
-            
-            db.add(workspace_member)
-            db.commit()
+            await VersionService.bump_user(db, user_id)
+            await db.commit()
+            EntitlementService.invalidate(user_id)
             
             return {
                 "workspace": workspace,
                 "current_plan": current_plan,
-                "workspace_count": workspace_count + 1,
+                "workspace_count": workspace_count,
                 "workspace_limit": workspace_limit
             }
             
         except HTTPException:
             raise
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to create workspace: {str(e)}"
             )
     
     @staticmethod
-    def invite_team_member(
-        db: Session,
+    async def _upsert_pending_invite(
+        db: AsyncSession,
+        workspace: Workspace,
+        inviter_id: uuid.UUID,
+        email: str,
+        role: str,
+        expires_at: datetime
+    ) -> tuple[uuid.UUID, bool]:
+        """
+        Insert a pending invite, or renew the role/expiry/inviter of the
+        email's pending invite to the workspace, in one statement (upsert on
+        uq_invites_workspace_id_email_pending). Returns the invite id and
+        whether a new invite was created.
+        """
+        new_id = uuid.uuid4()
+        stmt = upsert_insert(db, Invite.__table__).values(
+            id=new_id,
+            workspace_id=workspace.id,
+            invited_by=inviter_id,
+            email=email,
+            role=role,
+            status="pending",
+            expires_at=expires_at,
+            invited_to_workspace_name=workspace.name
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Invite.workspace_id, Invite.email],
+            # Inlined so PostgreSQL can match the partial index's predicate
+            index_where=Invite.status == literal("pending", literal_execute=True),
+            set_={
+                "role": stmt.excluded.role,
+                "expires_at": stmt.excluded.expires_at,
+                "invited_by": stmt.excluded.invited_by
+            }
+        ).returning(Invite.id)
+        invite_id = await db.scalar(stmt)
+        # The update branch keeps the existing row's id
+        return invite_id, invite_id == new_id
+    
+    @staticmethod
+    async def _reserve_seat(db: AsyncSession, workspace: Workspace, seat_limit: int, reserve) -> bool:
+        """
+        Run a seat reservation; if the workspace is full, expire its overdue
+        pending invites (releasing their seats) and try once more
+        """
+        if await reserve(db, workspace.id, seat_limit):
+            return True
+        if await UsageService.expire_overdue_invites(db, workspace.id):
+            return await reserve(db, workspace.id, seat_limit)
+        return False
+    
+    @staticmethod
+    def _raise_seat_limit(workspace: Workspace, current_plan: str, seat_limit: int):
+        available_seats = max(seat_limit - workspace.member_count, 0)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Cannot send invite. Your {current_plan} plan allows {seat_limit} seats. "
+                f"You have {workspace.member_count} active members and {workspace.pending_invite_count} pending invites. "
+                f"Only {available_seats} seat(s) available."
+        )
+    
+    @staticmethod
+    async def invite_team_member(
+        db: AsyncSession,
         workspace_id: uuid.UUID,
         inviter_id: uuid.UUID,
         invitee_email: str,
@@ -177,10 +239,10 @@ class WorkspaceService:
         """
         try:
             # 1. Get workspace and verify inviter permissions
-            workspace = db.query(Workspace).filter(
+            workspace = await db.scalar(select(Workspace).where(
                 Workspace.id == workspace_id,
                 Workspace.is_active == True
-            ).first()
+            ))
             
             if not workspace:
                 raise HTTPException(
@@ -189,11 +251,15 @@ class WorkspaceService:
                 )
             
             # 2. Check if inviter is owner or admin of the workspace
-            inviter_membership = db.query(WorkspaceMember).filter(
-                WorkspaceMember.workspace_id == workspace_id,
-                WorkspaceMember.user_id == inviter_id,
-                WorkspaceMember.is_active == True
-            ).first()
+            inviter_membership = await db.scalar(
+                select(WorkspaceMember)
+                .options(joinedload(WorkspaceMember.user))
+                .where(
+                    WorkspaceMember.workspace_id == workspace_id,
+                    WorkspaceMember.user_id == inviter_id,
+                    WorkspaceMember.is_active == True
+                )
+            )
             
             if not inviter_membership:
                 raise HTTPException(
@@ -207,72 +273,38 @@ class WorkspaceService:
                     detail="Only owners and admins can invite members"
                 )
             
-            # 3. Get inviter's subscription for seat limit check
-            subscription = db.query(Subscription).filter(
-                Subscription.owner_id == workspace.owner_id
-            ).first()
-            
-            if not subscription:
-                subscription = Subscription(
-                    owner_id=workspace.owner_id,
-                    plan="free",
-                    status="active"
-                )
-                db.add(subscription)
-                db.commit()
-                db.refresh(subscription)
-            
-            current_plan = subscription.plan
-            plan_config = PLANS.get(current_plan, PLANS["free"])
-            seat_limit = plan_config["seat_limit"]
-            
-            # 4. Count current active members in workspace
-            current_members_count = db.query(WorkspaceMember).filter(
-                WorkspaceMember.workspace_id == workspace_id,
-                WorkspaceMember.is_active == True
-            ).count()
+            # 3. Get the workspace owner's plan for the seat limit check
+            entitlements = await EntitlementService.get_or_create(db, workspace.owner_id)
+            current_plan = entitlements.plan
+            seat_limit = entitlements.seat_limit
             
-            # 5. Count PENDING invites that haven't expired
-            # This is the FIX: Include pending invites in seat count
-            pending_invites_count = db.query(Invite).filter(
-                Invite.workspace_id == workspace_id,
-                Invite.status == "pending",
-                Invite.expires_at > datetime.utcnow()
-            ).count()
-            
-            # 6. Check if user already exists in system
-            existing_user = db.query(User).filter(
+            # 4. Check if user already exists in system
+            existing_user = await db.scalar(select(User).where(
                 User.email == invitee_email,
                 User.is_verified == True
-            ).first()
+            ))
             
-            # 7. Check if user is already an active member
-            user_is_active_member = False
+            # 5. Check the user's membership (active or not) in one query
             if existing_user:
-                existing_membership = db.query(WorkspaceMember).filter(
+                existing_membership = await db.scalar(select(WorkspaceMember).where(
                     WorkspaceMember.workspace_id == workspace_id,
-                    WorkspaceMember.user_id == existing_user.id,
-                    WorkspaceMember.is_active == True
-                ).first()
+                    WorkspaceMember.user_id == existing_user.id
+                ))
                 
-                if existing_membership:
+                if existing_membership and existing_membership.is_active:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="User is already an active member of this workspace"
                     )
                 
-                # Check if user has inactive membership
-                inactive_membership = db.query(WorkspaceMember).filter(
-                    WorkspaceMember.workspace_id == workspace_id,
-                    WorkspaceMember.user_id == existing_user.id,
-                    WorkspaceMember.is_active == False
-                ).first()
-                
-                if inactive_membership:
+                if existing_membership:
                     # Reactivate membership instead of sending invite
-                    inactive_membership.is_active = True
-                    inactive_membership.role = role
-                    db.commit()
+                    if not await WorkspaceService._reserve_seat(db, workspace, seat_limit, UsageService.reserve_member_seat):
+                        WorkspaceService._raise_seat_limit(workspace, current_plan, seat_limit)
+                    existing_membership.is_active = True
+                    existing_membership.role = role
+                    await VersionService.bump_user(db, existing_user.id)
+                    await db.commit()
                     
                     return {
                         "message": "Member reactivated",
@@ -281,78 +313,37 @@ class WorkspaceService:
                         "user_exists": True
                     }
             
-            # 8. Check if user already has a pending invite
-            existing_pending_invite = db.query(Invite).filter(
-                Invite.workspace_id == workspace_id,
-                Invite.email == invitee_email,
-                Invite.status == "pending",
-                Invite.expires_at > datetime.utcnow()
-            ).first()
-            
-            # 9. Calculate total occupied seats (active members + pending invites)
-            # If user already has a pending invite, don't count it twice
-            total_occupied_seats = current_members_count + pending_invites_count
-            
-            # If this is a new invite (not resending), check if it would exceed limit
-            if not existing_pending_invite:
-                total_occupied_seats += 1
-            
-            if total_occupied_seats > seat_limit:
-                available_seats = seat_limit - current_members_count
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Cannot send invite. Your {current_plan} plan allows {seat_limit} seats. "
-                        f"You have {current_members_count} active members and {pending_invites_count} pending invites. "
-                        f"Only {available_seats} seat(s) available."
-                )
-            
-            # 10. Handle existing pending invite (resend)
-            if existing_pending_invite:
-                # Update existing invite
-                existing_pending_invite.role = role
-                existing_pending_invite.expires_at = datetime.utcnow() + timedelta(days=7)
-                existing_pending_invite.invited_by = inviter_id
-                db.commit()
-                db.refresh(existing_pending_invite)
-                
-                # Send invitation email
-                invite_link = f"{settings.FRONTEND_URL}/accept-invite?token={existing_pending_invite.token}"
-                EmailService.send_invitation_email(
-                    to_email=invitee_email,
-                    workspace_name=workspace.name,
-                    inviter_name=inviter_membership.user.full_name,
-                    invite_link=invite_link,
-                    role=role,
-                    token=existing_pending_invite.token
-                )
-                
-                return {
-                    "message": "Invitation resent",
-                    "invite_id": existing_pending_invite.id,
-                    "email": invitee_email,
-                    "user_exists": bool(existing_user)
-                }
-            
-            # 11. Create new invite
-            invite_token = secrets.token_urlsafe(32)
-            invite = Invite(
-                workspace_id=workspace_id,
-                invited_by=inviter_id,
+            # 6. Create the pending invite, or renew the existing one (resend)
+            expires_at = datetime.utcnow() + timedelta(days=7)
+            invite_id, created = await WorkspaceService._upsert_pending_invite(
+                db,
+                workspace=workspace,
+                inviter_id=inviter_id,
                 email=invitee_email,
                 role=role,
-                token=invite_token,
-                status="pending",
-                expires_at=datetime.utcnow() + timedelta(days=7),
-                invited_to_workspace_name=workspace.name
+                expires_at=expires_at
             )
             
-            db.add(invite)
-            db.commit()
-            db.refresh(invite)
+            if created:
+                # 7. Hold a seat for the new invite (active members + pending invites);
+                # a resent invite already holds one. On failure the request's
+                # session is closed uncommitted, which discards the invite row.
+                if not await WorkspaceService._reserve_seat(db, workspace, seat_limit, UsageService.reserve_invite_seat):
+                    WorkspaceService._raise_seat_limit(workspace, current_plan, seat_limit)
+            else:
+                # Only token hashes are stored, so a resend gets a fresh token
+                await TokenService.revoke(db, TokenService.INVITE, invite_id)
+            
+            invite_token = TokenService.issue(db, TokenService.INVITE, invite_id, expires_at)
+            
+            if existing_user:
+                # New or renewed entry in their pending invites
+                await VersionService.bump_user(db, existing_user.id)
             
-            # 12. Send invitation email
+            # 8. Queue invitation email in the same transaction
             invite_link = f"{settings.FRONTEND_URL}/accept-invite?token={invite_token}"
-            EmailService.send_invitation_email(
+            EmailService.queue_invitation_email(
+                db=db,
                 to_email=invitee_email,
                 workspace_name=workspace.name,
                 inviter_name=inviter_membership.user.full_name,
@@ -360,10 +351,11 @@ class WorkspaceService:
                 role=role,
                 token=invite_token
             )
+            await db.commit()
             
             return {
-                "message": "Invitation sent successfully",
-                "invite_id": invite.id,
+                "message": "Invitation sent successfully" if created else "Invitation resent",
+                "invite_id": invite_id,
                 "email": invitee_email,
                 "user_exists": bool(existing_user)
             }
@@ -371,50 +363,32 @@ class WorkspaceService:
         except HTTPException:
             raise
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to send invitation: {str(e)}"
             )
         
     @staticmethod
-    def get_user_workspaces(db: Session, user_id: uuid.UUID):
+    async def get_user_workspaces(db: AsyncSession, user_id: uuid.UUID):
         """
         Get all workspaces where user is a member (any role: owner, admin, member)
         """
         try:
-            # Get all workspace IDs where user is an active member
-            workspace_ids = (
-                db.query(WorkspaceMember.workspace_id)
-                .filter(
-                    WorkspaceMember.user_id == user_id,
-                    WorkspaceMember.is_active == True
-                )
-                .all()
-            )
-            
-            # Extract IDs from tuples
-            workspace_id_list = [w[0] for w in workspace_ids]
-            
-            if not workspace_id_list:
-                return []
-            
-            # Fetch all workspaces with member details
-            workspaces = (
-                db.query(Workspace, WorkspaceMember.role)
+            # Workspaces and the user's role in each, in one query
+            workspaces = (await db.execute(
+                select(Workspace, WorkspaceMember.role)
                 .join(
                     WorkspaceMember,
                     Workspace.id == WorkspaceMember.workspace_id
                 )
-                .filter(
-                    Workspace.id.in_(workspace_id_list),
+                .where(
                     WorkspaceMember.user_id == user_id,
                     WorkspaceMember.is_active == True,
                     Workspace.is_active == True
                 )
                 .order_by(Workspace.created_at.desc())
-                .all()
-            )
+            )).all()
             
             # Format response with role information
             result = []
@@ -438,4 +412,54 @@ class WorkspaceService:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to fetch workspaces: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    async def get_workspace_members(db: AsyncSession, workspace_id: uuid.UUID) -> list[dict]:
+        """
+        Active members of a workspace with their user details (the caller
+        checks the current user may see them)
+        """
+        # Columns only: building ORM objects for every row costs more than
+        # the query itself on large workspaces
+        members = (await db.execute(
+            select(
+                WorkspaceMember.id,
+                WorkspaceMember.workspace_id,
+                WorkspaceMember.user_id,
+                WorkspaceMember.role,
+                WorkspaceMember.is_active,
+                WorkspaceMember.joined_at,
+                User.full_name,
+                User.email,
+                User.profile_picture
+            )
+            .join(User, WorkspaceMember.user_id == User.id)
+            .where(
+                WorkspaceMember.workspace_id == workspace_id,
+                WorkspaceMember.is_active == True
+            )
+            .order_by(
+                WorkspaceMember.role.desc(),  # Owners first, then admins, then members
+                User.full_name.asc()
+            )
+        )).all()
+        
+        # Format response with user details
+        return [
+            {
+                "id": member.id,
+                "workspace_id": member.workspace_id,
+                "user_id": member.user_id,
+                "role": member.role,
+                "is_active": member.is_active,
+                "joined_at": member.joined_at,
+                "user": {
+                    "id": member.user_id,
+                    "full_name": member.full_name,
+                    "email": member.email,
+                    "profile_picture": member.profile_picture
+                }
+            }
+            for member in members
+        ]
@@ -1,8 +1,11 @@
 # app/utils/dependencies.py
-from fastapi import Depends, HTTPException, status
+import secrets
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import ReplicaSessionLocal, get_db, replica_router
 from app.services.auth_service import AuthService
 from app.models.workspace_member import WorkspaceMember
 from app.models.user import User
@@ -10,17 +13,19 @@ from uuid import UUID
 
 security = HTTPBearer()
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     token = credentials.credentials
-    user = AuthService.get_current_user(db, token)
+    user = await AuthService.get_current_user(db, token)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
+    # Commits on this session pin the user's reads to the primary
+    db.info["principal_id"] = user.id
     return user
 
 def get_current_active_user(current_user: dict = Depends(get_current_user)):
@@ -31,6 +36,32 @@ def get_current_active_user(current_user: dict = Depends(get_current_user)):
         )
     return current_user
 
+async def get_read_db(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Session for read-only endpoints.
+
+    Served by the read replica when one is configured and healthy, unless
+    the user wrote something within READ_YOUR_WRITES_SECONDS (on this worker
+    or, per the READ_YOUR_WRITES_COOKIE the client sent, on any other).
+    Otherwise the request's primary session is reused.
+    """
+    last_write = request.cookies.get(settings.READ_YOUR_WRITES_COOKIE)
+    if replica_router.is_pinned(current_user.id, last_write):
+        # The write may have happened on another worker, whose per-process
+        # caches were invalidated but not ours: services skip them for this
+        # session (with or without a replica)
+        db.info["read_your_writes"] = True
+    if ReplicaSessionLocal is None or not await replica_router.use_replica(current_user.id, last_write):
+        yield db
+        return
+
+    async with ReplicaSessionLocal() as replica_db:
+        yield replica_db
+
 def get_current_verified_user(current_user: dict = Depends(get_current_user)):
     if not current_user.is_verified:
         raise HTTPException(
@@ -39,20 +70,20 @@ def get_current_verified_user(current_user: dict = Depends(get_current_user)):
         )
     return current_user
 
-def get_workspace_owner_or_admin(
+async def get_workspace_owner_or_admin(
     workspace_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Dependency to check if user is owner or admin of workspace
     """
-    membership = db.query(WorkspaceMember).filter(
+    membership = await db.scalar(select(WorkspaceMember).where(
         WorkspaceMember.workspace_id == workspace_id,
         WorkspaceMember.user_id == current_user.id,
         WorkspaceMember.is_active == True,
         WorkspaceMember.role.in_(["owner", "admin"])
-    ).first()
+    ))
     
     if not membership:
         raise HTTPException(
@@ -60,4 +91,25 @@ def get_workspace_owner_or_admin(
             detail="You must be an owner or admin of this workspace"
         )
     
-    return membership
\ No newline at end of file
+    return membership
+
+def require_metrics_access(request: Request):
+    """
+    Dependency guarding the operational metrics endpoints.
+
+    With METRICS_TOKEN set they need `Authorization: Bearer <METRICS_TOKEN>`
+    (Prometheus' `authorization` scrape option); without it they only exist
+    in DEBUG.
+    """
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not secrets.compare_digest(
+            token.encode(), settings.METRICS_TOKEN.encode()
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+    elif not settings.DEBUG:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
@@ -0,0 +1,58 @@
+# app/utils/etag.py
+from typing import Optional
+from fastapi import Request, Response, status
+
+# Browsers keep the response but revalidate it (If-None-Match) on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """
+    Weak ETag from the parts that identify a response's content, e.g.
+    make_etag("members", workspace_id, workspace_version)
+    """
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def _opaque(tag: str) -> str:
+    # Weak comparison (RFC 9110): W/"x" matches "x"
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match lists the ETag (or is "*")
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Tag the response with the ETag. Returns a 304 Not Modified response to
+    send instead if the client already has this version, else None:
+
+        not_modified = conditional_response(request, response, etag)
+        if not_modified is not None:
+            return not_modified
+
+    Handlers that build their own Response check etag_matches() and pass
+    etag_headers() to it instead.
+    """
+    response.headers.update(etag_headers(etag))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return None
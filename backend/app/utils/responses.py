@@ -0,0 +1,31 @@
+# app/utils/responses.py
+import uuid
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any):
+    # orjson handles uuid.UUID, datetimes and dataclasses itself, but not
+    # subclasses such as the UUIDs asyncpg returns
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSON response encoded by orjson in one pass over plain dicts/lists.
+
+    For large listings: return it directly with the rows already built as
+    dicts, which skips FastAPI's response_model validation (the route's
+    response_model then only documents the shape, so keep the two in line).
+    Small typed responses are better left to FastAPI's own response_model
+    serialization.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
@@ -4,7 +4,6 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
-import secrets
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -34,8 +33,4 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-# Generate random token for email verification
-def generate_verification_token() -> str:
-    return secrets.token_urlsafe(32)
\ No newline at end of file
+    return pwd_context.hash(password)
\ No newline at end of file
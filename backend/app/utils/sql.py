@@ -0,0 +1,22 @@
+# app/utils/sql.py
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# INSERT constructs that support ON CONFLICT, per dialect
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert_insert(db: AsyncSession, table):
+    """
+    INSERT into a table or mapped class for the session's database with
+    on_conflict_do_nothing() / on_conflict_do_update() available (PostgreSQL
+    and SQLite)
+    """
+    dialect = db.get_bind().dialect.name
+    try:
+        return _INSERTS[dialect](table)
+    except KeyError:
+        raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect}")
@@ -0,0 +1,19 @@
+# benchmarks/__init__.py
+"""
+Offline benchmarks for the Zuno API.
+
+Run from the backend/ directory, e.g. `python -m benchmarks.smtp_throughput`.
+Any setting not already in the environment falls back to a local stand-in
+(SQLite file, local SMTP sink) so no .env or external service is needed.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("SMTP_HOST", "127.0.0.1")
+os.environ.setdefault("SMTP_PORT", "8025")
+os.environ.setdefault("SMTP_USER", "")
+os.environ.setdefault("SMTP_PASSWORD", "")
+os.environ.setdefault("SMTP_STARTTLS", "false")
+os.environ.setdefault("FROM_EMAIL", "bench@zuno.local")
+os.environ.setdefault("METRICS_TOKEN", "benchmark-metrics-token")
@@ -0,0 +1,237 @@
+# benchmarks/baseline_upgrade.py
+"""
+Upgrade check for databases created before migrations existed: builds the
+schema the way create_all() did (frozen copies below, without and with the
+email outbox that came before the first migration), adds a user awaiting
+verification and a pending invite, then runs the documented path
+
+    python -m app.cli stamp 0001 && python -m app.cli migrate
+
+and compares the result with an empty database migrated from scratch
+(tables, columns, indexes, unique constraints). The outstanding tokens
+must have moved to auth_tokens.
+
+Fails (exit code 1) if a migration errors or the schemas differ. Drops
+every table in DATABASE_URL, so point it at a scratch database:
+
+    python -m benchmarks.baseline_upgrade
+    DATABASE_URL=postgresql+psycopg2://.../zuno_scratch python -m benchmarks.baseline_upgrade
+"""
+import sys
+import uuid
+from datetime import datetime, timedelta
+import benchmarks  # noqa: F401  (local settings)
+from alembic import command
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text, UniqueConstraint,
+    func, inspect, select
+)
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.schema import alembic_config
+from app.database import engine
+from app.services.token_service import TokenService
+
+
+def first_release(with_outbox: bool) -> MetaData:
+    """
+    The tables of the first release's models, as create_all() made them
+    """
+    metadata = MetaData()
+    Table(
+        "users", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+        Column("full_name", String(255), nullable=False),
+        Column("email", String(255), unique=True, index=True, nullable=False),
+        Column("hashed_password", String(255), nullable=False),
+        Column("is_verified", Boolean),
+        Column("verification_token", String(255), nullable=True),
+        Column("verification_token_expires", DateTime, nullable=True),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        Column("updated_at", DateTime(timezone=True)),
+        Column("is_active", Boolean),
+        Column("profile_picture", Text, nullable=True),
+    )
+    Table(
+        "workspaces", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("name", String(255), nullable=False),
+        Column("slug", String(255), unique=True, index=True),
+        Column("description", Text),
+        Column("owner_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
+        Column("is_active", Boolean),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    )
+    Table(
+        "workspace_members", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("workspace_id", UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False),
+        Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
+        Column("role", String(20)),
+        Column("is_active", Boolean),
+        Column("joined_at", DateTime(timezone=True), server_default=func.now()),
+        UniqueConstraint("workspace_id", "user_id"),
+    )
+    Table(
+        "invites", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("workspace_id", UUID(as_uuid=True), ForeignKey("workspaces.id")),
+        Column("invited_by", UUID(as_uuid=True), ForeignKey("users.id")),
+        Column("email", String(255), nullable=False),
+        Column("role", String(20)),
+        Column("invitee_name", String(255), nullable=True),
+        Column("invited_to_workspace_name", String(255), nullable=True),
+        Column("token", String(255), unique=True, index=True),
+        Column("status", String(20)),
+        Column("expires_at", DateTime),
+        Column("accepted_at", DateTime, nullable=True),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    )
+    Table(
+        "projects", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("workspace_id", UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False),
+        Column("created_by", UUID(as_uuid=True), ForeignKey("users.id")),
+        Column("name", String(255), nullable=False),
+        Column("description", Text),
+        Column("color", String(20)),
+        Column("is_archived", Boolean),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    )
+    Table(
+        "subscriptions", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("owner_id", UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False),
+        Column("plan", String(50)),
+        Column("status", String(20)),
+        Column("current_period_end", DateTime),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    )
+    if with_outbox:
+        Table(
+            "email_outbox", metadata,
+            Column("id", UUID(as_uuid=True), primary_key=True),
+            Column("template", String(50), nullable=False),
+            Column("to_email", String(255), nullable=False),
+            Column("payload", JSON, nullable=False),
+            Column("status", String(20), index=False),
+            Column("attempts", Integer),
+            Column("next_attempt_at", DateTime),
+            Column("last_error", Text),
+            Column("created_at", DateTime(timezone=True), server_default=func.now()),
+            Column("sent_at", DateTime),
+        )
+    return metadata
+
+
+def drop_everything():
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+    metadata.drop_all(bind=engine)
+
+
+def seed(metadata: MetaData) -> list[str]:
+    """
+    An owner with a workspace, an unverified user and a pending invite;
+    returns the plaintext tokens that must keep working
+    """
+    users, workspaces, members, invites, subscriptions = (
+        metadata.tables[name] for name in ("users", "workspaces", "workspace_members", "invites", "subscriptions")
+    )
+    now = datetime.utcnow()
+    owner_id, pending_id, workspace_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(users.insert(), {"id": owner_id, "full_name": "Owner", "email": "owner@example.com",
+                                      "hashed_password": "x", "is_verified": True, "is_active": True})
+        conn.execute(users.insert(), {"id": pending_id, "full_name": "Pending", "email": "pending@example.com",
+                                      "hashed_password": "x", "is_verified": False, "is_active": True,
+                                      "verification_token": "verify-token",
+                                      "verification_token_expires": now + timedelta(days=1)})
+        conn.execute(workspaces.insert(), {"id": workspace_id, "name": "Acme", "slug": "acme", "owner_id": owner_id,
+                                           "is_active": True})
+        conn.execute(members.insert(), {"id": uuid.uuid4(), "workspace_id": workspace_id, "user_id": owner_id,
+                                        "role": "owner", "is_active": True})
+        conn.execute(subscriptions.insert(), {"id": uuid.uuid4(), "owner_id": owner_id, "plan": "free",
+                                              "status": "active"})
+        conn.execute(invites.insert(), {"id": uuid.uuid4(), "workspace_id": workspace_id, "invited_by": owner_id,
+                                        "email": "invitee@example.com", "role": "member", "token": "invite-token",
+                                        "status": "pending", "invited_to_workspace_name": "Acme",
+                                        "expires_at": now + timedelta(days=7)})
+    return ["verify-token", "invite-token"]
+
+
+def schema() -> dict:
+    """
+    Tables with their columns, indexes and unique constraints, comparable
+    across databases
+    """
+    inspector = inspect(engine)
+    tables = {}
+    for table in inspector.get_table_names():
+        tables[table] = {
+            "columns": {
+                column["name"]: (str(column["type"].compile(dialect=engine.dialect)), column["nullable"])
+                for column in inspector.get_columns(table)
+            },
+            "indexes": {
+                index["name"]: (tuple(index["column_names"]), bool(index["unique"]))
+                for index in inspector.get_indexes(table)
+            },
+            "unique": sorted(tuple(constraint["column_names"]) for constraint in inspector.get_unique_constraints(table)),
+        }
+    return tables
+
+
+def differences(expected: dict, actual: dict) -> list[str]:
+    found = []
+    for table in sorted(set(expected) | set(actual)):
+        if table not in actual:
+            found.append(f"missing table {table}")
+        elif table not in expected:
+            found.append(f"extra table {table}")
+        else:
+            for part in ("columns", "indexes", "unique"):
+                if expected[table][part] != actual[table][part]:
+                    found.append(f"{table} {part}: expected {expected[table][part]}, got {actual[table][part]}")
+    return found
+
+
+def main() -> int:
+    config = alembic_config()
+    failures = []
+
+    drop_everything()
+    command.upgrade(config, "head")
+    expected = schema()
+
+    for label, with_outbox in (("first release", False), ("first release + email outbox", True)):
+        drop_everything()
+        metadata = first_release(with_outbox)
+        metadata.create_all(bind=engine)
+        tokens = seed(metadata)
+        try:
+            command.stamp(config, "0001")
+            command.upgrade(config, "head")
+        except Exception as e:
+            failures.append(f"{label}: upgrade failed: {e}")
+            print(f"{label}: stamp 0001 + upgrade head FAILED")
+            continue
+
+        found = [f"{label}: {difference}" for difference in differences(expected, schema())]
+        auth_tokens = MetaData()
+        auth_tokens.reflect(bind=engine, only=["auth_tokens"])
+        with engine.connect() as conn:
+            hashes = set(conn.scalars(select(auth_tokens.tables["auth_tokens"].c.token_hash)))
+        lost = [token for token in tokens if TokenService.hash_token(token) not in hashes]
+        if lost:
+            found.append(f"{label}: outstanding tokens not carried over: {', '.join(lost)}")
+        print(f"{label}: stamp 0001 + upgrade head {'FAILED' if found else 'ok'}")
+        failures += found
+
+    drop_everything()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
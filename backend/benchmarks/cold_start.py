@@ -0,0 +1,72 @@
+# benchmarks/cold_start.py
+"""
+Worker cold start: wall time from spawning a fresh interpreter until the
+app's startup (lifespan) has finished, i.e. until uvicorn could serve.
+
+`--legacy` reproduces the old startup, which ran Base.metadata.create_all()
+at import time and so reflected every table against the database in each
+worker. Point DATABASE_URL at PostgreSQL for realistic numbers:
+
+    python -m benchmarks.cold_start --runs 10
+    python -m benchmarks.cold_start --runs 10 --legacy
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import benchmarks  # noqa: F401  (local settings)
+from alembic import command
+from app.core.schema import alembic_config
+
+WORKER = """
+import asyncio, os, time
+import benchmarks
+from app.main import app
+
+async def main():
+    started = time.perf_counter()
+    if os.environ.get("COLD_START_LEGACY"):
+        from app.database import Base, engine
+        Base.metadata.create_all(bind=engine)
+    async with app.router.lifespan_context(app):
+        print(time.perf_counter() - started)
+
+asyncio.run(main())
+"""
+
+
+def cold_start(legacy: bool) -> tuple[float, float]:
+    """
+    Returns (process start to ready, schema/startup work alone)
+    """
+    env = {**os.environ, "EMAIL_OUTBOX_ENABLED": "false"}
+    if legacy:
+        env["COLD_START_LEGACY"] = "1"
+        env["SCHEMA_VERSION_CHECK"] = "false"
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", WORKER], env=env, check=True, capture_output=True, text=True)
+    return time.perf_counter() - started, float(result.stdout.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--legacy", action="store_true", help="create_all() at import, as before migrations")
+    args = parser.parse_args()
+
+    command.upgrade(alembic_config(), "head")
+    cold_start(args.legacy)  # Warm the OS file cache and .pyc files
+
+    runs = [cold_start(args.legacy) for _ in range(args.runs)]
+    label = "legacy create_all" if args.legacy else "schema version check"
+    print(f"{label} ({args.runs} runs)")
+    for name, timings in (("process start to ready", [r[0] for r in runs]), ("startup work", [r[1] for r in runs])):
+        timings.sort()
+        print(f"  {name:<24} median {statistics.median(timings) * 1000:7.1f} ms   "
+              f"min {timings[0] * 1000:7.1f} ms   max {timings[-1] * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
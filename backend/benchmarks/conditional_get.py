@@ -0,0 +1,145 @@
+# benchmarks/conditional_get.py
+"""
+Conditional GETs of the dashboard listings: fetches each one, repeats the
+request with If-None-Match and reports the statements and median latency
+of the full (200) and revalidated (304) responses. Then makes the writes
+that should change each listing and checks its ETag moved, and that the
+pending invites' ETag moves when an invite expires.
+
+Fails (exit code 1) if a revalidation isn't a 304, runs more statements
+than REVALIDATION_BUDGETS allows, or an ETag survives a write to its data
+or an invite's expiry.
+
+    python -m benchmarks.conditional_get --runs 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+import benchmarks  # noqa: F401  (local settings)
+import httpx
+from alembic import command
+from sqlalchemy import select, update
+from app.config import settings
+from app.core.query_stats import count_queries
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.main import app
+from app.models import Invite
+from benchmarks.emails import emailed_token
+
+# Statements per 304, including the authentication lookup (warm caches)
+REVALIDATION_BUDGETS = {
+    "/workspaces/my-workspaces": 1,
+    "/workspaces/{id}/members": 1,
+    "/invites/pending": 1,
+    "/subscription/current-plan-details": 0,
+}
+
+
+async def signed_up(client: httpx.AsyncClient, label: str) -> tuple[str, dict]:
+    email = f"{label}-{uuid.uuid4().hex[:10]}@example.com"
+    await client.post("/auth/register", json={"full_name": label.title(), "email": email, "password": "password1"})
+    await client.post("/auth/verify-email", json={"token": await emailed_token("verification", email)})
+    login = await client.post("/auth/login", json={"email": email, "password": "password1"})
+    return email, {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+async def tag_moves_on_expiry(client: httpx.AsyncClient, headers: dict, email: str) -> bool:
+    """
+    Whether the pending list stops matching its ETag once its invite lapses
+    (expiry is no write, and the sweeper may not have run). The invite's
+    expiry is restored afterwards.
+    """
+    etag = (await client.get("/invites/pending", headers=headers)).headers["etag"]
+    pending = (Invite.email == email, Invite.status == "pending")
+    async with AsyncSessionLocal() as db:
+        expires_at = await db.scalar(select(Invite.expires_at).where(*pending))
+        await db.execute(update(Invite).where(*pending).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        await db.commit()
+    response = await client.get("/invites/pending", headers={**headers, "If-None-Match": etag})
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(Invite).where(*pending).values(expires_at=expires_at))
+        await db.commit()
+    return response.status_code == 200 and response.json() == []
+
+
+async def measure(client: httpx.AsyncClient, path: str, headers: dict, runs: int) -> dict:
+    full, revalidated = [], []
+    response = await client.get(path, headers=headers)
+    etag = response.headers.get("etag")
+    for _ in range(runs):
+        for samples, extra in ((full, {}), (revalidated, {"If-None-Match": etag or ""})):
+            started = time.perf_counter()
+            with count_queries() as stats:
+                response = await client.get(path, headers={**headers, **extra})
+            samples.append((stats.count, time.perf_counter() - started, response.status_code))
+    return {"etag": etag, "full": full, "revalidated": revalidated}
+
+
+async def main(args) -> int:
+    failures = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        _, owner = await signed_up(client, "owner")
+        invitee_email, invitee = await signed_up(client, "invitee")
+        workspace_id = (await client.get("/workspaces/my-workspaces", headers=owner)).json()[0]["id"]
+
+        endpoints = {
+            "/workspaces/my-workspaces": ("/workspaces/my-workspaces", owner),
+            "/workspaces/{id}/members": (f"/workspaces/{workspace_id}/members", owner),
+            "/invites/pending": ("/invites/pending", invitee),
+            "/subscription/current-plan-details": ("/subscription/current-plan-details", owner),
+        }
+        # The budgets are for warm caches: right after the sign-up writes,
+        # reads skip them (read-your-writes)
+        await asyncio.sleep(settings.READ_YOUR_WRITES_SECONDS)
+        results = {name: await measure(client, path, headers, args.runs) for name, (path, headers) in endpoints.items()}
+
+        # Writes that change the listings: an invite (the workspace's seat
+        # counters and the invitee's pending list), then its acceptance (the
+        # members and the invitee's workspaces)
+        before = {
+            "/workspaces/{id}/members": (endpoints["/workspaces/{id}/members"], results["/workspaces/{id}/members"]["etag"]),
+            "/invites/pending": (endpoints["/invites/pending"], results["/invites/pending"]["etag"]),
+        }
+        response = await client.get("/workspaces/my-workspaces", headers=invitee)
+        before["/workspaces/my-workspaces (invitee)"] = (("/workspaces/my-workspaces", invitee), response.headers["etag"])
+
+        await client.post(f"/workspaces/{workspace_id}/invite", headers=owner, json={"email": invitee_email, "role": "member"})
+        if not await tag_moves_on_expiry(client, invitee, invitee_email):
+            failures.append("/invites/pending still answers 304 after its invite expired")
+        await client.post("/invites/accept", json={"token": await emailed_token("invitation", invitee_email)})
+        for name, ((path, headers), etag) in before.items():
+            response = await client.get(path, headers={**headers, "If-None-Match": etag})
+            if response.status_code != 200:
+                failures.append(f"{name} still answers {response.status_code} to its ETag from before the writes")
+    await async_engine.dispose()
+
+    print(f"{'endpoint':<36} {'200 stmts':>9} {'200 ms':>8} {'304 stmts':>9} {'304 ms':>8}  304 status")
+    for name, result in results.items():
+        full, revalidated = result["full"], result["revalidated"]
+        statements = statistics.median(s[0] for s in revalidated)
+        statuses = ",".join(sorted({str(s[2]) for s in revalidated}))
+        print(f"{name:<36} {statistics.median(s[0] for s in full):>9g} "
+              f"{statistics.median(s[1] for s in full) * 1000:>8.2f} {statements:>9g} "
+              f"{statistics.median(s[1] for s in revalidated) * 1000:>8.2f}  {statuses}")
+        if statuses != "304":
+            failures.append(f"{name} revalidation answered {statuses}")
+        elif statements > REVALIDATION_BUDGETS[name]:
+            failures.append(f"{name} revalidation ran {statements:g} statements (budget {REVALIDATION_BUDGETS[name]})")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    command.upgrade(alembic_config(), "head")
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,129 @@
+# benchmarks/db_concurrency.py
+"""
+Requests/sec for a typical read handler at high concurrency: the old path
+(blocking Session called from an `async def` handler) vs AsyncSession.
+
+Each simulated request does what an authenticated dashboard call does:
+look up the user by email, then list their workspaces. Point DATABASE_URL
+at PostgreSQL for meaningful numbers; SQLite serialises everything anyway.
+
+Over a local socket the raw sync path can post higher req/s because each
+query returns in microseconds, but it does so by blocking the event loop:
+the "worst loop stall" column is how long any other request on the worker
+had to wait. With real network round trips the async path also wins on
+throughput, since queries from different requests overlap.
+
+    python -m benchmarks.db_concurrency --requests 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import time
+import uuid
+import benchmarks  # noqa: F401  (local settings)
+from sqlalchemy import select
+from alembic import command
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.models import User, Workspace, WorkspaceMember
+
+EMAIL = "bench-concurrency@example.com"
+
+
+def seed():
+    command.upgrade(alembic_config(), "head")
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.email == EMAIL).first():
+            return
+        user = User(full_name="Bench User", email=EMAIL, hashed_password="x", is_verified=True)
+        db.add(user)
+        db.flush()
+        for i in range(5):
+            workspace = Workspace(name=f"Bench {i}", slug=f"bench-concurrency-{uuid.uuid4().hex[:8]}", owner_id=user.id)
+            db.add(workspace)
+            db.flush()
+            db.add(WorkspaceMember(workspace_id=workspace.id, user_id=user.id, role="owner"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def workspaces_query(user_id):
+    return (
+        select(Workspace, WorkspaceMember.role)
+        .join(WorkspaceMember, Workspace.id == WorkspaceMember.workspace_id)
+        .where(WorkspaceMember.user_id == user_id, WorkspaceMember.is_active == True)
+    )
+
+
+async def sync_handler():
+    # What every route did before: blocking calls straight on the event loop
+    db = SessionLocal()
+    try:
+        user = db.scalar(select(User).where(User.email == EMAIL))
+        db.execute(workspaces_query(user.id)).all()
+    finally:
+        db.close()
+
+
+async def async_handler():
+    async with AsyncSessionLocal() as db:
+        user = await db.scalar(select(User).where(User.email == EMAIL))
+        (await db.execute(workspaces_query(user.id))).all()
+
+
+async def drive(handler, requests: int, concurrency: int) -> tuple[float, float]:
+    """
+    Returns (elapsed seconds, worst event loop stall in seconds). The stall
+    is what every other request on the worker (e.g. /health) would wait.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+    worst_stall = 0.0
+
+    async def one():
+        async with semaphore:
+            await handler()
+
+    async def heartbeat():
+        nonlocal worst_stall
+        while not done.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst_stall = max(worst_stall, time.perf_counter() - before - 0.001)
+
+    ticker = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticker
+    return elapsed, worst_stall
+
+
+async def run(requests: int, concurrency: int):
+    # Warm both pools
+    await drive(sync_handler, 20, 5)
+    await drive(async_handler, 20, 5)
+
+    sync_elapsed, sync_stall = await drive(sync_handler, requests, concurrency)
+    async_elapsed, async_stall = await drive(async_handler, requests, concurrency)
+    await async_engine.dispose()
+
+    print(f"{'requests / concurrency:':<24}{requests} / {concurrency}")
+    print(f"{'sync Session:':<24}{requests / sync_elapsed:8.1f} req/s   worst loop stall {sync_stall * 1000:7.1f} ms")
+    print(f"{'AsyncSession:':<24}{requests / async_elapsed:8.1f} req/s   worst loop stall {async_stall * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    seed()
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
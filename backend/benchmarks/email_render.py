@@ -0,0 +1,81 @@
+# benchmarks/email_render.py
+"""
+Per-email render cost: compiling the template from source on every call
+(the old inline-string approach) vs the precompiled template registry,
+including text/plain generation and MIME assembly.
+
+    python -m benchmarks.email_render --iterations 2000
+"""
+import argparse
+import os
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from jinja2 import Template
+import benchmarks  # noqa: F401  (local settings)
+from app.services.email_service import EmailService
+from app.services.email_templates import TEMPLATE_DIR, email_templates
+
+CONTEXT = {
+    "workspace_name": "John's Workspace",
+    "inviter_name": "John Doe",
+    "invite_link": "http://localhost:3000/accept-invite?token=abcdefghijklmnopqrstuvwxyz",
+    "role": "member",
+    "token_short": "abcdefgh"
+}
+
+
+def render_compile_per_call(source: str) -> bytes:
+    html = Template(source).render(
+        workspace_name=CONTEXT["workspace_name"],
+        inviter_name=CONTEXT["inviter_name"],
+        invite_link=CONTEXT["invite_link"],
+        role=CONTEXT["role"].capitalize(),
+        token_short=CONTEXT["token_short"] + "..."
+    )
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = "Invitation"
+    msg.attach(MIMEText(html, 'html'))
+    return msg.as_bytes()
+
+
+def render_registry() -> bytes:
+    return EmailService.build_invitation_message(to_email="jane@example.com", **CONTEXT).as_bytes()
+
+
+def timeit(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(os.path.join(TEMPLATE_DIR, "invitation.html")) as f:
+        source = f.read()
+
+    started = time.perf_counter()
+    email_templates.load_all()
+    startup = time.perf_counter() - started
+
+    template_context = {**CONTEXT, "token_short": CONTEXT["token_short"] + "..."}
+    compiled = email_templates.get("invitation.html")
+    compile_render = timeit(lambda: Template(source).render(**template_context), args.iterations)
+    render_only = timeit(lambda: compiled.render(**template_context), args.iterations)
+
+    before = timeit(lambda: render_compile_per_call(source), args.iterations)
+    after = timeit(render_registry, args.iterations)
+
+    print(f"{'registry startup:':<34}{startup * 1000:8.2f} ms (one-off)")
+    print(f"{'template compile + render:':<34}{compile_render * 1e6:8.1f} us/email")
+    print(f"{'precompiled render:':<34}{render_only * 1e6:8.1f} us/email")
+    print(f"{'compile per call (html only):':<34}{before * 1e6:8.1f} us/email")
+    print(f"{'precompiled (html + text):':<34}{after * 1e6:8.1f} us/email")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/emails.py
+"""
+Tokens the app emailed, for benchmarks that walk a flow past its email
+(verify the address, accept the invite) like a user clicking the link.
+"""
+import asyncio
+import time
+from typing import Optional
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models import AuthToken, EmailOutbox
+from app.services.token_service import TokenService
+
+EMAIL_TIMEOUT_SECONDS = 30.0
+
+
+async def emailed_token(
+    template: str,
+    email: str,
+    sink_links: Optional[dict[str, list[str]]] = None,
+    timeout: float = EMAIL_TIMEOUT_SECONDS,
+) -> str:
+    """
+    The token of the last `template` email to `email`: from the outbox row
+    while it is pending, or, once the outbox worker sent it (sent rows no
+    longer keep the link), from the links an SMTP sink received
+    (`CountingHandler.links`), the one whose token is still unused. Waits up
+    to `timeout` seconds for the email.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        async with AsyncSessionLocal() as db:
+            payload = await db.scalar(
+                select(EmailOutbox.payload)
+                .where(EmailOutbox.template == template, EmailOutbox.to_email == email)
+                .order_by(EmailOutbox.created_at.desc())
+                .limit(1)
+            )
+            link = (payload or {}).get("verification_link") or (payload or {}).get("invite_link")
+            if link is not None:
+                return link.split("token=")[1]
+            sent = [link.split("token=")[1] for link in sink_links[email]] if sink_links is not None else []
+            hashes = {TokenService.hash_token(token): token for token in sent}
+            unused = await db.scalar(
+                select(AuthToken.token_hash)
+                .where(AuthToken.token_hash.in_(list(hashes)), AuthToken.consumed_at.is_(None))
+                .limit(1)
+            ) if hashes else None
+        if unused is not None:
+            return hashes[unused]
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"no {template} email to {email}")
+        await asyncio.sleep(0.05)
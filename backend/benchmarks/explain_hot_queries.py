@@ -0,0 +1,208 @@
+# benchmarks/explain_hot_queries.py
+"""
+Index check for the hot queries: seeds a realistic dataset, runs EXPLAIN on
+every query the request path issues and fails (exit code 1) if any of them
+plans a sequential scan.
+
+Needs PostgreSQL (SQLite's planner says little about production plans).
+The schema is built with `alembic upgrade head`, so this also checks that
+the migrations create the indexes the models declare. Use a scratch
+database - the seed is only written once and never removed:
+
+    DATABASE_URL=postgresql+psycopg2://.../zuno_explain python -m benchmarks.explain_hot_queries
+"""
+import argparse
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+import benchmarks  # noqa: F401  (local settings)
+from alembic import command
+from sqlalchemy import func, insert, literal, select, text
+from app.core.schema import alembic_config
+from app.database import engine
+from app.models import AuthToken, EmailOutbox, Invite, User, Workspace, WorkspaceMember
+from app.services.token_service import TokenService
+
+
+def seed(conn, users: int):
+    if conn.scalar(select(func.count()).select_from(User)):
+        return
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    user_rows = [{
+        "id": uuid.uuid4(),
+        "full_name": f"User {i}",
+        "email": f"user{i}@example.com",
+        "hashed_password": "x",
+        "is_verified": i % 10 != 0,
+        "is_active": True
+    } for i in range(users)]
+    conn.execute(insert(User), user_rows)
+    user_ids = [row["id"] for row in user_rows]
+
+    # Unverified users still hold a verification token
+    conn.execute(insert(AuthToken), [{
+        "id": uuid.uuid4(),
+        "token_hash": TokenService.hash_token(f"verify-{row['id']}"),
+        "purpose": TokenService.EMAIL_VERIFICATION,
+        "subject_id": row["id"],
+        "expires_at": now + timedelta(days=1)
+    } for row in user_rows if not row["is_verified"]])
+
+    workspace_rows = [{
+        "id": uuid.uuid4(),
+        "name": f"Workspace {i}",
+        "slug": f"workspace-{i}",
+        "owner_id": owner_id,
+        "is_active": True
+    } for i, owner_id in enumerate(user_ids)]
+    conn.execute(insert(Workspace), workspace_rows)
+
+    member_rows = []
+    invite_rows = []
+    for workspace in workspace_rows:
+        member_rows.append({"id": uuid.uuid4(), "workspace_id": workspace["id"], "user_id": workspace["owner_id"], "role": "owner", "is_active": True})
+        for user_id in rng.sample(user_ids, 4):
+            if user_id != workspace["owner_id"]:
+                member_rows.append({"id": uuid.uuid4(), "workspace_id": workspace["id"], "user_id": user_id, "role": "member", "is_active": rng.random() > 0.1})
+        for _ in range(3):
+            invite_rows.append({
+                "id": uuid.uuid4(),
+                "workspace_id": workspace["id"],
+                "invited_by": workspace["owner_id"],
+                "email": f"user{rng.randrange(users * 2)}@example.com",
+                "status": rng.choice(["pending", "accepted", "accepted", "declined", "expired"]),
+                "expires_at": now + timedelta(days=rng.randint(-14, 7))
+            })
+    conn.execute(insert(WorkspaceMember), member_rows)
+    conn.execute(insert(Invite), invite_rows)
+    conn.execute(insert(AuthToken), [{
+        "id": uuid.uuid4(),
+        "token_hash": TokenService.hash_token(f"invite-{row['id']}"),
+        "purpose": TokenService.INVITE,
+        "subject_id": row["id"],
+        "expires_at": row["expires_at"]
+    } for row in invite_rows])
+
+    outbox_rows = [{
+        "id": uuid.uuid4(),
+        "template": "verification",
+        "to_email": f"user{i}@example.com",
+        "payload": {},
+        "status": "pending" if i % 100 == 0 else "sent",
+        "attempts": 1,
+        "next_attempt_at": now - timedelta(minutes=i % 60)
+    } for i in range(users * 2)]
+    conn.execute(insert(EmailOutbox), outbox_rows)
+
+
+def hot_queries(conn) -> dict:
+    """
+    The filters the API issues, keyed by where they come from
+    """
+    user = conn.execute(select(User.id, User.email).where(User.is_verified == True).limit(1)).first()
+    workspace_id = conn.scalar(select(Workspace.id).where(Workspace.owner_id == user.id))
+    unverified_id = conn.scalar(select(User.id).where(User.is_verified == False).limit(1))
+    invite_id = conn.scalar(select(Invite.id).limit(1))
+    now = datetime.utcnow()
+
+    return {
+        "login / register (users.email)": select(User).where(User.email == user.email),
+        "verify email (token)": select(AuthToken.subject_id).where(
+            AuthToken.token_hash == TokenService.hash_token(f"verify-{unverified_id}"),
+            AuthToken.purpose == TokenService.EMAIL_VERIFICATION,
+            AuthToken.consumed_at.is_(None),
+            AuthToken.expires_at > now
+        ),
+        "owner/admin check": select(WorkspaceMember).where(
+            WorkspaceMember.workspace_id == workspace_id,
+            WorkspaceMember.user_id == user.id,
+            WorkspaceMember.is_active == True,
+            WorkspaceMember.role.in_(["owner", "admin"])
+        ),
+        "my workspaces": select(WorkspaceMember.workspace_id).where(
+            WorkspaceMember.user_id == user.id,
+            WorkspaceMember.is_active == True
+        ),
+        "workspace members": select(WorkspaceMember, User)
+            .join(User, WorkspaceMember.user_id == User.id)
+            .where(WorkspaceMember.workspace_id == workspace_id, WorkspaceMember.is_active == True),
+        "active member count": select(func.count()).select_from(WorkspaceMember).where(
+            WorkspaceMember.workspace_id == workspace_id,
+            WorkspaceMember.is_active == True
+        ),
+        "pending invite count": select(func.count()).select_from(Invite).where(
+            Invite.workspace_id == workspace_id,
+            Invite.status == "pending",
+            Invite.expires_at > now
+        ),
+        "pending invites for email": select(Invite)
+            .join(Workspace, Invite.workspace_id == Workspace.id)
+            .where(Invite.email == user.email, Invite.status == "pending", Invite.expires_at > now),
+        "sent invites": select(Invite).where(Invite.workspace_id == workspace_id).order_by(Invite.created_at.desc()),
+        "invite by token": select(Invite).where(
+            Invite.id == TokenService.subject_of(TokenService.INVITE, f"invite-{invite_id}"),
+            Invite.status == "pending"
+        ),
+        "owned workspaces": select(Workspace).where(Workspace.owner_id == user.id).order_by(Workspace.created_at.asc()),
+        "owned workspace count": select(func.count()).select_from(Workspace).where(Workspace.owner_id == user.id),
+        "invite sweep": select(Invite.id)
+            .where(
+                Invite.status == literal("pending", literal_execute=True),
+                Invite.expires_at <= now
+            )
+            .order_by(Invite.expires_at)
+            .limit(500)
+            .with_for_update(skip_locked=True),
+        "outbox claim": select(EmailOutbox)
+            .where(
+                EmailOutbox.status == literal("pending", literal_execute=True),
+                EmailOutbox.next_attempt_at <= now
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(50)
+            .with_for_update(skip_locked=True),
+    }
+
+
+def seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20000)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        sys.exit("explain_hot_queries needs a PostgreSQL DATABASE_URL")
+
+    command.upgrade(alembic_config(), "head")
+    with engine.begin() as conn:
+        seed(conn, args.users)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+    failures = 0
+    with engine.connect() as conn:
+        for name, stmt in hot_queries(conn).items():
+            sql = stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()[0]["Plan"]
+            scanned = seq_scans(plan)
+            status = "SEQ SCAN on " + ", ".join(scanned) if scanned else "ok"
+            failures += bool(scanned)
+            print(f"{name:<34} {status}")
+
+    if failures:
+        sys.exit(f"{failures} hot queries fall back to a sequential scan")
+
+
+if __name__ == "__main__":
+    main()
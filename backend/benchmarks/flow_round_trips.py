@@ -0,0 +1,102 @@
+# benchmarks/flow_round_trips.py
+"""
+Round trips per onboarding/workspace flow: runs each flow --runs times
+through the ASGI app and reports the SQL statements, commits and median
+latency of each step.
+
+Flows: register, verify email (creates the subscription and default
+workspace), create a second workspace, invite a member and accept the
+invite as a new user. Password hashing is part of register and accept, so
+compare their statements and commits rather than latency.
+
+    python -m benchmarks.flow_round_trips --runs 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import defaultdict
+import benchmarks  # noqa: F401  (local settings)
+import httpx
+from alembic import command
+from sqlalchemy import event, select, update
+from app.core.query_stats import count_queries
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.main import app
+from app.models import Subscription, User
+from app.services.entitlement_service import EntitlementService
+from benchmarks.emails import emailed_token
+
+commits = 0
+
+
+@event.listens_for(async_engine.sync_engine, "commit")
+def _count_commit(conn):
+    global commits
+    commits += 1
+
+
+async def upgrade_plan(email: str):
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(select(User.id).where(User.email == email))
+        await db.execute(update(Subscription).where(Subscription.owner_id == user_id).values(plan="business"))
+        await db.commit()
+    EntitlementService.invalidate(user_id)
+
+
+async def run_flows(client: httpx.AsyncClient, results: dict):
+    email = f"flow-{uuid.uuid4().hex[:10]}@example.com"
+    invitee = f"flow-invitee-{uuid.uuid4().hex[:10]}@example.com"
+
+    async def step(name, method, path, **kwargs):
+        global commits
+        commits = 0
+        started = time.perf_counter()
+        with count_queries() as stats:
+            response = await client.request(method, path, **kwargs)
+        results[name].append((stats.count, commits, time.perf_counter() - started, response.status_code))
+        return response
+
+    await step("register", "POST", "/auth/register",
+               json={"full_name": "Flow User", "email": email, "password": "password1"})
+    token = await emailed_token("verification", email)
+    await step("verify email", "POST", "/auth/verify-email", json={"token": token})
+
+    login = await client.post("/auth/login", json={"email": email, "password": "password1"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    workspace_id = (await client.get("/workspaces/my-workspaces", headers=headers)).json()[0]["id"]
+    await upgrade_plan(email)
+
+    await step("create workspace", "POST", "/workspaces/create", headers=headers, json={"name": "Second"})
+    await step("invite", "POST", f"/workspaces/{workspace_id}/invite", headers=headers,
+               json={"email": invitee, "role": "member"})
+    token = await emailed_token("invitation", invitee)
+    await step("accept invite (new user)", "POST", "/invites/accept",
+               json={"token": token, "full_name": "Flow Invitee", "password": "password2"})
+
+
+async def main(args):
+    results = defaultdict(list)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(args.runs):
+            await run_flows(client, results)
+    await async_engine.dispose()
+
+    print(f"{'flow':<26} {'statements':>10} {'commits':>8} {'median ms':>10}  status")
+    for name, samples in results.items():
+        statements = statistics.median(s[0] for s in samples)
+        commit_count = statistics.median(s[1] for s in samples)
+        latency = statistics.median(s[2] for s in samples) * 1000
+        statuses = ",".join(sorted({str(s[3]) for s in samples}))
+        print(f"{name:<26} {statements:>10g} {commit_count:>8g} {latency:>10.2f}  {statuses}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    command.upgrade(alembic_config(), "head")
+    asyncio.run(main(args))
@@ -0,0 +1,104 @@
+# benchmarks/invite_sweep.py
+"""
+Seeds --workspaces workspaces with --invites pending invites each, about
+half of them overdue, then runs the invite sweeper until it finds nothing
+left to expire. Prints the rows and time of every sweep and checks that
+no overdue invite is still pending and the workspaces' pending invite
+counters match their pending rows.
+
+    python -m benchmarks.invite_sweep --workspaces 200 --invites 50 --batch-size 500
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+import benchmarks  # noqa: F401  (local settings)
+from alembic import command
+from sqlalchemy import func, insert, select
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.models import Invite, User, Workspace
+from app.services.invite_sweeper import InviteSweeper
+
+
+async def seed(workspaces: int, invites: int) -> list[uuid.UUID]:
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    owner_id = uuid.uuid4()
+    workspace_rows = [{
+        "id": uuid.uuid4(),
+        "name": f"Sweep {i}",
+        "slug": f"sweep-{uuid.uuid4().hex[:10]}",
+        "owner_id": owner_id,
+        "member_count": 1,
+        "pending_invite_count": invites
+    } for i in range(workspaces)]
+    invite_rows = [{
+        "workspace_id": workspace["id"],
+        "invited_by": owner_id,
+        "email": f"sweep-{uuid.uuid4().hex[:10]}@example.com",
+        "role": "member",
+        "status": "pending",
+        "expires_at": now + timedelta(hours=rng.randint(-24 * 14, 24 * 7))
+    } for workspace in workspace_rows for _ in range(invites)]
+
+    async with AsyncSessionLocal() as db:
+        db.add(User(id=owner_id, full_name="Sweep Owner", email=f"sweep-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x"))
+        await db.flush()
+        await db.execute(insert(Workspace), workspace_rows)
+        await db.execute(insert(Invite), invite_rows)
+        await db.commit()
+    return [workspace["id"] for workspace in workspace_rows]
+
+
+async def main(args) -> int:
+    workspace_ids = await seed(args.workspaces, args.invites)
+    sweeper = InviteSweeper()
+    sweeper.batch_size = args.batch_size
+
+    started = time.perf_counter()
+    sweeps = total = 0
+    while True:
+        sweep_started = time.perf_counter()
+        expired = await sweeper.run_once()
+        if not expired:
+            break
+        sweeps += 1
+        total += expired
+        print(f"sweep {sweeps:>3}: {expired:>6} invites expired in {(time.perf_counter() - sweep_started) * 1000:8.1f} ms")
+    elapsed = time.perf_counter() - started
+
+    async with AsyncSessionLocal() as db:
+        overdue = await db.scalar(select(func.count()).select_from(Invite).where(
+            Invite.workspace_id.in_(workspace_ids),
+            Invite.status == "pending",
+            Invite.expires_at <= datetime.utcnow()
+        ))
+        pending = dict((await db.execute(
+            select(Invite.workspace_id, func.count())
+            .where(Invite.workspace_id.in_(workspace_ids), Invite.status == "pending")
+            .group_by(Invite.workspace_id)
+        )).all())
+        counters = dict((await db.execute(
+            select(Workspace.id, Workspace.pending_invite_count).where(Workspace.id.in_(workspace_ids))
+        )).all())
+    await async_engine.dispose()
+
+    mismatched = sum(counters[workspace_id] != pending.get(workspace_id, 0) for workspace_id in workspace_ids)
+    print(f"{total} invites expired in {sweeps} sweeps ({elapsed:.2f}s), "
+          f"{sweeper.workspaces_released} workspace counter updates")
+    print(f"overdue still pending {overdue}, workspaces with a wrong pending counter {mismatched}")
+    return 1 if overdue or mismatched else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workspaces", type=int, default=200)
+    parser.add_argument("--invites", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    command.upgrade(alembic_config(), "head")
+    sys.exit(asyncio.run(main(args)))
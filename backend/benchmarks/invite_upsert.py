@@ -0,0 +1,90 @@
+# benchmarks/invite_upsert.py
+"""
+Invite create/resend under concurrency: sends --requests invites for the
+same email to one workspace in parallel, each in its own session, and
+checks that exactly one pending invite exists, that it holds exactly one
+seat and that one request created it while the rest resent it.
+
+Runs against SQLite too (the upserts use its ON CONFLICT), where the
+requests are serialized by the database lock instead of the unique index.
+
+    python -m benchmarks.invite_upsert --requests 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections import Counter
+import benchmarks  # noqa: F401  (local settings)
+from alembic import command
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.models import Invite, Subscription, User, Workspace
+from app.services.workspace_service import WorkspaceService
+
+
+async def setup() -> tuple[uuid.UUID, uuid.UUID]:
+    run = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        owner = User(full_name="Upsert Owner", email=f"upsert-owner-{run}@example.com", hashed_password="x", is_verified=True)
+        db.add(owner)
+        await db.flush()
+        db.add(Subscription(owner_id=owner.id, plan="business", status="active", workspace_count=1))
+        workspace = await WorkspaceService.insert_workspace(db, name=f"Upsert {run}", owner_id=owner.id)
+        await db.commit()
+        return workspace.id, owner.id
+
+
+async def invite(workspace_id: uuid.UUID, owner_id: uuid.UUID, email: str) -> str:
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await WorkspaceService.invite_team_member(db, workspace_id, owner_id, email, "member")
+            return result["message"]
+        except HTTPException as e:
+            return f"{e.status_code} {e.detail}"
+
+
+async def main(args) -> int:
+    workspace_id, owner_id = await setup()
+    email = f"upsert-{uuid.uuid4().hex[:8]}@example.com"
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(invite(workspace_id, owner_id, email) for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    async with AsyncSessionLocal() as db:
+        workspace = await db.get(Workspace, workspace_id)
+        pending = await db.scalar(select(func.count()).select_from(Invite).where(
+            Invite.workspace_id == workspace_id,
+            Invite.email == email,
+            Invite.status == "pending"
+        ))
+    await async_engine.dispose()
+
+    outcomes = Counter(results)
+    print(f"{args.requests} parallel invites for one email in {elapsed:.2f}s")
+    for outcome, count in outcomes.most_common():
+        print(f"  {count:>4}  {outcome}")
+    print(f"pending invites {pending} (counter {workspace.pending_invite_count})")
+
+    failures = []
+    if pending != 1:
+        failures.append(f"{pending} pending invites for one email")
+    if workspace.pending_invite_count != 1:
+        failures.append(f"the invite holds {workspace.pending_invite_count} seats")
+    if outcomes["Invitation sent successfully"] != 1:
+        failures.append("expected exactly one request to create the invite")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    command.upgrade(alembic_config(), "head")
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,17 @@
+# benchmarks/load_test/__init__.py
+"""
+Load test of every API route: seeds a dataset at a configurable scale
+(seed.py), drives the app with realistic request mixes (scenarios.py) and
+writes p50/p95/p99 latency, requests/sec and queries/request per route as
+JSON, so runs can be compared over time.
+
+Runs the app in-process (with its background jobs) by default, delivering
+email to a local SMTP sink. --base-url drives a running server instead; it
+must use the same DATABASE_URL and METRICS_TOKEN and, for accurate
+queries/request, run a single worker (the counts come from its
+/internal/metrics).
+
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --users 2000 --workspaces 200 --concurrency 50
+    python -m benchmarks.load_test --scenarios login_storm,dashboard_load --baseline previous.json
+"""
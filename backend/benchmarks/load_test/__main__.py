@@ -0,0 +1,179 @@
+# benchmarks/load_test/__main__.py
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+import benchmarks  # noqa: F401  (local settings)
+import httpx
+from alembic import command
+from fastapi.routing import APIRoute
+from sqlalchemy import func, select
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.main import app
+from app.models import EmailOutbox
+from benchmarks.load_test import __doc__ as description
+from benchmarks.load_test.recorder import Recorder
+from benchmarks.load_test.scenarios import SCENARIOS
+from benchmarks.load_test.seed import Scale, seed
+from benchmarks.smtp_sink import start_sink
+
+
+def git_revision() -> str:
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def app_routes(routes=None) -> set[str]:
+    found = set()
+    for route in app.routes if routes is None else routes:
+        if isinstance(route, APIRoute):
+            found |= {f"{method} {route.path}" for method in route.methods}
+        elif hasattr(route, "original_router"):
+            # FastAPI keeps included routers nested; main.py includes them
+            # without a prefix, so their paths are already complete
+            found |= app_routes(route.original_router.routes)
+    return found
+
+
+async def pending_emails() -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(EmailOutbox).where(EmailOutbox.status == "pending"))
+
+
+async def wait_for_outbox(timeout: float) -> int:
+    """
+    Let the outbox worker deliver what the scenarios queued; returns what
+    is still pending after `timeout`
+    """
+    deadline = time.monotonic() + timeout
+    pending = await pending_emails()
+    while pending and time.monotonic() < deadline:
+        await asyncio.sleep(0.5)
+        pending = await pending_emails()
+    return pending
+
+
+async def run(args, scale: Scale) -> dict:
+    data = await seed(scale)
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+        lifespan = contextlib.nullcontext()
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test", timeout=60)
+        lifespan = app.router.lifespan_context(app)
+
+    results = {}
+    async with lifespan, client:
+        for name in args.scenarios:
+            async with Recorder(client) as recorder:
+                await SCENARIOS[name](recorder, data, args)
+            results[name] = recorder.report()
+            print_scenario(name, results[name], args.baseline_results.get(name))
+        emails_pending = await wait_for_outbox(args.outbox_timeout) if not args.base_url else None
+    await async_engine.dispose()
+
+    covered = {route for result in results.values() for route in result["routes"]}
+    return {
+        "started_at": args.started_at,
+        "revision": git_revision(),
+        "target": args.base_url or "in-process",
+        "database": async_engine.dialect.name,
+        "scale": asdict(scale),
+        "options": {
+            "concurrency": args.concurrency,
+            "signups": args.signups,
+            "logins": args.logins,
+            "dashboard_users": args.dashboard_users,
+            "invite_burst": args.invite_burst
+        },
+        "emails_pending": emails_pending,
+        "scenarios": results,
+        "uncovered_routes": sorted(app_routes() - covered)
+    }
+
+
+def print_scenario(name: str, result: dict, baseline: dict = None):
+    print(f"\n{name}: {result['requests']} requests in {result['duration_s']:.2f}s, "
+          f"{result['requests_per_second']:.1f} req/s, {result['errors']} errors")
+    print(f"  {'route':<44} {'reqs':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'q/req':>6}"
+          + (f" {'p95 vs base':>11}" if baseline else ""))
+    for route, stats in result["routes"].items():
+        latency = stats["latency_ms"]
+        queries = stats["queries_per_request"]
+        line = (f"  {route:<44} {stats['requests']:>6} {stats['requests_per_second']:>8.1f} {latency['p50']:>8.2f} "
+                f"{latency['p95']:>8.2f} {latency['p99']:>8.2f} {'-' if queries is None else queries:>6}")
+        before = (baseline or {}).get("routes", {}).get(route)
+        if before:
+            line += f" {(latency['p95'] / before['latency_ms']['p95'] - 1) * 100:>+10.0f}%"
+        if stats["errors"]:
+            line += f"  {stats['errors']} errors {stats['statuses']}"
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test", description=description,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    dataset = parser.add_argument_group("dataset")
+    dataset.add_argument("--users", type=int, default=Scale.users)
+    dataset.add_argument("--workspaces", type=int, default=Scale.workspaces)
+    dataset.add_argument("--members", type=int, default=Scale.members, help="Per workspace, besides the owner")
+    dataset.add_argument("--invites", type=int, default=Scale.invites, help="Pending invites per workspace")
+    mixes = parser.add_argument_group("mixes")
+    mixes.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Any of: {', '.join(SCENARIOS)}")
+    mixes.add_argument("--concurrency", type=int, default=20, help="Requests in flight")
+    mixes.add_argument("--signups", type=int, default=20)
+    mixes.add_argument("--logins", type=int, default=100, help="Seeded users who log in")
+    mixes.add_argument("--dashboard-users", type=int, default=200, help="Seeded users who open the dashboard")
+    mixes.add_argument("--invite-burst", type=int, default=3, help="Invites each owner sends")
+    parser.add_argument("--base-url", help="Drive a running server instead of the app in-process")
+    parser.add_argument("--output", help="JSON results file (default: load-test-<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier JSON results to compare p95 latency with")
+    parser.add_argument("--outbox-timeout", type=float, default=30.0,
+                        help="Seconds to wait for queued emails after the mixes (in-process)")
+    parser.add_argument("--no-sink", action="store_true", help="Don't start the local SMTP sink")
+    args = parser.parse_args()
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    scale = Scale(args.users, args.workspaces, args.members, args.invites)
+    try:
+        scale.check(extra_seats=args.invite_burst if "invite_burst" in args.scenarios else 0)
+    except ValueError as e:
+        parser.error(str(e))
+    args.baseline_results = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            args.baseline_results = json.load(f)["scenarios"]
+    started_at = datetime.now(timezone.utc)
+    args.started_at = started_at.isoformat()
+    output = args.output or f"load-test-{started_at:%Y%m%d-%H%M%S}.json"
+
+    command.upgrade(alembic_config(), "head")
+    sink = args.sink = None if args.no_sink else start_sink(port=int(os.environ["SMTP_PORT"]))
+    try:
+        report = asyncio.run(run(args, scale))
+    finally:
+        if sink is not None:
+            sink.stop()
+    report["emails_delivered"] = sink.handler.count if sink is not None else None
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    errors = sum(result["errors"] for result in report["scenarios"].values())
+    print(f"\n{errors} errors; uncovered routes: {', '.join(report['uncovered_routes']) or 'none'}")
+    print(f"Results written to {output}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
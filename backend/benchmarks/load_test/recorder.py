@@ -0,0 +1,125 @@
+# benchmarks/load_test/recorder.py
+import asyncio
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Optional
+import httpx
+from app.config import settings
+
+METRICS_PATH = "/internal/metrics"
+
+
+def metrics_headers() -> dict:
+    """
+    Authorization for the app's metrics endpoints (its METRICS_TOKEN)
+    """
+    return {"Authorization": f"Bearer {settings.METRICS_TOKEN}"} if settings.METRICS_TOKEN else {}
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    # Nearest rank
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+async def gather_limited(concurrency: int, coroutines) -> list:
+    """
+    Await the coroutines with at most `concurrency` running at once
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(limited(coroutine) for coroutine in coroutines))
+
+
+async def route_queries(client: httpx.AsyncClient) -> Optional[dict]:
+    """
+    Per-route (requests, queries) totals so far, from the app's query
+    metrics. None if the server doesn't expose them.
+    """
+    try:
+        response = await client.get(METRICS_PATH, headers=metrics_headers())
+        routes = response.json()["db_queries"]["routes"]
+    except (httpx.HTTPError, ValueError, KeyError):
+        return None
+    return {route: (totals["requests"], totals["queries"]) for route, totals in routes.items()}
+
+
+class Recorder:
+    """
+    Latency and status of every request of one scenario, keyed by route
+    template ("GET /workspaces/{workspace_id}/members", as the app's query
+    metrics name them)
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+        self.started = self.finished = 0.0
+        self._queries_before: Optional[dict] = None
+        self._queries_after: Optional[dict] = None
+
+    async def request(self, method: str, route: str, expect: tuple = (200,), **kwargs) -> httpx.Response:
+        """
+        Send one request to `route` with its path parameters filled in from
+        `path`, e.g. request("GET", "/invites/details/{token}", path={"token": token})
+        """
+        path = route.format(**kwargs.pop("path", {}))
+        key = f"{method} {route}"
+        started = time.perf_counter()
+        response = await self.client.request(method, path, **kwargs)
+        self.latencies[key].append(time.perf_counter() - started)
+        self.statuses[key][response.status_code] += 1
+        if response.status_code not in expect:
+            self.errors[key] += 1
+        return response
+
+    async def __aenter__(self):
+        self._queries_before = await route_queries(self.client)
+        self.started = time.perf_counter()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.finished = time.perf_counter()
+        self._queries_after = await route_queries(self.client)
+
+    def _queries_per_request(self, key: str) -> Optional[float]:
+        if self._queries_before is None or self._queries_after is None or key not in self._queries_after:
+            return None
+        requests_after, queries_after = self._queries_after[key]
+        requests_before, queries_before = self._queries_before.get(key, (0, 0))
+        if requests_after == requests_before:
+            return None
+        return round((queries_after - queries_before) / (requests_after - requests_before), 2)
+
+    def report(self) -> dict:
+        duration = self.finished - self.started
+        routes = {}
+        for key in sorted(self.latencies):
+            latencies = sorted(self.latencies[key])
+            routes[key] = {
+                "requests": len(latencies),
+                "errors": self.errors[key],
+                "statuses": {str(code): count for code, count in sorted(self.statuses[key].items())},
+                "requests_per_second": round(len(latencies) / duration, 1),
+                "latency_ms": {
+                    "p50": round(percentile(latencies, 0.50) * 1000, 2),
+                    "p95": round(percentile(latencies, 0.95) * 1000, 2),
+                    "p99": round(percentile(latencies, 0.99) * 1000, 2),
+                    "max": round(latencies[-1] * 1000, 2)
+                },
+                "queries_per_request": self._queries_per_request(key)
+            }
+        requests = sum(route["requests"] for route in routes.values())
+        return {
+            "duration_s": round(duration, 3),
+            "requests": requests,
+            "errors": sum(self.errors.values()),
+            "requests_per_second": round(requests / duration, 1) if duration else 0.0,
+            "routes": routes
+        }
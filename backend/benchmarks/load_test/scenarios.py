@@ -0,0 +1,115 @@
+# benchmarks/load_test/scenarios.py
+"""
+Request mixes. Each one runs its requests with at most
+options.concurrency in flight:
+
+  signup          new users register, ask for the verification email again,
+                  verify with the emailed token and log in
+  login_storm     seeded users all log in at once, then load /auth/me with
+                  their new token
+  dashboard_load  seeded users open the dashboard: /bootstrap, then the
+                  listings it is made of one by one (as older clients do);
+                  owners also load their default workspace and plan. Plus
+                  load balancer health checks and metrics scrapes
+  invite_burst    all owners at once create a workspace, send a run of
+                  invites to new emails and list what they sent
+  accept_burst    seeded invitees open their invite link and accept it (new
+                  emails register through it); every fourth declines
+"""
+import uuid
+from benchmarks.emails import emailed_token
+from benchmarks.load_test.recorder import Recorder, gather_limited, metrics_headers
+from benchmarks.load_test.seed import Dataset
+
+
+async def signup(recorder: Recorder, data: Dataset, options):
+    async def one(i: int):
+        email = f"signup-{data.run_id}-{i}@example.com"
+        await recorder.request("POST", "/auth/register", json={
+            "full_name": f"Signup {i}", "email": email, "password": data.password
+        })
+        await recorder.request("POST", "/auth/resend-verification", params={"email": email})
+        token = await emailed_token(
+            "verification", email, options.sink.handler.links if options.sink else None
+        )
+        await recorder.request("POST", "/auth/verify-email", json={"token": token})
+        await recorder.request("POST", "/auth/login", json={"email": email, "password": data.password})
+
+    await gather_limited(options.concurrency, (one(i) for i in range(options.signups)))
+
+
+async def login_storm(recorder: Recorder, data: Dataset, options):
+    async def one(account):
+        response = await recorder.request("POST", "/auth/login", json={"email": account.email, "password": data.password})
+        if response.status_code == 200:
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            await recorder.request("GET", "/auth/me", headers=headers)
+
+    accounts = data.accounts[:options.logins]
+    await gather_limited(options.concurrency, (one(account) for account in accounts))
+
+
+async def dashboard_load(recorder: Recorder, data: Dataset, options):
+    owners = {account.id for account in data.owners}
+
+    async def one(account):
+        headers = account.headers
+        await recorder.request("GET", "/bootstrap", headers=headers)
+        await recorder.request("GET", "/auth/me", headers=headers)
+        await recorder.request("GET", "/workspaces/my-workspaces", headers=headers)
+        await recorder.request("GET", "/workspaces/{workspace_id}/members", headers=headers,
+                               path={"workspace_id": account.workspace_id})
+        await recorder.request("GET", "/invites/pending", headers=headers)
+        if account.id in owners:
+            await recorder.request("GET", "/workspaces/default", headers=headers)
+            await recorder.request("GET", "/subscription/current-plan-details", headers=headers)
+        await recorder.request("GET", "/health")
+
+    accounts = [account for account in data.accounts if account.workspace_id is not None][:options.dashboard_users]
+    await gather_limited(options.concurrency, (one(account) for account in accounts))
+    await recorder.request("GET", "/")
+    await recorder.request("GET", "/internal/metrics", headers=metrics_headers())
+    await recorder.request("GET", "/metrics", headers=metrics_headers())
+
+
+async def invite_burst(recorder: Recorder, data: Dataset, options):
+    async def invite(owner, i: int):
+        await recorder.request("POST", "/workspaces/{workspace_id}/invite", headers=owner.headers,
+                               path={"workspace_id": owner.workspace_id},
+                               json={"email": f"burst-{data.run_id}-{uuid.uuid4().hex[:8]}-{i}@example.com", "role": "member"})
+
+    async def one(owner):
+        await recorder.request("POST", "/workspaces/create", headers=owner.headers,
+                               json={"name": f"Burst {owner.email.split('@')[0]}"})
+        for i in range(options.invite_burst):
+            await invite(owner, i)
+        await recorder.request("GET", "/invites/{workspace_id}/sent-invites", headers=owner.headers,
+                               path={"workspace_id": owner.workspace_id})
+
+    await gather_limited(options.concurrency, (one(owner) for owner in data.owners))
+
+
+async def accept_burst(recorder: Recorder, data: Dataset, options):
+    async def one(i: int, invite):
+        await recorder.request("GET", "/invites/details/{token}", path={"token": invite.token})
+        if i % 4 == 3:
+            await recorder.request("POST", "/invites/{token}/decline", path={"token": invite.token},
+                                   params={"email": invite.email})
+        elif invite.has_account:
+            await recorder.request("POST", "/invites/accept", json={"token": invite.token})
+        else:
+            await recorder.request("POST", "/invites/accept", json={
+                "token": invite.token, "full_name": "Invited User", "password": data.password
+            })
+
+    await gather_limited(options.concurrency, (one(i, invite) for i, invite in enumerate(data.invites)))
+
+
+# In run order
+SCENARIOS = {
+    "signup": signup,
+    "login_storm": login_storm,
+    "dashboard_load": dashboard_load,
+    "invite_burst": invite_burst,
+    "accept_burst": accept_burst,
+}
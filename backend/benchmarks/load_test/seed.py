@@ -0,0 +1,150 @@
+# benchmarks/load_test/seed.py
+"""
+Dataset for the load test, written straight through the models in bulk.
+
+Every seeded account shares one password. The first `workspaces` users each
+own a workspace on the business plan. Each workspace has `members` members
+drawn from the other users and `invites` pending invites, half to those
+users and half to new emails.
+"""
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.core.plan_config import PLANS
+from app.database import AsyncSessionLocal
+from app.models import Invite, Subscription, User, Workspace, WorkspaceMember
+from app.services.token_service import TokenService
+from app.utils.security import create_access_token, get_password_hash
+
+PASSWORD = "load-test-password"
+PLAN = "business"
+INSERT_BATCH_SIZE = 1000
+
+
+@dataclass
+class Scale:
+    users: int = 200
+    workspaces: int = 20
+    members: int = 10  # Per workspace, besides the owner
+    invites: int = 6  # Pending, per workspace
+
+    def check(self, extra_seats: int = 0):
+        """
+        ValueError if the dataset can't be built, or the workspaces would
+        have fewer than `extra_seats` seats left
+        """
+        if self.workspaces > self.users:
+            raise ValueError("--workspaces can't exceed --users (each workspace has its own owner)")
+        if self.members + self.invites // 2 > self.users - self.workspaces:
+            raise ValueError("--members plus half of --invites can't exceed the users who own no workspace")
+        seats = 1 + self.members + self.invites + extra_seats
+        if seats > PLANS[PLAN]["seat_limit"]:
+            raise ValueError(f"{seats} seats per workspace needed, the {PLAN} plan has {PLANS[PLAN]['seat_limit']}")
+
+
+@dataclass
+class Account:
+    id: uuid.UUID
+    email: str
+    headers: dict  # Bearer token
+    workspace_id: uuid.UUID = None  # One workspace the account belongs to
+
+
+@dataclass
+class SeededInvite:
+    token: str
+    email: str
+    has_account: bool
+
+
+@dataclass
+class Dataset:
+    run_id: str
+    password: str
+    accounts: list[Account] = field(default_factory=list)
+    owners: list[Account] = field(default_factory=list)
+    invites: list[SeededInvite] = field(default_factory=list)
+
+
+def _auth(user: dict) -> dict:
+    token = create_access_token(data={"sub": user["email"], "user_id": str(user["id"])})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _insert(db, model, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await db.execute(insert(model), rows[start:start + INSERT_BATCH_SIZE])
+
+
+async def seed(scale: Scale) -> Dataset:
+    run_id = uuid.uuid4().hex[:8]
+    hashed_password = get_password_hash(PASSWORD)
+    expires_at = datetime.utcnow() + timedelta(days=7)
+
+    users = [{
+        "id": uuid.uuid4(),
+        "full_name": f"Load User {i}",
+        "email": f"load-{run_id}-{i}@example.com",
+        "hashed_password": hashed_password,
+        "is_verified": True,
+        "is_active": True
+    } for i in range(scale.users)]
+    owners, others = users[:scale.workspaces], users[scale.workspaces:]
+
+    workspaces, members, invites = [], [], []
+    workspace_of = {}
+    for i, owner in enumerate(owners):
+        workspace = {
+            "id": uuid.uuid4(),
+            "name": f"Load Workspace {i}",
+            "slug": f"load-{run_id}-{i}",
+            "owner_id": owner["id"],
+            "member_count": 1 + scale.members,
+            "pending_invite_count": scale.invites
+        }
+        workspaces.append(workspace)
+        workspace_of.setdefault(owner["id"], workspace["id"])
+        members.append({"workspace_id": workspace["id"], "user_id": owner["id"], "role": "owner", "is_active": True})
+
+        # Consecutive slices of the other users, so nobody is both a member
+        # of and invited to the same workspace
+        offset = i * scale.members
+        picked = [others[(offset + j) % len(others)] for j in range(scale.members + scale.invites // 2)]
+        for user in picked[:scale.members]:
+            workspace_of.setdefault(user["id"], workspace["id"])
+            members.append({"workspace_id": workspace["id"], "user_id": user["id"], "role": "member", "is_active": True})
+        emails = [user["email"] for user in picked[scale.members:]]
+        emails += [f"invitee-{run_id}-{i}-{j}@example.com" for j in range(scale.invites - len(emails))]
+        invites += [{
+            "id": uuid.uuid4(),
+            "workspace_id": workspace["id"],
+            "invited_by": owner["id"],
+            "email": email,
+            "role": "member",
+            "status": "pending",
+            "invited_to_workspace_name": workspace["name"],
+            "expires_at": expires_at
+        } for email in emails]
+
+    subscriptions = [{"owner_id": owner["id"], "plan": PLAN, "status": "active", "workspace_count": 1} for owner in owners]
+
+    dataset = Dataset(run_id=run_id, password=PASSWORD)
+    emails_with_account = {user["email"] for user in users}
+    async with AsyncSessionLocal() as db:
+        await _insert(db, User, users)
+        await _insert(db, Workspace, workspaces)
+        await _insert(db, WorkspaceMember, members)
+        await _insert(db, Subscription, subscriptions)
+        await _insert(db, Invite, invites)
+        for invite in invites:
+            token = TokenService.issue(db, TokenService.INVITE, invite["id"], expires_at)
+            dataset.invites.append(SeededInvite(token, invite["email"], invite["email"] in emails_with_account))
+        await db.commit()
+
+    for i, user in enumerate(users):
+        account = Account(user["id"], user["email"], _auth(user), workspace_of.get(user["id"]))
+        dataset.accounts.append(account)
+        if i < scale.workspaces:
+            dataset.owners.append(account)
+    return dataset
@@ -0,0 +1,146 @@
+# benchmarks/query_counts.py
+"""
+N+1 check for the listing endpoints: seeds the same dataset at two sizes,
+calls each endpoint through the ASGI app and counts the SQL statements it
+runs. Fails (exit code 1) if any endpoint's count grows with the number of
+rows it returns or goes over its entry in QUERY_BUDGETS.
+
+    python -m benchmarks.query_counts --small 5 --large 50
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta
+import benchmarks  # noqa: F401  (local settings)
+import httpx
+from alembic import command
+from sqlalchemy import insert
+from app.core.query_stats import count_queries
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.main import app
+from app.models import Invite, User, Workspace, WorkspaceMember
+from app.services.token_service import TokenService
+from app.utils.security import create_access_token
+
+# Statements per request, including the authentication lookup and the
+# version lookup of the ETag-tagged listings
+QUERY_BUDGETS = {
+    "GET /invites/pending": 2,
+    "GET /invites/{id}/sent-invites": 2,
+    "GET /invites/details/{token}": 1,
+    "GET /workspaces/{id}/members": 2,
+    "GET /workspaces/my-workspaces": 2,
+    "GET /bootstrap": 3,
+}
+
+
+def user_row(label: str) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "full_name": label.title(),
+        "email": f"{label}-{uuid.uuid4().hex[:8]}@example.com",
+        "hashed_password": "x",
+        "is_verified": True,
+        "is_active": True
+    }
+
+
+async def seed(rows: int) -> dict:
+    """
+    A workspace with `rows` members and sent invites, plus an invitee with
+    `rows` workspaces and pending invites
+    """
+    owner, invitee = user_row("owner"), user_row("invitee")
+    users = [user_row(f"member{i}") for i in range(rows)]
+    workspace = {"id": uuid.uuid4(), "name": "Listing", "slug": f"listing-{uuid.uuid4().hex[:8]}", "owner_id": owner["id"]}
+    other_workspaces = [
+        {"id": uuid.uuid4(), "name": f"Other {i}", "slug": f"other-{uuid.uuid4().hex[:8]}", "owner_id": user["id"]}
+        for i, user in enumerate(users)
+    ]
+    expires_at = datetime.utcnow() + timedelta(days=7)
+
+    members = [{"workspace_id": workspace["id"], "user_id": owner["id"], "role": "owner"}]
+    members += [{"workspace_id": workspace["id"], "user_id": user["id"], "role": "member"} for user in users]
+    members += [{"workspace_id": other["id"], "user_id": invitee["id"], "role": "member"} for other in other_workspaces]
+    invites = [{
+        # Half the invitees already have an account
+        "workspace_id": workspace["id"],
+        "invited_by": user["id"],
+        "email": user["email"] if i % 2 else f"new-{uuid.uuid4().hex[:8]}@example.com",
+        "expires_at": expires_at
+    } for i, user in enumerate(users)]
+    invites += [{
+        "id": uuid.uuid4(),
+        "workspace_id": other["id"],
+        "invited_by": other["owner_id"],
+        "email": invitee["email"],
+        "expires_at": expires_at
+    } for other in other_workspaces]
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(User), [owner, invitee, *users])
+        await db.execute(insert(Workspace), [workspace, *other_workspaces])
+        await db.execute(insert(WorkspaceMember), [{"is_active": True, **row} for row in members])
+        await db.execute(insert(Invite), [{"role": "member", "status": "pending", **row} for row in invites])
+        invite_token = TokenService.issue(db, TokenService.INVITE, invites[-1]["id"], expires_at)
+        await db.commit()
+
+    def auth(user):
+        token = create_access_token(data={"sub": user["email"], "user_id": str(user["id"])})
+        return {"Authorization": f"Bearer {token}"}
+
+    return {
+        "GET /invites/pending": ("/invites/pending", auth(invitee)),
+        "GET /invites/{id}/sent-invites": (f"/invites/{workspace['id']}/sent-invites", auth(owner)),
+        "GET /invites/details/{token}": (f"/invites/details/{invite_token}", {}),
+        "GET /workspaces/{id}/members": (f"/workspaces/{workspace['id']}/members", auth(owner)),
+        "GET /workspaces/my-workspaces": ("/workspaces/my-workspaces", auth(invitee)),
+        "GET /bootstrap": ("/bootstrap", auth(owner)),
+    }
+
+
+async def measure(client: httpx.AsyncClient, rows: int) -> dict:
+    counts = {}
+    for name, (path, headers) in (await seed(rows)).items():
+        # The first call warms the principal cache; count the second
+        await client.get(path, headers=headers)
+        with count_queries() as stats:
+            response = await client.get(path, headers=headers)
+        response.raise_for_status()
+        counts[name] = stats.count
+    return counts
+
+
+async def main(args) -> int:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        small = await measure(client, args.small)
+        large = await measure(client, args.large)
+    await async_engine.dispose()
+
+    failures = 0
+    print(f"{'endpoint':<34} {args.small:>6} rows {args.large:>6} rows  budget")
+    for name in small:
+        budget = QUERY_BUDGETS[name]
+        if small[name] != large[name]:
+            status = "GROWS WITH ROWS"
+        elif large[name] > budget:
+            status = "OVER BUDGET"
+        else:
+            status = "ok"
+        failures += status != "ok"
+        print(f"{name:<34} {small[name]:>11} {large[name]:>11} {budget:>7}   {status}")
+    if failures:
+        print(f"FAIL: {failures} endpoints are over budget or run more queries as rows grow")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--small", type=int, default=5)
+    parser.add_argument("--large", type=int, default=50)
+    args = parser.parse_args()
+    command.upgrade(alembic_config(), "head")
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,186 @@
+# benchmarks/response_serialization.py
+"""
+CPU per response for a --members member list (the members endpoint's
+payload: UUIDs, datetimes and a nested user per row).
+
+Part 1 serves the same in-memory rows through a bare FastAPI app, one
+route per way of building and serializing the response:
+
+  dicts, untyped        dicts, response_model=list: jsonable_encoder +
+                        json.dumps (the members endpoint before)
+  dicts, typed          dicts validated into response models, then
+                        Pydantic's JSON serializer
+  dicts, ORJSON         dicts validated into response models, dumped to
+                        Python and encoded by FastAPI's (deprecated)
+                        ORJSONResponse
+  models, typed         response models built once from the rows
+                        (from_attributes), passed through as-is and
+                        serialized by Pydantic's JSON serializer
+  dicts, Orjson         dicts returned in an OrjsonResponse: no
+                        validation, one orjson pass (the listings now)
+
+Part 2 times the real GET /workspaces/{id}/members with --members seeded
+members (database time included).
+
+    python -m benchmarks.response_serialization --members 1000 --requests 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import warnings
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import benchmarks  # noqa: F401  (local settings)
+import httpx
+from alembic import command
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.main import app
+from app.models import User, Workspace, WorkspaceMember
+from app.schemas.workspace import WorkspaceMemberDetailResponse
+from app.utils.responses import OrjsonResponse
+from app.utils.security import create_access_token
+
+# Kept for comparison
+warnings.filterwarnings("ignore", message="ORJSONResponse is deprecated")
+
+
+def member_rows(count: int) -> list:
+    """
+    Stand-ins for the ORM rows the members query returns
+    """
+    workspace_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            workspace_id=workspace_id,
+            user_id=user_id,
+            role="member",
+            is_active=True,
+            joined_at=now,
+            user=SimpleNamespace(
+                id=user_id,
+                full_name=f"Member {i}",
+                email=f"member{i}@example.com",
+                profile_picture=None
+            )
+        )
+        for i, user_id in enumerate(uuid.uuid4() for _ in range(count))
+    ]
+
+
+def as_dicts(rows) -> list[dict]:
+    return [{
+        "id": row.id,
+        "workspace_id": row.workspace_id,
+        "user_id": row.user_id,
+        "role": row.role,
+        "is_active": row.is_active,
+        "joined_at": row.joined_at,
+        "user": {
+            "id": row.user.id,
+            "full_name": row.user.full_name,
+            "email": row.user.email,
+            "profile_picture": row.user.profile_picture
+        }
+    } for row in rows]
+
+
+def serializer_app(rows) -> tuple[FastAPI, list[str]]:
+    bench = FastAPI()
+    routes = ["dicts, untyped", "dicts, typed", "dicts, ORJSON", "models, typed", "dicts, Orjson"]
+
+    @bench.get("/dicts-untyped", response_model=list)
+    async def dicts_untyped():
+        return as_dicts(rows)
+
+    @bench.get("/dicts-typed", response_model=list[WorkspaceMemberDetailResponse])
+    async def dicts_typed():
+        return as_dicts(rows)
+
+    @bench.get("/models-typed", response_model=list[WorkspaceMemberDetailResponse])
+    async def models_typed():
+        return [WorkspaceMemberDetailResponse.model_validate(row) for row in rows]
+
+    @bench.get("/dicts-fastapi-orjson", response_model=list[WorkspaceMemberDetailResponse], response_class=ORJSONResponse)
+    async def dicts_fastapi_orjson():
+        return as_dicts(rows)
+
+    @bench.get("/dicts-orjson", response_model=list[WorkspaceMemberDetailResponse])
+    async def dicts_orjson():
+        return OrjsonResponse(as_dicts(rows))
+
+    return bench, routes
+
+
+async def cpu_per_request(client: httpx.AsyncClient, path: str, requests: int, headers: dict = None) -> tuple[float, float, int]:
+    """
+    Median CPU and wall milliseconds per request, and the body size
+    """
+    response = await client.get(path, headers=headers)
+    response.raise_for_status()
+    cpu, wall = [], []
+    for _ in range(requests):
+        started_cpu, started_wall = time.process_time(), time.perf_counter()
+        await client.get(path, headers=headers)
+        cpu.append(time.process_time() - started_cpu)
+        wall.append(time.perf_counter() - started_wall)
+    return statistics.median(cpu) * 1000, statistics.median(wall) * 1000, len(response.content)
+
+
+async def seed_members(count: int) -> tuple[str, dict]:
+    owner = {"id": uuid.uuid4(), "full_name": "Owner", "email": f"owner-{uuid.uuid4().hex[:8]}@example.com",
+             "hashed_password": "x", "is_verified": True, "is_active": True}
+    users = [{"id": uuid.uuid4(), "full_name": f"Member {i}", "email": f"member-{uuid.uuid4().hex[:12]}@example.com",
+              "hashed_password": "x", "is_verified": True, "is_active": True} for i in range(count - 1)]
+    workspace = {"id": uuid.uuid4(), "name": "Members", "slug": f"members-{uuid.uuid4().hex[:8]}", "owner_id": owner["id"]}
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(User), [owner, *users])
+        await db.execute(insert(Workspace), [workspace])
+        await db.execute(insert(WorkspaceMember), [
+            {"workspace_id": workspace["id"], "user_id": user["id"], "role": "owner" if user is owner else "member", "is_active": True}
+            for user in [owner, *users]
+        ])
+        await db.commit()
+    token = create_access_token(data={"sub": owner["email"], "user_id": str(owner["id"])})
+    return f"/workspaces/{workspace['id']}/members", {"Authorization": f"Bearer {token}"}
+
+
+async def main(args):
+    bench, routes = serializer_app(member_rows(args.members))
+    paths = {"dicts, untyped": "/dicts-untyped", "dicts, typed": "/dicts-typed",
+             "dicts, ORJSON": "/dicts-fastapi-orjson", "models, typed": "/models-typed",
+             "dicts, Orjson": "/dicts-orjson"}
+
+    # Same bytes as Pydantic's serializer, so clients can't tell the paths apart
+    typed = WorkspaceMemberDetailResponse.model_validate(member_rows(1)[0])
+    assert OrjsonResponse(typed.model_dump()).body == typed.model_dump_json().encode()
+
+    print(f"Serializers, {args.members} members, median of {args.requests} requests")
+    print(f"{'':<16} {'cpu ms':>8} {'wall ms':>8} {'bytes':>9}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=bench), base_url="http://bench") as client:
+        for name in routes:
+            cpu, wall, size = await cpu_per_request(client, paths[name], args.requests)
+            print(f"{name:<16} {cpu:>8.2f} {wall:>8.2f} {size:>9}")
+
+    path, headers = await seed_members(args.members)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        cpu, wall, size = await cpu_per_request(client, path, args.requests, headers)
+    await async_engine.dispose()
+    print(f"\nGET /workspaces/{{id}}/members, {args.members} members")
+    print(f"{'':<16} {cpu:>8.2f} {wall:>8.2f} {size:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    command.upgrade(alembic_config(), "head")
+    asyncio.run(main(args))
@@ -0,0 +1,117 @@
+# benchmarks/seat_reservation.py
+"""
+Seat limit under concurrency: accepts --invites pending invites to one
+workspace in parallel, each in its own session, and checks that the
+workspace ends up with no more active members than its plan allows and
+that the usage counters match the rows they count.
+
+The invites are inserted directly (as if sent before a plan downgrade), so
+there are far more of them than free seats and every accept races for the
+last few. Invitees are existing verified users, which keeps password
+hashing out of the timings.
+
+    python -m benchmarks.seat_reservation --invites 100 --plan pro
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+import benchmarks  # noqa: F401  (local settings)
+from alembic import command
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select
+from app.core.plan_config import PLANS
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.models import Invite, Subscription, User, Workspace, WorkspaceMember
+from app.services.invite_service import InviteService
+from app.services.token_service import TokenService
+from app.services.workspace_service import WorkspaceService
+
+
+async def setup(invites: int, plan: str) -> tuple[uuid.UUID, list[str]]:
+    run = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        owner = User(full_name="Seat Owner", email=f"seat-owner-{run}@example.com", hashed_password="x", is_verified=True)
+        db.add(owner)
+        await db.flush()
+        db.add(Subscription(owner_id=owner.id, plan=plan, status="active", workspace_count=1))
+        workspace = await WorkspaceService.insert_workspace(db, name=f"Seats {run}", owner_id=owner.id)
+
+        emails = [f"seat-{run}-{i}@example.com" for i in range(invites)]
+        await db.execute(insert(User), [
+            {"full_name": f"Invitee {i}", "email": email, "hashed_password": "x", "is_verified": True}
+            for i, email in enumerate(emails)
+        ])
+        expires_at = datetime.utcnow() + timedelta(days=7)
+        invite_ids = [uuid.uuid4() for _ in emails]
+        await db.execute(insert(Invite), [{
+            "id": invite_id,
+            "workspace_id": workspace.id,
+            "invited_by": owner.id,
+            "email": email,
+            "role": "member",
+            "status": "pending",
+            "expires_at": expires_at
+        } for email, invite_id in zip(emails, invite_ids)])
+        tokens = [TokenService.issue(db, TokenService.INVITE, invite_id, expires_at) for invite_id in invite_ids]
+        workspace.pending_invite_count = invites
+        await db.commit()
+        return workspace.id, tokens
+
+
+async def accept(token: str) -> str:
+    async with AsyncSessionLocal() as db:
+        try:
+            await InviteService.accept_invite(db, token)
+            return "accepted"
+        except HTTPException as e:
+            return f"{e.status_code} {e.detail}"
+
+
+async def main(args) -> int:
+    seat_limit = PLANS[args.plan]["seat_limit"]
+    workspace_id, tokens = await setup(args.invites, args.plan)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(accept(token) for token in tokens))
+    elapsed = time.perf_counter() - started
+
+    async with AsyncSessionLocal() as db:
+        workspace = await db.get(Workspace, workspace_id)
+        members = await db.scalar(select(func.count()).select_from(WorkspaceMember).where(
+            WorkspaceMember.workspace_id == workspace_id,
+            WorkspaceMember.is_active == True
+        ))
+        pending = await db.scalar(select(func.count()).select_from(Invite).where(
+            Invite.workspace_id == workspace_id,
+            Invite.status == "pending"
+        ))
+    await async_engine.dispose()
+
+    print(f"{args.invites} parallel accepts in {elapsed:.2f}s, seat limit {seat_limit} ({args.plan})")
+    for outcome, count in Counter(results).most_common():
+        print(f"  {count:>4}  {outcome}")
+    print(f"active members {members} (counter {workspace.member_count}), "
+          f"pending invites {pending} (counter {workspace.pending_invite_count})")
+
+    failures = []
+    if members > seat_limit:
+        failures.append(f"{members} active members exceed the seat limit of {seat_limit}")
+    if (workspace.member_count, workspace.pending_invite_count) != (members, pending):
+        failures.append("usage counters don't match the member/invite rows")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invites", type=int, default=100)
+    parser.add_argument("--plan", choices=sorted(PLANS), default="pro")
+    args = parser.parse_args()
+    command.upgrade(alembic_config(), "head")
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,214 @@
+# benchmarks/server_throughput.py
+"""
+Throughput of the development server (run.py: one uvicorn process with
+reload) against the production one (serve.py: gunicorn, one uvicorn worker
+per CPU, uvloop, httptools), started as real processes and loaded over
+HTTP by --clients load processes with --concurrency connections each.
+
+Endpoints: GET /health (no database) and GET /workspaces/my-workspaces
+(authentication + one listing query) for a seeded user.
+
+Then, with --drain, SIGTERMs serve.py in the middle of a load run and
+checks that no request already sent was dropped (connection errors after
+the listening socket closed are expected) and that it exited cleanly.
+
+run.py always binds port 8000, so that port must be free:
+
+    python -m benchmarks.server_throughput --duration 10 --drain
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+import benchmarks  # noqa: F401  (local settings)
+import httpx
+from alembic import command
+from sqlalchemy import insert
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.models import User, Workspace, WorkspaceMember
+from app.utils.security import create_access_token
+
+RUN_PY_PORT = 8000
+SERVE_PORT = 8001
+
+
+async def seed_user() -> dict:
+    user = {"id": uuid.uuid4(), "full_name": "Load", "email": f"load-{uuid.uuid4().hex[:8]}@example.com",
+            "hashed_password": "x", "is_verified": True, "is_active": True}
+    workspaces = [{"id": uuid.uuid4(), "name": f"Load {i}", "slug": f"load-{uuid.uuid4().hex[:8]}", "owner_id": user["id"]}
+                  for i in range(5)]
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(User), [user])
+        await db.execute(insert(Workspace), workspaces)
+        await db.execute(insert(WorkspaceMember), [
+            {"workspace_id": workspace["id"], "user_id": user["id"], "role": "owner", "is_active": True}
+            for workspace in workspaces
+        ])
+        await db.commit()
+    await async_engine.dispose()
+    token = create_access_token(data={"sub": user["email"], "user_id": str(user["id"])})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def start_server(name: str, workers: int) -> tuple[subprocess.Popen, str]:
+    # Background jobs off: they would compete with the load for the CPUs
+    env = {**os.environ, "EMAIL_OUTBOX_ENABLED": "false", "INVITE_SWEEP_ENABLED": "false",
+           "TOKEN_PURGE_ENABLED": "false"}
+    if name == "run.py":
+        command_line, port = [sys.executable, "run.py"], RUN_PY_PORT
+    else:
+        command_line = [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(SERVE_PORT)]
+        if workers:
+            command_line += ["--workers", str(workers)]
+        port = SERVE_PORT
+    process = subprocess.Popen(command_line, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} exited with {process.returncode} before serving")
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{name} did not start serving within 30s")
+
+
+def stop_server(process: subprocess.Popen, timeout: float = 60) -> tuple[int, float]:
+    """
+    SIGTERM; returns the exit code and how long the shutdown took
+    """
+    started = time.monotonic()
+    process.send_signal(signal.SIGTERM)
+    try:
+        return process.wait(timeout), time.monotonic() - started
+    except subprocess.TimeoutExpired:
+        process.kill()
+        return process.wait(), time.monotonic() - started
+
+
+async def load(base_url: str, path: str, headers: dict, concurrency: int, duration: float) -> dict:
+    """
+    `concurrency` connections sending requests back to back for `duration`
+    """
+    latencies = []
+    errors = {"status": 0, "refused": 0, "dropped": 0}
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        async def connection():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                except (httpx.ConnectError, httpx.ConnectTimeout):
+                    errors["refused"] += 1
+                    await asyncio.sleep(0.01)
+                    continue
+                except httpx.HTTPError:
+                    # Sent, but the connection closed before the response
+                    errors["dropped"] += 1
+                    continue
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors["status"] += 1
+
+        await asyncio.gather(*(connection() for _ in range(concurrency)))
+    return {"latencies": latencies, **errors}
+
+
+def load_process(job: tuple) -> dict:
+    return asyncio.run(load(*job))
+
+
+def run_load(base_url: str, path: str, headers: dict, args) -> dict:
+    job = (base_url, path, headers, args.concurrency, args.duration)
+    with multiprocessing.Pool(args.clients) as pool:
+        results = pool.map(load_process, [job] * args.clients)
+    latencies = sorted(latency for result in results for latency in result["latencies"])
+    merged = {key: sum(result[key] for result in results) for key in ("status", "refused", "dropped")}
+    return {"latencies": latencies, **merged}
+
+
+def summary(result: dict, duration: float) -> str:
+    latencies = result["latencies"]
+    if not latencies:
+        return f"{'0':>9} {'-':>8} {'-':>8} {'-':>8}  errors {result['status'] + result['dropped']}"
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (f"{len(latencies) / duration:>9.0f} {statistics.median(latencies) * 1000:>8.2f} "
+            f"{p99 * 1000:>8.2f} {len(latencies):>8}  errors {result['status'] + result['dropped']}")
+
+
+def drain_check(headers: dict, args) -> list[str]:
+    """
+    SIGTERM serve.py a third of the way into a load run
+    """
+    process, base_url = start_server("serve.py", args.workers)
+    with multiprocessing.Pool(1) as pool:
+        pending = pool.apply_async(load_process, [(base_url, "/workspaces/my-workspaces", headers,
+                                                    args.concurrency, args.duration)])
+        time.sleep(args.duration / 3)
+        exit_code, shutdown = stop_server(process)
+        result = pending.get()
+
+    print(f"\nDrain: SIGTERM after {args.duration / 3:.1f}s, exit code {exit_code} after {shutdown:.2f}s")
+    print(f"  completed {len(result['latencies'])}, dropped in flight {result['dropped']}, "
+          f"refused after close {result['refused']}, non-200 {result['status']}")
+    failures = []
+    if exit_code != 0:
+        failures.append(f"serve.py exited with {exit_code}")
+    if result["dropped"] or result["status"]:
+        failures.append(f"{result['dropped']} requests dropped and {result['status']} failed during the drain")
+    return failures
+
+
+def main(args) -> int:
+    command.upgrade(alembic_config(), "head")
+    headers = asyncio.run(seed_user())
+    paths = {"/health": {}, "/workspaces/my-workspaces": headers}
+
+    print(f"{args.clients} load processes x {args.concurrency} connections, {args.duration:g}s per run, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'server':<10} {'endpoint':<28} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'requests':>8}")
+    failures = []
+    for name in ("run.py", "serve.py"):
+        process, base_url = start_server(name, args.workers)
+        try:
+            for path, path_headers in paths.items():
+                run_load(base_url, path, path_headers, argparse.Namespace(**{**vars(args), "duration": 1}))  # Warm up
+                result = run_load(base_url, path, path_headers, args)
+                print(f"{name:<10} {path:<28} {summary(result, args.duration)}")
+                if result["status"] or result["dropped"]:
+                    failures.append(f"{name} {path}: {result['status'] + result['dropped']} failed requests")
+        finally:
+            stop_server(process)
+
+    if args.drain:
+        failures += drain_check(headers, args)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--clients", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="Connections per load process")
+    parser.add_argument("--workers", type=int, default=0, help="serve.py workers (default: one per CPU)")
+    parser.add_argument("--drain", action="store_true", help="Also SIGTERM serve.py under load")
+    sys.exit(main(parser.parse_args()))
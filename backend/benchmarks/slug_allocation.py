@@ -0,0 +1,100 @@
+# benchmarks/slug_allocation.py
+"""
+Creates many workspaces with the same name ("Bench's Workspace") and
+times them: the counter-based allocator vs the old probe loop, which ran
+one SELECT per taken suffix (N round trips for the Nth workspace).
+
+The probe loop is quadratic, so it only runs for --legacy-count
+workspaces. Requests run --concurrency at a time, each in its own session
+like concurrent signups; every created slug is checked for uniqueness.
+
+    python -m benchmarks.slug_allocation --count 10000 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import benchmarks  # noqa: F401  (local settings)
+from alembic import command
+from sqlalchemy import select
+from app.core.schema import alembic_config
+from app.database import AsyncSessionLocal, async_engine
+from app.models import User, Workspace
+from app.services.workspace_service import WorkspaceService
+from app.utils.slug import create_slug
+
+
+async def bench_user() -> uuid.UUID:
+    async with AsyncSessionLocal() as db:
+        user = User(full_name="Bench", email=f"bench-slug-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        return user.id
+
+
+async def create_with_allocator(owner_id, name: str) -> str:
+    async with AsyncSessionLocal() as db:
+        workspace = await WorkspaceService.insert_workspace(db, name=name, owner_id=owner_id)
+        await db.commit()
+        return workspace.slug
+
+
+async def create_with_probe_loop(owner_id, name: str) -> str:
+    # The pre-allocator code path
+    async with AsyncSessionLocal() as db:
+        base_slug = create_slug(name)
+        slug = base_slug
+        counter = 1
+        while await db.scalar(select(Workspace.id).where(Workspace.slug == slug)):
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        db.add(Workspace(name=name, slug=slug, owner_id=owner_id, is_active=True))
+        await db.commit()
+        return slug
+
+
+async def run(label: str, create, count: int, concurrency: int):
+    owner_id = await bench_user()
+    # A fresh name per run so earlier runs don't skew the numbers
+    name = f"Bench {uuid.uuid4().hex[:6]}'s Workspace"
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = [0.0] * count
+    slugs = []
+    errors = 0
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                slugs.append(await create(owner_id, name))
+            except Exception:
+                errors += 1
+            latencies[i] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    elapsed = time.perf_counter() - started
+
+    tail = latencies[-min(100, count):]
+    print(f"{label:<12} {count:>6} workspaces in {elapsed:7.2f}s ({count / elapsed:7.0f}/s)   "
+          f"last 100 median {statistics.median(tail) * 1000:7.2f} ms   "
+          f"duplicate slugs {len(slugs) - len(set(slugs))}   errors {errors}")
+
+
+async def main(args):
+    await run("allocator", create_with_allocator, args.count, args.concurrency)
+    if args.legacy_count:
+        await run("probe loop", create_with_probe_loop, args.legacy_count, args.concurrency)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--legacy-count", type=int, default=1000, help="0 to skip the probe loop")
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    command.upgrade(alembic_config(), "head")
+    asyncio.run(main(args))
@@ -0,0 +1,67 @@
+# benchmarks/smtp_sink.py
+"""
+Local stand-in SMTP server that accepts and counts every message, and
+keeps the token links sent to each recipient (the outbox drops links once
+an email is sent).
+
+    python -m benchmarks.smtp_sink --port 8025
+"""
+import argparse
+import email
+import re
+import time
+from collections import defaultdict
+from aiosmtpd.controller import Controller
+
+
+TOKEN_LINK = re.compile(r"https?://\S+?token=[\w-]+")
+
+
+class CountingHandler:
+    def __init__(self):
+        self.count = 0
+        self.links: defaultdict[str, list[str]] = defaultdict(list)  # Recipient -> links with a token
+
+    async def handle_DATA(self, server, session, envelope):
+        self.count += 1
+        message = email.message_from_bytes(envelope.content)
+        for part in message.walk():
+            if part.get_content_type() != "text/plain":
+                continue
+            match = TOKEN_LINK.search(part.get_payload(decode=True).decode(errors="replace"))
+            if match:
+                for recipient in envelope.rcpt_tos:
+                    self.links[recipient].append(match.group())
+        return "250 Message accepted"
+
+
+def start_sink(host: str = "127.0.0.1", port: int = 8025) -> Controller:
+    """
+    Start the sink on a background thread; call `.stop()` when done.
+    The handler is available as `controller.handler`.
+    """
+    controller = Controller(CountingHandler(), hostname=host, port=port)
+    controller.start()
+    return controller
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    controller = start_sink(args.host, args.port)
+    print(f"SMTP sink listening on {args.host}:{args.port} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"received: {controller.handler.count}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
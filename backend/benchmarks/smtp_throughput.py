@@ -0,0 +1,80 @@
+# benchmarks/smtp_throughput.py
+"""
+Messages/sec: one smtplib connection per email (the old transport) vs the
+pooled aiosmtplib transport, both against the local SMTP sink.
+
+    python -m benchmarks.smtp_throughput --messages 2000 --pool-size 8
+"""
+import argparse
+import asyncio
+import smtplib
+import time
+import benchmarks  # noqa: F401  (local settings)
+from app.config import settings
+from app.services.email_service import EmailService
+from app.services.smtp_pool import SMTPConnectionPool
+from benchmarks.smtp_sink import start_sink
+
+
+def build_messages(count: int):
+    return [
+        EmailService.build_verification_message(
+            to_email=f"user{i}@example.com",
+            verification_link=f"http://localhost:3000/verify-email?token={i}",
+            user_name=f"User {i}"
+        )
+        for i in range(count)
+    ]
+
+
+def run_connection_per_message(messages) -> float:
+    started = time.perf_counter()
+    for msg in messages:
+        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
+            server.send_message(msg)
+    return time.perf_counter() - started
+
+
+async def run_pooled(messages, pool_size: int, max_per_connection: int) -> float:
+    pool = SMTPConnectionPool(
+        hostname=settings.SMTP_HOST,
+        port=settings.SMTP_PORT,
+        username=None,
+        password=None,
+        start_tls=False,
+        size=pool_size,
+        max_messages_per_connection=max_per_connection,
+        keepalive_seconds=30,
+        timeout=30
+    )
+    started = time.perf_counter()
+    await asyncio.gather(*(pool.send(msg) for msg in messages))
+    elapsed = time.perf_counter() - started
+    await pool.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--pool-size", type=int, default=settings.SMTP_POOL_SIZE)
+    parser.add_argument("--max-per-connection", type=int, default=settings.SMTP_MAX_MESSAGES_PER_CONNECTION)
+    args = parser.parse_args()
+
+    controller = start_sink(settings.SMTP_HOST, settings.SMTP_PORT)
+    try:
+        messages = build_messages(args.messages)
+
+        baseline = run_connection_per_message(messages)
+        pooled = asyncio.run(run_pooled(messages, args.pool_size, args.max_per_connection))
+
+        print(f"{'messages:':<26}{args.messages:8d}")
+        print(f"{'connection per message:':<26}{args.messages / baseline:8.1f} msg/s")
+        print(f"{f'pooled (size={args.pool_size}):':<26}{args.messages / pooled:8.1f} msg/s")
+        print(f"{'sink received:':<26}{controller.handler.count:8d}")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""hot path indexes
+
+Composite and partial indexes for the filters used on every request:
+membership checks, member lists, pending invites, owned workspaces, email
+verification and the outbox claim query.
+
+On PostgreSQL the indexes are built CONCURRENTLY, outside the migration
+transaction, so existing tables stay writable while they build.
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-18 09:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _where(clause) -> dict:
+    return {"postgresql_where": clause, "sqlite_where": clause}
+
+
+is_active = sa.column("is_active", sa.Boolean) == sa.true()
+
+INDEXES = [
+    # (name, table, columns, options)
+    ("ix_workspace_members_user_id_active", "workspace_members", ["user_id"], _where(is_active)),
+    ("ix_workspace_members_workspace_id_role_active", "workspace_members", ["workspace_id", "role"], _where(is_active)),
+    ("ix_invites_workspace_id_status_expires_at", "invites", ["workspace_id", "status", "expires_at"], {}),
+    ("ix_invites_email_status_expires_at", "invites", ["email", "status", "expires_at"], {}),
+    ("ix_workspaces_owner_id_created_at", "workspaces", ["owner_id", "created_at"], {}),
+    ("ix_users_verification_token", "users", ["verification_token"], _where(sa.column("verification_token").isnot(None))),
+    ("ix_email_outbox_pending_next_attempt_at", "email_outbox", ["next_attempt_at"], _where(sa.column("status") == "pending")),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            # if_not_exists: databases created by create_all() already have them
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True,
+                postgresql_concurrently=concurrently,
+                **options
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=concurrently)
@@ -0,0 +1,51 @@
+"""slug counters
+
+Per-base-slug suffix counters used to allocate workspace slugs with a
+single upsert. Backfilled from existing slugs: "johns-workspace-7" counts
+as suffix 7 of "johns-workspace". Anything the heuristic misses is handled
+by the insert conflict retry in WorkspaceService.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SUFFIX = re.compile(r"^(.+)-(\d+)$")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    slug_counters = op.create_table('slug_counters',
+    sa.Column('base_slug', sa.String(length=255), nullable=False),
+    sa.Column('last_suffix', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('base_slug')
+    )
+
+    counters = {}
+    slugs = op.get_bind().execute(sa.text("SELECT slug FROM workspaces WHERE slug IS NOT NULL")).scalars()
+    for slug in slugs:
+        match = SUFFIX.match(slug)
+        base, suffix = (match.group(1), int(match.group(2))) if match else (slug, 0)
+        counters[base] = max(counters.get(base, 0), suffix)
+    if counters:
+        op.bulk_insert(slug_counters, [
+            {"base_slug": base, "last_suffix": suffix} for base, suffix in counters.items()
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('slug_counters')
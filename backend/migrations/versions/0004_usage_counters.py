@@ -0,0 +1,71 @@
+"""usage counters
+
+Materialized usage counters read by the seat and workspace limit checks:
+workspaces.member_count, workspaces.pending_invite_count and
+subscriptions.workspace_count. Overdue pending invites are expired first so
+they don't hold seats, then every counter is backfilled from the rows it
+counts.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:05:00
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('workspaces') as batch_op:
+        batch_op.add_column(sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('pending_invite_count', sa.Integer(), server_default='0', nullable=False))
+    with op.batch_alter_table('subscriptions') as batch_op:
+        batch_op.add_column(sa.Column('workspace_count', sa.Integer(), server_default='0', nullable=False))
+
+    workspaces = sa.table('workspaces', sa.column('id'), sa.column('owner_id'),
+                          sa.column('member_count'), sa.column('pending_invite_count'))
+    members = sa.table('workspace_members', sa.column('workspace_id'), sa.column('is_active'))
+    invites = sa.table('invites', sa.column('workspace_id'), sa.column('status'), sa.column('expires_at'))
+    subscriptions = sa.table('subscriptions', sa.column('owner_id'), sa.column('workspace_count'))
+
+    op.execute(invites.update().where(
+        invites.c.status == 'pending',
+        invites.c.expires_at <= datetime.utcnow()
+    ).values(status='expired'))
+
+    op.execute(workspaces.update().values(
+        member_count=sa.select(sa.func.count()).select_from(members).where(
+            members.c.workspace_id == workspaces.c.id,
+            members.c.is_active == sa.true()
+        ).scalar_subquery(),
+        pending_invite_count=sa.select(sa.func.count()).select_from(invites).where(
+            invites.c.workspace_id == workspaces.c.id,
+            invites.c.status == 'pending'
+        ).scalar_subquery()
+    ))
+    owned = workspaces.alias('owned')
+    op.execute(subscriptions.update().values(
+        workspace_count=sa.select(sa.func.count()).select_from(owned).where(
+            owned.c.owner_id == subscriptions.c.owner_id
+        ).scalar_subquery()
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('subscriptions') as batch_op:
+        batch_op.drop_column('workspace_count')
+    with op.batch_alter_table('workspaces') as batch_op:
+        batch_op.drop_column('pending_invite_count')
+        batch_op.drop_column('member_count')
@@ -0,0 +1,44 @@
+"""invite sweep index
+
+Partial index on invites(expires_at) WHERE status = 'pending' for the
+invite sweeper's overdue-invite batch query. Built CONCURRENTLY on
+PostgreSQL, like the 0002 indexes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+is_pending = sa.column("status") == "pending"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_invites_pending_expires_at", "invites", ["expires_at"],
+            if_not_exists=True,
+            postgresql_concurrently=concurrently,
+            postgresql_where=is_pending,
+            sqlite_where=is_pending
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_invites_pending_expires_at", table_name="invites", if_exists=True, postgresql_concurrently=concurrently)
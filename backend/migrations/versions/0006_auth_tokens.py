@@ -0,0 +1,110 @@
+"""auth tokens
+
+Moves email verification and invite tokens into auth_tokens, stored as
+SHA-256 hashes under a unique index. Outstanding plaintext tokens are
+hashed into the new table so links already sent keep working, then the
+plaintext columns are dropped.
+
+Downgrading restores the columns empty: tokens can't be recovered from
+their hashes, so links sent before the downgrade stop working.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:00:00
+
+"""
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _sha256(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    auth_tokens = op.create_table('auth_tokens',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('purpose', sa.String(length=32), nullable=False),
+    sa.Column('subject_id', sa.UUID(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('consumed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auth_tokens_token_hash'), 'auth_tokens', ['token_hash'], unique=True)
+    op.create_index('ix_auth_tokens_purpose_subject_id', 'auth_tokens', ['purpose', 'subject_id'], unique=False)
+    op.create_index('ix_auth_tokens_expires_at', 'auth_tokens', ['expires_at'], unique=False)
+
+    # Typed columns so ids and datetimes come back as Python objects on SQLite too
+    users = sa.table('users', sa.column('id', sa.UUID()), sa.column('verification_token', sa.String()),
+                     sa.column('verification_token_expires', sa.DateTime()))
+    invites = sa.table('invites', sa.column('id', sa.UUID()), sa.column('token', sa.String()),
+                       sa.column('status', sa.String()), sa.column('expires_at', sa.DateTime()))
+
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    rows = []
+    user_tokens = bind.execute(sa.select(users.c.id, users.c.verification_token, users.c.verification_token_expires).where(
+        users.c.verification_token.isnot(None)
+    ))
+    for user_id, token, expires_at in user_tokens:
+        rows.append({
+            "id": uuid.uuid4(),
+            "token_hash": _sha256(token),
+            "purpose": "email_verification",
+            "subject_id": user_id,
+            "expires_at": expires_at or now + timedelta(days=1)
+        })
+    invite_tokens = bind.execute(sa.select(invites.c.id, invites.c.token, invites.c.expires_at).where(
+        invites.c.token.isnot(None),
+        invites.c.status == 'pending'
+    ))
+    for invite_id, token, expires_at in invite_tokens:
+        rows.append({
+            "id": uuid.uuid4(),
+            "token_hash": _sha256(token),
+            "purpose": "invite",
+            "subject_id": invite_id,
+            "expires_at": expires_at or now + timedelta(days=7)
+        })
+    if rows:
+        op.bulk_insert(auth_tokens, rows)
+
+    op.drop_index('ix_users_verification_token', table_name='users', if_exists=True)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('verification_token_expires')
+        batch_op.drop_column('verification_token')
+    op.drop_index(op.f('ix_invites_token'), table_name='invites')
+    with op.batch_alter_table('invites') as batch_op:
+        batch_op.drop_column('token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('invites') as batch_op:
+        batch_op.add_column(sa.Column('token', sa.String(length=255), nullable=True))
+    op.create_index(op.f('ix_invites_token'), 'invites', ['token'], unique=True)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('verification_token', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('verification_token_expires', sa.DateTime(), nullable=True))
+    is_set = sa.column('verification_token').isnot(None)
+    op.create_index('ix_users_verification_token', 'users', ['verification_token'], postgresql_where=is_set, sqlite_where=is_set)
+
+    op.drop_index('ix_auth_tokens_expires_at', table_name='auth_tokens')
+    op.drop_index('ix_auth_tokens_purpose_subject_id', table_name='auth_tokens')
+    op.drop_index(op.f('ix_auth_tokens_token_hash'), table_name='auth_tokens')
+    op.drop_table('auth_tokens')
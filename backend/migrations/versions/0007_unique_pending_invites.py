@@ -0,0 +1,75 @@
+"""unique pending invites
+
+Partial unique index on invites(workspace_id, email) WHERE status =
+'pending', the conflict target of the invite create/resend upsert. Built
+CONCURRENTLY on PostgreSQL, like the 0002 indexes.
+
+Duplicate pending invites (possible while create and resend were a
+SELECT followed by an INSERT) are expired first, keeping the newest one per
+workspace and email, and the pending invite counters are recomputed.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 14:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+is_pending = sa.column("status") == "pending"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    invites = sa.table('invites', sa.column('id'), sa.column('workspace_id'), sa.column('email'),
+                       sa.column('status'), sa.column('created_at'))
+    workspaces = sa.table('workspaces', sa.column('id'), sa.column('pending_invite_count'))
+    newer = invites.alias('newer')
+
+    duplicates = op.get_bind().execute(invites.update().where(
+        invites.c.status == 'pending',
+        sa.exists().where(
+            newer.c.workspace_id == invites.c.workspace_id,
+            newer.c.email == invites.c.email,
+            newer.c.status == 'pending',
+            sa.or_(
+                newer.c.created_at > invites.c.created_at,
+                sa.and_(newer.c.created_at == invites.c.created_at, newer.c.id > invites.c.id)
+            )
+        )
+    ).values(status='expired'))
+
+    if duplicates.rowcount:
+        op.execute(workspaces.update().values(
+            pending_invite_count=sa.select(sa.func.count()).select_from(invites).where(
+                invites.c.workspace_id == workspaces.c.id,
+                invites.c.status == 'pending'
+            ).scalar_subquery()
+        ))
+
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_invites_workspace_id_email_pending", "invites", ["workspace_id", "email"],
+            unique=True,
+            if_not_exists=True,
+            postgresql_concurrently=concurrently,
+            postgresql_where=is_pending,
+            sqlite_where=is_pending
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.drop_index("uq_invites_workspace_id_email_pending", table_name="invites", if_exists=True, postgresql_concurrently=concurrently)
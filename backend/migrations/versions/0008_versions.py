@@ -0,0 +1,39 @@
+"""versions
+
+Monotonic version counters on workspaces and users, behind the ETags of
+the dashboard listings: workspaces.version is bumped with every member or
+invite change, users.version with every change to the user's memberships
+or the invites sent to their email.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 15:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('workspaces') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('version')
+    with op.batch_alter_table('workspaces') as batch_op:
+        batch_op.drop_column('version')
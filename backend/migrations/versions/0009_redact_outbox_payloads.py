@@ -0,0 +1,65 @@
+"""redact outbox payloads
+
+Invitation payloads stored the whole invite token next to the link, and
+sent or dead-lettered emails kept their links for good, so the outbox
+held working tokens that auth_tokens only keeps hashed. Pending rows
+swap the token for its first 8 characters (the link they still need is
+left alone); sent and dead rows also lose their links, as the outbox
+worker now does when it finishes with a row.
+
+Downgrading leaves the payloads as they are: the tokens can't be
+recovered.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 18:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LINK_FIELDS = ("verification_link", "invite_link")
+
+
+def _redact(status: str, payload: dict) -> dict:
+    payload = dict(payload)
+    token = payload.pop("token", None)
+    if token is not None:
+        payload["token_short"] = token[:8]
+    if status in ("sent", "dead"):
+        for field in LINK_FIELDS:
+            payload.pop(field, None)
+    return payload
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    email_outbox = sa.table('email_outbox', sa.column('id', sa.UUID()), sa.column('status', sa.String()),
+                            sa.column('payload', sa.JSON()))
+
+    bind = op.get_bind()
+    updates = []
+    for row_id, status, payload in bind.execute(sa.select(email_outbox.c.id, email_outbox.c.status, email_outbox.c.payload)):
+        redacted = _redact(status, payload)
+        if redacted != payload:
+            updates.append({"row_id": row_id, "redacted": redacted})
+    if updates:
+        bind.execute(
+            email_outbox.update()
+            .where(email_outbox.c.id == sa.bindparam("row_id"))
+            .values(payload=sa.bindparam("redacted", type_=sa.JSON())),
+            updates
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
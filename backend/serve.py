@@ -0,0 +1,24 @@
+# serve.py
+"""
+Production server: gunicorn with uvicorn workers (uvloop, httptools),
+configured by the SERVER_* settings. run.py is the development server.
+
+    python serve.py                      # one worker per CPU on :8000
+    python serve.py --workers 4 --port 8080 --no-preload
+
+Stop it with SIGTERM: in-flight requests and background jobs are drained
+first (app/core/server.py).
+"""
+import argparse
+from app.core.server import Server, prepare_metrics_dir, server_options
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--workers", type=int, help="Default: SERVER_WORKERS, or one per CPU")
+    parser.add_argument("--preload", action=argparse.BooleanOptionalAction, default=None,
+                        help="Import the app before forking the workers (default: SERVER_PRELOAD)")
+    args = parser.parse_args()
+    prepare_metrics_dir()
+    Server(server_options(args.host, args.port, args.workers, args.preload)).run()
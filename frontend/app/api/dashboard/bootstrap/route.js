@@ -0,0 +1,47 @@
+import { NextResponse } from 'next/server';
+
+export async function GET(request) {
+    try {
+        // Get the auth token from cookies
+        const token = request.cookies.get(process.env.COOKIE_NAME || 'zuno_auth_token')?.value;
+        
+        if (!token) {
+            return NextResponse.json(
+                { error: 'Authentication required' },
+                { status: 401 }
+            );
+        }
+
+        // Pass fields / workspace_id through to the backend
+        const { search } = new URL(request.url);
+
+        // Call the backend API with bearer token
+        const lastWrite = request.cookies.get('zuno_last_write')?.value;
+        const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/bootstrap${search}`, {
+            method: 'GET',
+            headers: {
+                'Authorization': `Bearer ${token}`,
+                'Content-Type': 'application/json',
+                // Right after a write, tells the backend to read from the primary
+                ...(lastWrite && { 'Cookie': `zuno_last_write=${lastWrite}` }),
+            },
+        });
+
+        const data = await response.json();
+
+        if (!response.ok) {
+            return NextResponse.json(
+                { error: data.detail || 'Failed to load dashboard' },
+                { status: response.status }
+            );
+        }
+
+        return NextResponse.json(data, { status: 200 });
+    } catch (error) {
+        console.error('Dashboard bootstrap error:', error);
+        return NextResponse.json(
+            { error: 'Internal server error' },
+            { status: 500 }
+        );
+    }
+}
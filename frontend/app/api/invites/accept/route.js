@@ -52,6 +52,13 @@ export async function POST(request) {
             });
         }
 
+        // Keep the backend's read-your-writes cookie for the reads that follow
+        // (appended last: res.cookies.set() rewrites the set-cookie headers)
+        const lastWrite = response.headers.get('set-cookie');
+        if (lastWrite) {
+            res.headers.append('set-cookie', lastWrite);
+        }
+
         return res;
     } catch (error) {
         console.error('Accept invitation error:', error);
@@ -42,7 +42,14 @@ export async function POST(request) {
             );
         }
 
-        return NextResponse.json(data, { status: 201 });
+        const res = NextResponse.json(data, { status: 201 });
+        // Keep the backend's read-your-writes cookie for the reads that follow
+        const lastWrite = response.headers.get('set-cookie');
+        if (lastWrite) {
+            res.headers.append('set-cookie', lastWrite);
+        }
+
+        return res;
     } catch (error) {
         console.error('Workspace creation error:', error);
         return NextResponse.json(
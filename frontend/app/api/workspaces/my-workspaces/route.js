@@ -13,14 +13,31 @@ export async function GET(request) {
         }
 
         // Call the backend API with bearer token
+        const ifNoneMatch = request.headers.get('if-none-match');
+        const lastWrite = request.cookies.get('zuno_last_write')?.value;
         const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/workspaces/my-workspaces`, {
             method: 'GET',
             headers: {
                 'Authorization': `Bearer ${token}`,
                 'Content-Type': 'application/json',
+                // Right after a write, tells the backend to read from the primary
+                ...(lastWrite && { 'Cookie': `zuno_last_write=${lastWrite}` }),
+                // Lets the backend answer 304 when the browser's copy is current
+                ...(ifNoneMatch && { 'If-None-Match': ifNoneMatch }),
             },
         });
 
+        const cacheHeaders = {};
+        const etag = response.headers.get('etag');
+        if (etag) {
+            cacheHeaders['ETag'] = etag;
+            cacheHeaders['Cache-Control'] = response.headers.get('cache-control') || 'private, no-cache';
+        }
+
+        if (response.status === 304) {
+            return new NextResponse(null, { status: 304, headers: cacheHeaders });
+        }
+
         const data = await response.json();
 
         if (!response.ok) {
@@ -30,7 +47,7 @@ export async function GET(request) {
             );
         }
 
-        return NextResponse.json(data, { status: 200 });
+        return NextResponse.json(data, { status: 200, headers: cacheHeaders });
     } catch (error) {
         console.error('Workspaces fetch error:', error);
         return NextResponse.json(
@@ -27,33 +27,28 @@ export default function Dashboard() {
         try {
             setLoading(true);
             
-            // Fetch subscription plan
-            const subscriptionRes = await fetch("/api/subscription/current-plan-details");
-            if (subscriptionRes.ok) {
-                const subscriptionData = await subscriptionRes.json();
-                setSubscription(subscriptionData);
-            }
-
-            // Fetch workspaces
-            const workspacesRes = await fetch("/api/workspaces/my-workspaces");
-            if (workspacesRes.status === 401) {
+            // Subscription, workspaces, the first workspace's members and
+            // pending invites in one request
+            const response = await fetch("/api/dashboard/bootstrap");
+            if (response.status === 401) {
                 router.push("/login");
                 return;
             }
             
-            if (!workspacesRes.ok) {
-                throw new Error(`Failed to fetch workspaces: ${workspacesRes.status}`);
+            if (!response.ok) {
+                throw new Error(`Failed to load dashboard: ${response.status}`);
             }
             
-            const workspacesData = await workspacesRes.json();
-            setWorkspaces(workspacesData);
+            const data = await response.json();
+            setSubscription(data.subscription);
+            setWorkspaces(data.workspaces);
+            setPendingInvites(data.pending_invites);
             
             // Set first workspace as current
-            if (workspacesData.length > 0) {
-                setCurrentWorkspace(workspacesData[0]);
-                fetchWorkspaceMembers(workspacesData[0].id);
+            if (data.workspaces.length > 0) {
+                setCurrentWorkspace(data.workspaces[0]);
+                setWorkspaceMembers(data.members);
             }
-            fetchPendingInvites();
             
         } catch (err) {
             setError(err.message);
@@ -154,18 +149,6 @@ export default function Dashboard() {
         fetchWorkspaceMembers(workspace.id);
     };
 
-    const fetchPendingInvites = async () => {
-        try {
-            const response = await fetch("/api/invites/pending");
-            if (response.ok) {
-                const data = await response.json();
-                setPendingInvites(data);
-            }
-        } catch (err) {
-            console.error("Failed to fetch pending invites:", err);
-        }
-    };
-
     const handleLogout = async () => {
         try {
             await fetch("/api/auth/logout", {